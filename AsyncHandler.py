@@ -1,24 +1,289 @@
-import asyncio, threading
+import asyncio, threading, itertools, inspect, heapq, time, os
 import random
+from functions.DataHandlers import split_interval
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 
+def _timed_call(func, args:tuple, kwargs:dict) -> tuple:
+    """Runs in the pool worker, returns the result and the time the call took there."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
 class AsyncThreadHandler:
-    def __init__(self):
+    """
+        AsyncThreadHandler()
+        ====================
+
+        Runs blocking callables off the event loop as awaitables (`run_in_executor`): blocking I/O (files, sqlite, requests) on a `ThreadPoolExecutor` and CPU-bound work (`BeautifulSoup` parsing, `read_pdf`, `flatten_dict` over big payloads) on a `ProcessPoolExecutor`, so it neither blocks the loop nor holds the GIL against it.
+
+        Parameters:
+            - `io_workers` (int): The threads of the 'io' pool. Default is 0 (`min(32, cpu_count + 4)`).
+            - `cpu_workers` (int): The processes of the 'cpu' pool. Default is 0 (`cpu_count`).
+            - `max_pending` (int): The number of calls submitted to a pool at the same time (running + queued), `run()` waits beyond it. Default is 0 (2 per worker).
+            - `routes` (dict): `{callable: 'io'|'cpu'}`, the pool used for a callable when `run()` is not given a `kind`, see `route()`.
+
+        Usage:
+        ```
+            handler = AsyncThreadHandler()
+            handler.route(flatten_dict, 'cpu')
+            flat = await handler.run(flatten_dict, payload)
+            text = await handler.run(read, 'file.txt')
+            results = await asyncio.gather(*handler.create_tasks(parse, pages, kind='cpu'))
+        ```
+    """
+
+    def __init__(self, io_workers:int=0, cpu_workers:int=0, max_pending:int=0, routes:dict={}):
+        cpu = os.cpu_count() or 1
+        self.workers = {'io': io_workers or min(32, cpu + 4), 'cpu': cpu_workers or cpu}
+        self.max_pending = {kind: max_pending or 2*size for kind, size in self.workers.items()}
+        self.routes = dict(routes)
+        self.pools = {'io': None, 'cpu': None}
         self.tasks = []
+        self._slots = {}
+        self.metrics = {kind: {'submitted': 0, 'in_flight': 0, 'completed': 0, 'failed': 0, 'busy': 0.0, 'started': None} for kind in self.workers}
 
-    def create_tasks(self, func):
-        pass
+    def route(self, func, kind:str='cpu'):
+        """Sends every call of `func` to the `kind` pool ('io' or 'cpu'). Returns `func` so it can be used as a decorator."""
+        if kind not in self.workers: raise ValueError(f'The kind ({kind}) is not supported, use io or cpu.')
+        self.routes[func] = kind
+        return func
+
+    def _pool(self, kind:str):
+        if self.pools[kind] is None:
+            self.pools[kind] = ThreadPoolExecutor(self.workers[kind], thread_name_prefix='AsyncThreadHandler') if kind == 'io' else ProcessPoolExecutor(self.workers[kind])
+            self.metrics[kind]['started'] = time.perf_counter()
+        return self.pools[kind]
+
+    def _slot(self, kind:str) -> asyncio.Semaphore:
+        """The semaphore bounding the calls submitted to the pool, one per event loop."""
+        loop = asyncio.get_running_loop()
+        sem = self._slots.get((kind, loop))
+        if sem is None:
+            sem = self._slots[(kind, loop)] = asyncio.Semaphore(self.max_pending[kind])
+        return sem
+
+    async def run(self, func, *args, kind:str='', **kwargs):
+        """
+            Awaitable `func(*args, **kwargs)` run on the `kind` pool, by default the one given to `route()` for `func` or else 'io'. The callable and its arguments must be picklable for the 'cpu' pool.
+        """
+        kind = kind or self.routes.get(func, 'io')
+        if kind not in self.workers: raise ValueError(f'The kind ({kind}) is not supported, use io or cpu.')
+        metrics = self.metrics[kind]
+        async with self._slot(kind):
+            pool = self._pool(kind)
+            metrics['submitted'] += 1
+            metrics['in_flight'] += 1
+            try:
+                result, elapsed = await asyncio.get_running_loop().run_in_executor(pool, _timed_call, func, args, kwargs)
+            except Exception:
+                metrics['failed'] += 1
+                raise
+            else:
+                metrics['completed'] += 1
+                metrics['busy'] += elapsed
+                return result
+            finally:
+                metrics['in_flight'] -= 1
 
-    
+    def create_tasks(self, func, items, kind:str='') -> list:
+        """Creates one task running `func(item)` on the pools for every item of `items` (a tuple item is unpacked as the arguments). Returns the tasks, also kept in `self.tasks`."""
+        tasks = [asyncio.create_task(self.run(func, *(item if isinstance(item, tuple) else (item,)), kind=kind)) for item in items]
+        self.tasks = [t for t in self.tasks if not t.done()] + tasks
+        return tasks
+
+    def get_status(self) -> dict:
+        """
+            Per pool metrics: the workers, the calls submitted/in flight (running or queued in the pool)/completed/failed, and the utilisation, the time the workers spent in the calls over the time they were available since the pool was created.
+        """
+        status = {}
+        for kind, m in self.metrics.items():
+            up = time.perf_counter() - m['started'] if m['started'] is not None else 0
+            status[kind] = {'workers': self.workers[kind], 'max_pending': self.max_pending[kind], 'submitted': m['submitted'], 'in_flight': m['in_flight'],
+                            'completed': m['completed'], 'failed': m['failed'], 'utilisation': min(1.0, m['busy'] / (up * self.workers[kind])) if up else 0.0}
+        return status
+
+    def shutdown(self, wait:bool=True) -> None:
+        """Shuts the pools down."""
+        for kind, pool in self.pools.items():
+            if pool is not None: pool.shutdown(wait=wait)
+            self.pools[kind] = None
+
+
+def _seconds(interval) -> float:
+    """Seconds of an interval given in seconds or as a `split_interval()` spec ('30s', '5m', '2h', '1d')."""
+    if isinstance(interval, str):
+        value, unit = split_interval(interval)
+        return value * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[unit]
+    return float(interval)
 
 class AsyncHandlerAio:
+    """
+        AsyncHandlerAio()
+        =================
 
-    def __init__(self) -> None:
-        self.tasks = []
+        Bounded-concurrency executor for coroutines: the submitted work waits in a priority queue as coroutine *factories* (the coroutine is only created when a worker picks it up) and `concurrency` workers run them, so no more than `concurrency` run at the same time.
+
+        Parameters:
+            - `concurrency` (int): The number of workers. Default is 10.
+            - `max_pending` (int): The size of the queue of pending work, `submit()` waits while it is full. Default is 0 (unbounded).
+
+        Usage:
+        ```
+            handler = AsyncHandlerAio(concurrency=5, max_pending=100)
+            futures = [await handler.submit(fetch, url) for url in urls]
+            await handler.run_task()
+            print(handler.get_status())
+        ```
+    """
+
+    def __init__(self, concurrency:int=10, max_pending:int=0) -> None:
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.queue = None
+        self.workers = []
+        self.running_tasks = set()
+        self._seq = itertools.count()
+        self.completed = 0
+        self.failed = 0
+        self._latency = 0.0
+        self._wait = 0.0
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._scheduler = None
+        self.jobs = set()
+
+    def _start(self) -> None:
+        """Creates the queue and the workers on the running loop at the first submit."""
+        if self.queue is None:
+            self.queue = asyncio.PriorityQueue(self.max_pending)
+        self.workers = [w for w in self.workers if not w.done()]
+        while len(self.workers) < self.concurrency:
+            self.workers.append(asyncio.create_task(self._worker()))
+
+    def _item(self, task_function, args, kwargs, priority:int) -> tuple:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        return (priority, next(self._seq), loop.time(), lambda: task_function(*args, **kwargs), future), future
+
+    async def submit(self, task_function, *args, priority:int=0, **kwargs) -> asyncio.Future:
+        """
+            Queues `task_function(*args, **kwargs)`, waiting while the queue is full (backpressure). The work with the lowest `priority` runs first, then in submit order.
+
+            Returns:
+                asyncio.Future: Resolved with the result (or the exception) of the call.
+        """
+        self._start()
+        item, future = self._item(task_function, args, kwargs, priority)
+        await self.queue.put(item)
+        return future
+
+    def create_task(self, task_function, *args, priority:int=0, **kwargs) -> asyncio.Future:
+        """Same as `submit()` without waiting, raises `asyncio.QueueFull` when the queue is full. Errors are counted in the status and not raised."""
+        self._start()
+        item, future = self._item(task_function, args, kwargs, priority)
+        self.queue.put_nowait(item)
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return future
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            priority, seq, queued, factory, future = await self.queue.get()
+            try:
+                if future.cancelled(): continue
+                start = loop.time()
+                self._wait += start - queued
+                task = asyncio.current_task()
+                self.running_tasks.add(task)
+                try:
+                    result = factory()
+                    if inspect.isawaitable(result):
+                        result = await result
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    if not future.done(): future.set_exception(e)
+                else:
+                    self.completed += 1
+                    if not future.done(): future.set_result(result)
+                finally:
+                    self.running_tasks.discard(task)
+                    self._latency += loop.time() - start
+            finally:
+                self.queue.task_done()
+
+
+    async def stop_tasks(self):
+        """Cancels the workers, the pending work and the scheduled jobs."""
+        if self.queue is not None:
+            while not self.queue.empty():
+                self.queue.get_nowait()[4].cancel()
+                self.queue.task_done()
+        tasks = self.workers + [job.task for job in self.jobs if job.task is not None]
+        for job in list(self.jobs):
+            job.cancel()
+        if self._scheduler is not None: tasks.append(self._scheduler)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self.running_tasks = set()
+        self._heap = []
+        self._scheduler = None
+
+    async def run_task(self) -> None:
+        """Waits until all the submitted work is done."""
+        if self.queue is not None:
+            await self.queue.join()
+
+    def get_status(self) -> dict:
+        """Get the status of the tasks being managed by the handler"""
+        done = self.completed + self.failed
+        return {
+            'pending': self.queue.qsize() if self.queue is not None else 0,
+            'running': len(self.running_tasks),
+            'completed': self.completed,
+            'failed': self.failed,
+            'mean_latency': self._latency / done if done else 0.0,
+            'mean_wait': self._wait / done if done else 0.0,
+            'scheduled': len(self.jobs),
+            'missed_runs': sum(job.missed for job in self.jobs),
+        }
+
+    # --- Scheduler --- #
+
+    def schedule(self, task_function, *args, every=0, delay=0, mode:str='rate', align:bool=False, jitter:float=0, overlap:str='skip', max_runs:int=0, **kwargs) -> 'ScheduledJob':
+        """
+            Schedules `task_function(*args, **kwargs)` (a coroutine function or a plain callable) on the event loop. The jobs are kept in a heap ordered by their next run, so thousands of recurring jobs cost O(log n) per run.
+
+            Parameters:
+                - `every` (int|float|str): The interval of a recurring job in seconds, or a spec read with `DataHandlers.split_interval()` like '30s', '5m', '2h', '1d'. Default is 0 (run once).
+                - `delay` (int|float|str): Time before the first run. Default is 0.
+                - `mode` (str): 'rate' runs every `every` seconds from the first run (fixed rate), 'delay' waits `every` seconds after the end of a run (fixed delay). Default is 'rate'.
+                - `align` (bool): Cron-like, the runs fall on multiples of `every` of the wall clock, e.g. every='15m' runs at :00, :15, :30 and :45. Default is False.
+                - `jitter` (float): A random 0 to `jitter` seconds added to every run. Default is 0.
+                - `overlap` (str): What to do when a run is due while the previous one is still running, 'skip' it (counted as missed), 'queue' it after the running one or 'cancel' the previous one. Default is 'skip'.
+                - `max_runs` (int): Stop after this number of runs. Default is 0 (no limit).
 
-    def create_task(self, task_function, *args, **kwargs) -> None:
-        task = asyncio.create_task(task_function(*args, **kwargs))
-        self.tasks.append(task)
+            Returns:
+                ScheduledJob: The job, see `ScheduledJob.stats()` and `ScheduledJob.cancel()`.
+        """
+        if mode not in ('rate', 'delay'): raise ValueError(f'The mode ({mode}) is not supported, use rate or delay.')
+        if overlap not in ('skip', 'queue', 'cancel'): raise ValueError(f'The overlap ({overlap}) is not supported, use skip, queue or cancel.')
+        loop = asyncio.get_running_loop()
+        job = ScheduledJob(self, task_function, args, kwargs, _seconds(every), mode, jitter, overlap, max_runs)
+        first = _seconds(delay)
+        if align and job.interval > 0:
+            first += job.interval - (time.time() + first) % job.interval
+        job.base = loop.time() + first
+        self.jobs.add(job)
+        self._push(job, job.base)
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._scheduleLoop())
+        return job
 
     async def schedule_task(self, task_function, when, *args, **kwargs):
         """
@@ -26,46 +291,262 @@ class AsyncHandlerAio:
 
         Parameters:
         - task_function: the function to be run as an asynchronous task
-        - when: a float or int specifying the number of seconds in the future to run the task (for a single run) or the number of seconds between runs (for a recurring task)
+        - when: a float or int specifying the number of seconds in the future to run the task (for a single run) or the negative number of seconds between runs (for a recurring task), or an interval spec like '10s' (recurring)
         - *args: positional arguments to be passed to the task function
         - **kwargs: keyword arguments to be passed to the task function
 
         Returns:
-        - A Task object representing the scheduled task
-        """
-        # Create a task using the provided task function and arguments
-        task = asyncio.create_task(task_function(*args, **kwargs))
-
-        # Schedule the task to be run at the specified time or interval
-        if when > 0:
-            # Schedule the task to run once in the future
-            asyncio.get_event_loop().call_later(when, task)
-        elif when < 0:
-            # Schedule the task to run repeatedly at a fixed interval
-            asyncio.get_event_loop().call_repeatedly(-when, task)
-        return task
-    
-    async def stop_tasks(self):
-        # Stop all the asynchronous tasks in the handler as before
-        for task in self.tasks:
-            task.cancel()
-        for task in self.running_tasks:
-            task.cancel()
-        await asyncio.gather(*(self.tasks + self.running_tasks), return_exceptions=True)
-        self.tasks = []
-        self.running_tasks = []
+        - A ScheduledJob object representing the scheduled task
+        """
+        if isinstance(when, str):
+            return self.schedule(task_function, *args, every=when, **kwargs)
+        if when < 0:
+            return self.schedule(task_function, *args, every=-when, delay=-when, **kwargs)
+        return self.schedule(task_function, *args, delay=when, **kwargs)
 
-    async def run_task(self) -> None:
-        while self.tasks:
-            while len(self.running_tasks) < self.concurrency and self.tasks:
-                task = self.tasks.pop(0)
-                self.running_tasks.append(task)
-                task.add_done_callback(self.running_tasks.remove)
-            await asyncio.wait(self.running_tasks, return_when=asyncio.FIRST_COMPLETED)
+    def _push(self, job:'ScheduledJob', when:float) -> None:
+        if job.jitter: when += random.uniform(0, job.jitter)
+        job.next_run = when
+        heapq.heappush(self._heap, (when, next(self._seq), job))
+        if self._heap[0][2] is job: self._wakeup.set()
+
+    async def _scheduleLoop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            when = self._heap[0][0]
+            now = loop.time()
+            if when > now:
+                try: await asyncio.wait_for(self._wakeup.wait(), when - now)
+                except asyncio.TimeoutError: pass
+                continue
+            job = heapq.heappop(self._heap)[2]
+            if job.next_run == when: self._fire(job, now)
+
+    def _fire(self, job:'ScheduledJob', now:float) -> None:
+        """Runs the due job according to its overlap policy and, for a fixed rate, puts its next run in the heap counting the runs missed while the loop was late."""
+        if job.task is not None and not job.task.done():
+            if job.overlap == 'skip': job.missed += 1
+            elif job.overlap == 'queue':
+                # the queued runs count against max_runs
+                if job.max_runs == 0 or job.runs + job.backlog < job.max_runs: job.backlog += 1
+            else:
+                job.task.cancel()
+                job.start()
+        else:
+            job.start()
+        if job.mode == 'rate' and job.interval > 0 and not job.finished():
+            job.base += job.interval
+            if job.base <= now:
+                late = int((now - job.base) // job.interval) + 1
+                job.missed += late
+                job.base += late * job.interval
+            self._push(job, job.base)
+
+class ScheduledJob:
+    """A job of `AsyncHandlerAio.schedule()`."""
+
+    def __init__(self, handler:AsyncHandlerAio, task_function, args:tuple, kwargs:dict, interval:float, mode:str, jitter:float, overlap:str, max_runs:int) -> None:
+        self.handler = handler
+        self.task_function = task_function
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.mode = mode
+        self.jitter = jitter
+        self.overlap = overlap
+        self.max_runs = max_runs
+        self.base = 0.0
+        self.next_run = 0.0
+        self.task = None
+        self.cancelled = False
+        self.runs = 0
+        self.missed = 0
+        self.failed = 0
+        self.backlog = 0
+        self.last_error = None
+
+    def finished(self) -> bool:
+        """True once the job will not run again: cancelled, `max_runs` reached or a one-shot job that ran."""
+        return self.cancelled or (self.max_runs > 0 and self.runs >= self.max_runs) or (self.interval == 0 and self.runs > 0)
+
+    def start(self) -> None:
+        if self.finished(): return
+        self.runs += 1
+        self.task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            result = self.task_function(*self.args, **self.kwargs)
+            if inspect.isawaitable(result): await result
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.failed += 1
+            self.last_error = e
+        finally:
+            if self.task is asyncio.current_task():
+                if self.backlog > 0 and not self.finished():
+                    self.backlog -= 1
+                    self.start()
+                elif self.mode == 'delay' and self.interval > 0 and not self.finished():
+                    self.handler._push(self, asyncio.get_running_loop().time() + self.interval)
+                elif self.finished():
+                    self.handler.jobs.discard(self)
+
+    def cancel(self) -> None:
+        """Stops the job and cancels its running run."""
+        self.cancelled = True
+        self.handler.jobs.discard(self)
+        if self.task is not None: self.task.cancel()
+
+    def stats(self) -> dict:
+        """The number of runs, missed runs (skipped by the overlap policy or while the loop was late), failed runs and queued runs of the job."""
+        return {'runs': self.runs, 'missed': self.missed, 'failed': self.failed, 'backlog': self.backlog,
+                'running': self.task is not None and not self.task.done(), 'next_run': None if self.finished() else self.next_run}
+
+_END = object()
+
+class Pipeline:
+    """
+        Pipeline()
+        ==========
+
+        Async pipeline of stages, e.g. fetch -> parse -> transform -> store. Every stage has its own number of workers and reads from a bounded `asyncio.Queue` filled by the stage before it, so a slow stage (a database sink) makes the stages before it wait instead of buffering: the memory used is bounded by the queue sizes whatever the number of items.
+
+        How a stage callable runs depends on its `kind`:
+            - 'loop': called on the event loop and awaited if it returns an awaitable (the default for coroutine functions).
+            - 'io': run on the thread pool of `executor` (the default for plain callables).
+            - 'cpu': run on the process pool of `executor`, for CPU-bound stages (the callable and the items must be picklable). Callables given to `executor.route()` use their route.
+
+        Parameters:
+            - `queue_size` (int): The size of the queue in front of every stage. Default is 100.
+            - `executor` (AsyncThreadHandler, optional): The pools the sync stages run on. Default is a new `AsyncThreadHandler()`.
+            - `errors` (str): 'skip' drops an item whose stage raised (counted in `get_status()`), 'raise' stops the pipeline and raises. Default is 'skip'.
+
+        Usage:
+        ```
+            async with AsyncSqliteHandler('data.db') as db:
+                pipe = (Pipeline(queue_size=200)
+                        .stage(requester.request, concurrency=20)
+                        .stage(parse_page, concurrency=4, kind='cpu')
+                        .stage(flatten_dict)
+                        .sink(lambda rows: db.json_insert('items', rows), batch_size=1000, kind='loop'))
+                await pipe.run(urls)
+                print(pipe.get_status())
+        ```
+    """
+
+    def __init__(self, queue_size:int=100, executor:AsyncThreadHandler=None, errors:str='skip'):
+        if errors not in ('skip', 'raise'): raise ValueError(f'The errors ({errors}) is not supported, use skip or raise.')
+        self.queue_size = queue_size
+        self.executor = executor if executor is not None else AsyncThreadHandler()
+        self.errors = errors
+        self.stages = []
+
+    def stage(self, func, concurrency:int=1, kind:str='', name:str='', flatten:bool=False) -> 'Pipeline':
+        """
+            Adds a stage calling `func(item)` for every item with `concurrency` workers. The result is passed to the next stage, `None` drops the item and with `flatten` every element of the result is passed on. Returns the pipeline so the calls can be chained.
+        """
+        return self._add(func, concurrency, kind, name, flatten, 0)
+
+    def sink(self, func, batch_size:int=1000, concurrency:int=1, kind:str='', name:str='') -> 'Pipeline':
+        """
+            Adds a batch-aware stage calling `func(items)` with lists of `batch_size` items (the last one can be smaller), e.g. `SqliteHandler.json_insert` of 1000 rows at a time. Its results are not passed on.
+        """
+        return self._add(func, concurrency, kind, name, False, max(1, batch_size))
+
+    def _add(self, func, concurrency:int, kind:str, name:str, flatten:bool, batch_size:int) -> 'Pipeline':
+        if kind == '':
+            kind = 'loop' if inspect.iscoroutinefunction(func) else self.executor.routes.get(func, 'io')
+        if kind not in ('loop', 'io', 'cpu'): raise ValueError(f'The kind ({kind}) is not supported, use loop, io or cpu.')
+        self.stages.append({'func': func, 'concurrency': max(1, concurrency), 'kind': kind, 'name': name or getattr(func, '__name__', f'stage{len(self.stages)}'),
+                            'flatten': flatten, 'batch_size': batch_size, 'in': 0, 'out': 0, 'failed': 0, 'busy': 0.0, 'last_error': None})
+        return self
+
+    async def _call(self, stage:dict, arg):
+        start = time.perf_counter()
+        try:
+            if stage['kind'] == 'loop':
+                result = stage['func'](arg)
+                if inspect.isawaitable(result): result = await result
+            else:
+                result = await self.executor.run(stage['func'], arg, kind=stage['kind'])
+        except Exception as e:
+            stage['failed'] += 1
+            stage['last_error'] = e
+            if self.errors == 'raise': raise
+            return None
+        finally:
+            stage['busy'] += time.perf_counter() - start
+        return result
+
+    async def _worker(self, index:int, queues:list, results:list, done:list) -> None:
+        stage = self.stages[index]
+        inbox = queues[index]
+        outbox = queues[index+1] if index+1 < len(self.stages) else None
+        batch = []
+        while True:
+            item = await inbox.get()
+            if item is _END: break
+            stage['in'] += 1
+            if stage['batch_size']:
+                batch.append(item)
+                if len(batch) >= stage['batch_size']:
+                    await self._call(stage, batch)
+                    batch = []
+                continue
+            result = await self._call(stage, item)
+            if result is None: continue
+            for out in (result if stage['flatten'] else (result,)):
+                stage['out'] += 1
+                if outbox is not None: await outbox.put(out)
+                else: results.append(out)
+        if batch:
+            await self._call(stage, batch)
+        done[index] += 1
+        if done[index] == stage['concurrency'] and outbox is not None:
+            for _ in range(self.stages[index+1]['concurrency']):
+                await outbox.put(_END)
+
+    async def run(self, items) -> list:
+        """
+            Feeds `items` (an iterable or an async iterable) through the stages and waits until every item went through.
+
+            Returns:
+                list: The outputs of the last stage if it is not a sink, else [].
+        """
+        if not self.stages: raise ValueError('The pipeline has no stage.')
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        results, done = [], [0]*len(self.stages)
+
+        async def feed():
+            if hasattr(items, '__aiter__'):
+                async for item in items: await queues[0].put(item)
+            else:
+                for item in items: await queues[0].put(item)
+            for _ in range(self.stages[0]['concurrency']):
+                await queues[0].put(_END)
+
+        tasks = [asyncio.create_task(feed())]
+        for index, stage in enumerate(self.stages):
+            tasks += [asyncio.create_task(self._worker(index, queues, results, done)) for _ in range(stage['concurrency'])]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks: task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results
 
     def get_status(self) -> dict:
-        """Get the status of the tasks being managed by the handler"""
-        return {'pending': len(self.tasks), 'running': len(self.running_tasks)}
+        """Per stage metrics: the items in and out, the failed calls, the last error and the time spent in the calls."""
+        return {stage['name']: {k: stage[k] for k in ('kind', 'concurrency', 'in', 'out', 'failed', 'busy', 'last_error')} for stage in self.stages}
 
 if  __name__ == "__main__": 
 
@@ -1,11 +1,153 @@
-import sqlite3, csv, json
+import sqlite3, csv, json, time, re, threading, queue, asyncio, gzip, os, tempfile
 import pandas as pd
+from openpyxl import Workbook
+from itertools import chain, islice
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from functions.DataHandlers import valreplace, equalizer_dict
 from functions.FileHandler import getExtention, read, fileExists, write, write_csv
 from collections.abc import KeysView, ValuesView
 import mysql.connector as myqC
 from datetime import datetime
 
+class SqlitePool():
+    """
+        SqlitePool()
+        ============
+
+        Connection pool used by `SqliteHandler(pool_readers=N)`: one writer connection plus N reader connections to the same database file, all opened with `check_same_thread=False`. The database is put in WAL mode so the readers never block the writer and the writer never blocks the readers.
+
+        Parameters:
+            - `path` (str): The path of the database file.
+            - `readers` (int): The number of reader connections. Default is 4.
+            - `timeout` (int): The busy timeout of every connection in milliseconds. Default is 5000.
+            - `pragmas` (dict): PRAGMAs run on every connection, on top of `journal_mode=WAL` and `synchronous=NORMAL`. e.g. `{'cache_size': -64000, 'mmap_size': 268435456}`.
+            - `cached_statements` (int): The size of the prepared statement cache of every connection. Default is 128.
+    """
+
+    def __init__(self, path:str, readers:int=4, timeout:int=5000, pragmas:dict={}, cached_statements:int=128):
+        self.path = path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.pragmas = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', **pragmas}
+        self.writer = self._connect()
+        self.readers = queue.Queue()
+        for _ in range(readers):
+            self.readers.put(self._connect(query_only=True))
+        self.size = readers
+        self._held, self._held_lock = {}, threading.Lock()
+
+    def _connect(self, query_only:bool=False):
+        conn = sqlite3.connect(self.path, timeout=self.timeout/1000, check_same_thread=False, cached_statements=self.cached_statements)
+        for k,v in self.pragmas.items():
+            conn.execute(f'PRAGMA {k}={v};')
+        if query_only: conn.execute('PRAGMA query_only=1;')
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """
+            Checks out a reader connection for the calling thread, waiting if they are all in use.
+            A thread that already holds a reader (e.g. while iterating `fetch_iter()`) gets the same connection back instead of waiting for another one, so nested reads never deadlock on a small pool.
+        """
+        me = threading.get_ident()
+        with self._held_lock:
+            held = self._held.get(me)
+            if held is not None: held[1] += 1
+        if held is None:
+            held = [self.readers.get(), 1]
+            with self._held_lock: self._held[me] = held
+        try:
+            yield held[0]
+        finally:
+            with self._held_lock:
+                held[1] -= 1
+                release = held[1] == 0
+                if release and self._held.get(me) is held: del self._held[me]
+            if release: self.readers.put(held[0])
+
+    def close(self)->None:
+        """Closes the writer and all the reader connections."""
+        for _ in range(self.size):
+            self.readers.get().close()
+        self.writer.close()
+
+class _Rows():
+    """Cursor-like holder of the rows of a query run on a pooled reader connection."""
+
+    def __init__(self, cursor:sqlite3.Cursor):
+        self.description = cursor.description
+        self.rowcount, self.lastrowid = cursor.rowcount, cursor.lastrowid
+        self.arraysize = 1
+        self._rows = iter(cursor.fetchall())
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetchmany(self, size:int=0):
+        return list(islice(self._rows, size or self.arraysize))
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def __iter__(self):
+        return self._rows
+
+    def close(self):
+        self._rows = iter(())
+
+def _csvValue(convert):
+    """Converter of an inferred csv column: '' gives NULL and a value that does not convert is kept as the raw text."""
+    def value(v:str):
+        if v.strip() == '': return None
+        try:
+            return convert(v)
+        except ValueError:
+            return v
+    return value
+
+_COLUMN_CONSTRAINTS = ('CONSTRAINT', 'PRIMARY', 'NOT', 'NULL', 'UNIQUE', 'CHECK', 'DEFAULT', 'COLLATE', 'REFERENCES', 'GENERATED', 'AS')
+_TABLE_CONSTRAINTS = ('CONSTRAINT', 'PRIMARY', 'UNIQUE', 'CHECK', 'FOREIGN')
+
+def _splitTopLevel(text:str)->list:
+    """Splits `text` on the commas outside parentheses and quotes."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote: quote = None
+        elif ch in '\'"`': quote = ch
+        elif ch == '[': quote = ']'
+        elif ch == '(': depth += 1
+        elif ch == ')': depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return [part for part in parts if part]
+
+def _parseCreateTable(sql:str)->tuple:
+    """
+        Splits the `CREATE TABLE` statement of sqlite_master into `(name, type, constraints)` for every column, the table constraints and the table options (`WITHOUT ROWID`, `STRICT`), the text of every definition is kept as written.
+        Raises ValueError for a statement it can't split (e.g. `CREATE TABLE ... AS SELECT`).
+    """
+    sql = re.sub(r'--[^\n]*|/\*.*?\*/', ' ', sql, flags=re.DOTALL)
+    start, depth = sql.find('('), 0
+    for end in range(start, len(sql)):
+        depth += {'(': 1, ')': -1}.get(sql[end], 0)
+        if depth == 0: break
+    if start < 0 or depth:
+        raise ValueError(f"Can't parse the table definition: {sql}")
+    columns, constraints = [], []
+    for part in _splitTopLevel(sql[start+1:end]):
+        if re.match(r'\w*', part).group(0).upper() in _TABLE_CONSTRAINTS:
+            constraints.append(part)
+            continue
+        name, rest = re.match(r'("(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|\S+)\s*(.*)', part, re.DOTALL).groups()
+        ctype = re.match(r'((?:(?!(?:%s)\b)\w+\s*)*(?:\([^)]*\))?)\s*(.*)' % '|'.join(_COLUMN_CONSTRAINTS), rest, re.DOTALL | re.IGNORECASE)
+        columns.append((name, ctype.group(1).strip(), ctype.group(2).strip()))
+    return columns, constraints, sql[end+1:].strip().rstrip(';').strip()
+
 class SqliteHandler():
     """
         The `DbSqliteHandler` class simplifies interactions with SQLite3 databases in Python, offering a dynamic and efficient approach. It is designed to accelerate the development of database-related projects using Python's SQLite3 module.
@@ -77,16 +219,37 @@ class SqliteHandler():
         `DbSqliteHandler` offers a flexible and efficient way to interact with SQLite3 databases in Python, simplifying database-related tasks and enhancing the productivity of your projects.
     """
   
-    def __init__(self, dbname, dbPath:str='.', json_import:bool=False, default_timeout:int=5000):
+    _schema_statement = re.compile(r'^\s*(CREATE|DROP|ALTER|ROLLBACK)\b', re.IGNORECASE)
+    _read_statement = re.compile(r'^\s*(SELECT|EXPLAIN)\b|^\s*PRAGMA\s+\w+\s*\(', re.IGNORECASE)
+    _plan_statement = re.compile(r'^\s*(SELECT|UPDATE|DELETE|INSERT|REPLACE|WITH)\b', re.IGNORECASE)
+
+    def __init__(self, dbname, dbPath:str='.', json_import:bool=False, default_timeout:int=5000, schema_check:bool=False, pool_readers:int=0, pragmas:dict={}, statement_cache:int=128):
         """
             Initializes the DbSqliteHandler instance.
 
             Parameters:
                 - `dbname` (str): The name of the database.
                 - `dbPath` (str, optional): The path to the database directory. Default is None.
+                - `schema_check` (bool, optional): The table/column/index names are cached in the handler and the cache is cleared by every `CREATE`/`DROP`/`ALTER` run through it. If `True`, SQLite's `schema_version` is also checked before using the cache so schema changes made by other processes/connections are seen. Default is False.
+                - `pool_readers` (int, optional): If greater than 0 the handler runs in pooled mode (see `SqlitePool`): the database is switched to WAL, writes go through one writer connection (serialised with a lock, every thread gets its own cursor) and `SELECT`s run on one of `pool_readers` reader connections, so the handler can be shared by threads and reads do not wait for writes. Default is 0 (a single connection).
+                - `pragmas` (dict, optional): PRAGMAs to set on the connection(s), e.g. `{'synchronous': 'NORMAL', 'cache_size': -64000, 'mmap_size': 268435456}`. Default is {}.
+                - `statement_cache` (int, optional): The number of SQL texts built by `fetch()`/`update()` kept per query shape (LRU), it is also the size of sqlite3's prepared statement cache of the connection(s). Since the values are bound with `?` the same shape always gives the same SQL text, so repeated queries with different values reuse the prepared statement. Default is 128.
         """
+        self.pool = None
+        self.statement_cache = statement_cache
+        self._sql_cache = OrderedDict()
+        self._sql_lock = threading.Lock()
+        self._local = threading.local()
+        self._lock = threading.RLock()
         self.db_init = None
         self.db_conn = None
+        self.insert_stats = {}
+        self.profiling = False
+        self.auto_index = False
+        self._profile_lock = threading.Lock()
+        self.clearProfile()
+        self.schema_check = schema_check
+        self.clearSchemaCache()
         self.dbName = dbname
         self.dbPath = dbPath
         self.dbFullPath = self.dbPath+'/'+self.dbName
@@ -94,14 +257,49 @@ class SqliteHandler():
 
         if json_import and ext == 'json':
             self.load_dbJson(self.dbFullPath, True)
+        elif ext == 'db' and pool_readers > 0:
+            self.pool = SqlitePool(self.dbFullPath, pool_readers, default_timeout, pragmas, statement_cache)
         elif ext == 'db':
-            self.db_init = sqlite3.connect(self.dbFullPath)    
+            self.db_init = sqlite3.connect(self.dbFullPath, cached_statements=statement_cache)
             self.db_conn = self.db_init.cursor()
+            for k,v in pragmas.items():
+                self.db_conn.execute(f'PRAGMA {k}={v};')
         else: 
             raise TypeError('File type error! only excepts json file containing dbcreating data or the db path.')
    
         self.DbtimeOut(default_timeout)
 
+    @property
+    def db_init(self):
+        """The connection used for writes (the writer connection in pooled mode)."""
+        return self.pool.writer if self.pool is not None else self._conn
+
+    @db_init.setter
+    def db_init(self, conn):
+        self._conn = conn
+
+    @property
+    def db_conn(self):
+        """The cursor used by `execute()`, in pooled mode every thread gets its own cursor on the writer connection."""
+        if self.pool is None: return self._cursor
+        cur = getattr(self._local, 'cursor', None)
+        if cur is None:
+            cur = self._local.cursor = self.pool.writer.cursor()
+        return cur
+
+    @db_conn.setter
+    def db_conn(self, cur):
+        self._cursor = cur
+
+    @contextmanager
+    def _reader(self):
+        """Gives a connection to read from: a pooled reader, or the main connection when not pooled or inside a transaction of this thread."""
+        if self.pool is None or getattr(self._local, 'transaction', False):
+            yield self.db_init
+        else:
+            with self.pool.reader() as conn:
+                yield conn
+
     def execute(self, query, data:list=[], multi: bool = False, auto_commit=True):
         """
             execute()
@@ -111,7 +309,7 @@ class SqliteHandler():
 
             Parameters:
                 - `query` (str): The SQL code to execute.
-                - `data` (list): Takes the list of values. Default is [].
+                - `data` (list): Takes the list of values, the rows for `executemany` when `multi` is True or else the values bound to the `?` placeholders of the query. Default is [].
                 - `multi` (bool): True if executing multiple statements. Default is False.
                 - `auto_commit` (bool): True to commit changes automatically after execution. Default is True.
 
@@ -122,62 +320,330 @@ class SqliteHandler():
                 Prints out exceptions and rolls back the transaction if auto_commit is True.
             
         """
+        if self.pool is not None and not multi and not getattr(self._local, 'transaction', False) and self._read_statement.match(query):
+            try:
+                with self.pool.reader() as conn:
+                    start = time.perf_counter()
+                    rows = _Rows(conn.execute(query, data))
+                    if self.profiling: self._profile(conn, query, data, start)
+                    return rows
+            except sqlite3.Error as e:
+                print("SQLite error:", e)
+                return None
         try:
-            if multi==True and data!=[]:
-                result = self.db_conn.executemany(query, data)
-            else:
-                result = self.db_conn.execute(query)
-            if auto_commit:
-                self.db_init.commit()
-            return result
+            with self._lock:
+                start = time.perf_counter()
+                if multi==True and data!=[]:
+                    result = self.db_conn.executemany(query, data)
+                else:
+                    result = self.db_conn.execute(query, data)
+                if self.profiling: self._profile(self.db_init, query, data[0] if multi and data else data, start)
+                if auto_commit and not getattr(self._local, 'transaction', False):
+                    self.db_init.commit()
+                return result
         except sqlite3.Error as e:
             print("SQLite error:", e)
-            if auto_commit: self.db_init.rollback()
+            if auto_commit and not getattr(self._local, 'transaction', False): self.db_init.rollback()
+        finally:
+            if self._schema_statement.match(query): self.clearSchemaCache()
         return None
 
+    # --- Schema cache --- #
+
+    def clearSchemaCache(self)->None:
+        """
+            clearSchemaCache()
+            ------------------
+            Clears the cached table, column and index names. It is called automatically after every `CREATE`/`DROP`/`ALTER` statement run through `execute()`, call it manually if the schema is changed outside the handler and `schema_check` is off.
+        """
+        self.schema_cache = {'tables': None, 'columns': {}, 'indexes': {}}
+        self.schema_version = None
+        self._plans = {}
+        self._plan_epoch = getattr(self, '_plan_epoch', 0) + 1
+        with self._sql_lock: self._sql_cache.clear()
+
+    def _checkSchema(self)->None:
+        if not self.schema_check: return
+        with self._reader() as conn:
+            version = conn.execute('PRAGMA schema_version;').fetchone()[0]
+        if version != self.schema_version:
+            self.clearSchemaCache()
+            self.schema_version = version
+
+    def _tableInfo(self, table_name:str)->list:
+        """Returns the cached `PRAGMA table_info` rows of the table."""
+        self._checkSchema()
+        info = self.schema_cache['columns'].get(table_name)
+        if info is None:
+            with self._reader() as conn:
+                info = self.schema_cache['columns'][table_name] = conn.execute(f'PRAGMA table_info({table_name});').fetchall()
+        return info
+
+    # --- Query profiling / index advisor --- #
+
+    def startProfiling(self, auto_index:bool=False, min_count:int=10)->None:
+        """
+            startProfiling()
+            ----------------
+            Records every statement run through `execute()` (so `fetch()`, `update()`, ...) with its timing and its `EXPLAIN QUERY PLAN`, see `indexReport()`. The plan of a statement is explained once and again after every schema change. Values bound with `?` are left out of the SQL text so every query shape gets one entry.
+
+            Parameters:
+                - `auto_index` (bool): Create the suggested index of a statement automatically once it has done a full table scan `min_count` times. Default is False.
+                - `min_count` (int): See `auto_index`. Default is 10.
+        """
+        self.auto_index = auto_index
+        self.auto_index_count = min_count
+        self.profiling = True
+
+    def stopProfiling(self)->None:
+        """Stops recording the statements, the records are kept until `clearProfile()`."""
+        self.profiling = False
+        self.auto_index = False
+
+    def clearProfile(self)->None:
+        """Clears the statements recorded by `startProfiling()`."""
+        with self._profile_lock:
+            self.profile_log = {}
+            self.auto_indexes = []
+
+    def _profile(self, conn, query:str, params, start:float)->None:
+        """Adds the timing of the statement to `profile_log` and explains it if its plan is not known."""
+        elapsed = time.perf_counter() - start
+        plan = self._plans.get(query)
+        if plan is None and self._plan_statement.match(query):
+            try:
+                # the epoch keeps sqlite3's statement cache from giving back a plan prepared before the last schema change
+                plan = [row[3] for row in conn.execute(f'/* {self._plan_epoch} */ EXPLAIN QUERY PLAN {query}', params).fetchall()]
+            except sqlite3.Error:
+                plan = []
+            self._plans[query] = plan
+        plan = plan or []
+        scans = [d for d in plan if re.match(r'SCAN (TABLE )?\w+$', d) or 'TEMP B-TREE' in d]
+        with self._profile_lock:
+            rec = self.profile_log.get(query)
+            if rec is None:
+                rec = self.profile_log[query] = {'count': 0, 'time': 0.0, 'max': 0.0, 'full_scans': 0, 'plan': []}
+            rec['count'] += 1
+            rec['time'] += elapsed
+            rec['max'] = max(rec['max'], elapsed)
+            rec['plan'] = plan
+            if scans: rec['full_scans'] += 1
+            create = self.auto_index and scans and rec['full_scans'] == self.auto_index_count and not getattr(self._local, 'transaction', False)
+        if create:
+            advice = self._indexAdvice(query)
+            if advice is not None:
+                self.auto_indexes.append(self._createAdvisedIndex(*advice[:2]))
+
+    def _indexColumns(self, table:str)->list:
+        """Returns the column names of every index of the table."""
+        with self._reader() as conn:
+            return [tuple(col[2] for col in conn.execute(f'PRAGMA index_info({idx[1]});').fetchall())
+                    for idx in conn.execute(f'PRAGMA index_list({table});').fetchall()]
+
+    def _indexAdvice(self, query:str):
+        """
+            Suggests an index for the statement: the columns compared with `=`/`IS`/`IN` in the WHERE clause, then the first range compared column or else the ORDER BY columns. If the selected columns are few they are added so the index covers the query.
+            Returns `(table, columns, covering)`, or None if there is nothing to index or an existing index already starts with the columns.
+        """
+        table = re.search(r'\bFROM\s+(\w+)|^\s*UPDATE\s+(\w+)', query, re.IGNORECASE)
+        if table is None: return None
+        table = table.group(1) or table.group(2)
+        known = self.getColumnNames(table)
+        if not known: return None
+        where = re.search(r'\bWHERE\s+(.*?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|;|$)', query, re.IGNORECASE | re.DOTALL)
+        order = re.search(r'\bORDER\s+BY\s+(.*?)(?:\bLIMIT\b|;|$)', query, re.IGNORECASE | re.DOTALL)
+        equal, ranged = [], []
+        for col, op in re.findall(r'\b(\w+)\s*(==|=|IS\b|IN\b|<=|>=|<|>|LIKE\b|BETWEEN\b)', where.group(1) if where else '', re.IGNORECASE):
+            if col in known:
+                (equal if op.upper() in ('=', '==', 'IS', 'IN') else ranged).append(col)
+        sort = [col for col in re.findall(r'(\w+)(?:\s+(?:ASC|DESC))?\s*(?:,|$)', order.group(1).strip()) if col in known] if order else []
+        columns = list(dict.fromkeys(equal + (ranged[:1] if ranged else sort)))
+        if not columns: return None
+        for idx in self._indexColumns(table):
+            if idx[:len(columns)] == tuple(columns): return None
+        covering = False
+        selected = re.match(r'^\s*SELECT\s+(.*?)\s+FROM\b', query, re.IGNORECASE | re.DOTALL)
+        if selected and selected.group(1).strip() != '*':
+            extra = [col.strip() for col in selected.group(1).split(',') if col.strip() not in columns]
+            if all(col in known for col in extra) and len(columns) + len(extra) <= 6:
+                columns += extra
+                covering = True
+        return table, tuple(columns), covering
+
+    def _createAdvisedIndex(self, table:str, columns:tuple)->str:
+        """Creates the index on a cursor of its own: it may run from `_profile()` while the writer cursor still holds the rows `execute()` returns."""
+        sql = f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)});"
+        try:
+            with self._lock:
+                self.db_init.execute(sql)
+                if not getattr(self._local, 'transaction', False): self.db_init.commit()
+        except sqlite3.Error as e:
+            print("SQLite error:", e)
+        finally:
+            self.clearSchemaCache()
+        return sql
+
+    def indexReport(self, top:int=10)->dict:
+        """
+            indexReport()
+            -------------
+            Report of the statements recorded by `startProfiling()`.
+
+            Parameters:
+                - `top` (int): The number of statements and suggestions returned. Default is 10.
+
+            Returns:
+                dict:
+                    - `statements`: The slowest statements by total time with their `count`, `time`, `avg`, `max`, `full_scans` and `plan`.
+                    - `full_scans`: The statements whose plan scans a whole table (or sorts with a temp b-tree), most frequent first.
+                    - `suggestions`: The indexes suggested for those statements grouped by column set, most frequent first, with the `CREATE INDEX` statement (`applyIndexAdvice()` creates them).
+        """
+        with self._profile_lock:
+            log = {sql: dict(rec) for sql, rec in self.profile_log.items()}
+        statements = [{'sql': sql, 'avg': rec['time']/rec['count'], **rec} for sql, rec in log.items()]
+        scanned = sorted((st for st in statements if st['full_scans']), key=lambda st: st['full_scans'], reverse=True)
+        suggestions = {}
+        for st in scanned:
+            advice = self._indexAdvice(st['sql'])
+            if advice is None: continue
+            table, columns, covering = advice
+            sug = suggestions.setdefault((table, columns), {'table': table, 'columns': list(columns), 'covering': covering, 'count': 0, 'time': 0.0,
+                                                           'sql': f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)});"})
+            sug['count'] += st['full_scans']
+            sug['time'] += st['time']
+        return {
+            'statements': sorted(statements, key=lambda st: st['time'], reverse=True)[:top],
+            'full_scans': [st['sql'] for st in scanned][:top],
+            'suggestions': sorted(suggestions.values(), key=lambda sug: sug['count'], reverse=True)[:top],
+        }
+
+    def applyIndexAdvice(self, top:int=0)->list:
+        """
+            applyIndexAdvice()
+            ------------------
+            Creates the indexes suggested by `indexReport()`, the `top` most frequent ones or all of them if `top` is 0. Returns the `CREATE INDEX` statements run.
+        """
+        suggestions = self.indexReport(top if top > 0 else len(self.profile_log))['suggestions']
+        return [self._createAdvisedIndex(sug['table'], tuple(sug['columns'])) for sug in suggestions]
+
     # --- Data handleing --- #
 
     
-    def insert(self, table:str, columns, values, createTb:bool=False):
+    def _adapt(self, value):
+        """Makes a value bindable, lists/dicts are stored as json text."""
+        return json.dumps(value) if isinstance(value, (dict, list, tuple)) else value
+
+    def bulk_insert(self, table:str, columns, rows, batch_size:int=1000, createTb:bool=False, onConflict:str='', progress=None):
+        """
+            bulk_insert()
+            -------------
+
+            Inserts rows with a single prepared `INSERT ... VALUES (?, ?, ...)` statement through `executemany`, in batches of `batch_size` rows inside one transaction. The rows are consumed lazily, so a generator of any size can be inserted without holding it in memory.
+
+            Parameters:
+                - `table` (str): The name of the table to insert data into.
+                - `columns` (str, list, KeysView): The column names.
+                - `rows` (iterable): The rows as tuples/lists (in the order of `columns`) or dicts (missing keys are inserted as NULL).
+                - `batch_size` (int): The number of rows sent per `executemany` call. Default is 1000.
+                - `createTb` (bool): This will create a table in the db if not available. Default is `False`.
+                - `onConflict` (str): The conflict resolution of the statement, i.e. 'IGNORE' or 'REPLACE'. Default is ''.
+                - `progress` (callable, optional): Called after every batch with the number of rows inserted so far and the seconds elapsed. Default is None.
+
+            Returns:
+                dict: The insert stats `{'rows', 'batches', 'seconds', 'rows_per_sec'}`, also kept in `self.insert_stats`. `None` if the insert failed with a SQLite error and was rolled back.
+
+            If Error/Or exceptions:
+                Any other error (a bad row, a failing `progress` callback...) rolls the insert back and is raised. Inside an already open transaction nothing is rolled back and every error is raised, so the owner of the transaction can roll it back.
+
+            Usage Example:
+            ```
+                rows = ({'name': n, 'val': i} for i, n in enumerate(names))
+                stats = cl.bulk_insert('my_table', ['name', 'val'], rows, batch_size=5000)
+                print(stats['rows_per_sec'])
+            ```
+        """
+        if isinstance(columns, str):
+            columns = [c.strip() for c in columns.split(',')]
+        columns = list(columns)
+        if createTb==True and self.getTb(table_name=table) == False: self.createTb(tbName=table, columns=columns, primary_key='id')
+        names = columns
+        keys = ['INDEX','KEY','SELECT','INSERT','UPDATE','DELETE','FROM','WHERE','JOIN','INNER','LEFT','RIGHT','GROUP BY','ORDER BY','AS','COUNT','SUM','MAX','MIN','AVG','DISTINCT','AND','OR','NOT','BETWEEN','LIKE','IN','NULL','TRUE','FALSE','TOP','LIMIT','OFFSET']
+        for k in keys:
+            names = valreplace(names, k, '_'+k.upper(), 1) # type: ignore
+            names = valreplace(names, k.lower(), '_'+k.lower(), 1) # type: ignore
+
+        conflict = f' OR {onConflict.upper()}' if onConflict != '' else ''
+        query = f'INSERT{conflict} INTO {table} ({",".join(names)}) VALUES ({",".join("?" * len(names))});'
+        adapt = self._adapt
+
+        def to_row(row):
+            if isinstance(row, dict):
+                return tuple(adapt(row.get(c)) for c in columns)
+            return tuple(adapt(v) for v in row)
+
+        rows = iter(rows)
+        count, batches, start = 0, 0, time.perf_counter()
+        with self._lock:
+            external = self.db_init.in_transaction
+            try:
+                if not external and self.db_init.isolation_level is None:
+                    self.db_conn.execute('BEGIN;')
+                while True:
+                    batch = [to_row(r) for r in islice(rows, batch_size)]
+                    if not batch: break
+                    self.db_conn.executemany(query, batch)
+                    count += len(batch)
+                    batches += 1
+                    if progress is not None: progress(count, time.perf_counter() - start)
+                if not external: self.db_init.commit()
+            except Exception as e:
+                if not external: self.db_init.rollback()
+                # inside a transaction of the caller the error is theirs to handle, they own the rollback
+                if external or not isinstance(e, sqlite3.Error): raise
+                print("SQLite error:", e)
+                return None
+        seconds = time.perf_counter() - start
+        self.insert_stats = {'rows': count, 'batches': batches, 'seconds': round(seconds, 6), 'rows_per_sec': round(count / seconds, 2) if seconds > 0 else float(count)}
+        return self.insert_stats
+
+    def insert(self, table:str, columns, values, createTb:bool=False, batch_size:int=1000):
         """
             Inserts data into the specified table.
 
             Parameters:
                 - `table` (str): The name of the table to insert data into.
                 - `columns` (str, list, KeysView): Comma-separated column names.
-                - `values` (list): List of values to be inserted.
+                - `values` (list|iterable|str): A single row, a list/iterable/generator of rows (tuples, lists or dicts) or a raw SQL values string.
                 - `createTb` (bool): This will create a table in the db if not available. Default is `False`.
+                - `batch_size` (int): The number of rows per `executemany` batch. Default is 1000.
 
             Returns:
-                sqlite3.Cursor: The result of the executed query.
+                sqlite3.Cursor: The cursor of the insert, `None` if it failed. The rows/sec stats are kept in `self.insert_stats`.
         """
-        if createTb==True and self.getTb(table_name=table) == False: self.createTb(tbName=table, columns=columns, primary_key='id')
-        k=False
-        if isinstance(columns, (KeysView, list, tuple, ValuesView)):
-            keys = ['INDEX','KEY','SELECT','INSERT','UPDATE','DELETE','FROM','WHERE','JOIN','INNER','LEFT','RIGHT','GROUP BY','ORDER BY','AS','COUNT','SUM','MAX','MIN','AVG','DISTINCT','AND','OR','NOT','BETWEEN','LIKE','IN','NULL','TRUE','FALSE','TOP','LIMIT','OFFSET']
-            for k in keys:
-                columns = valreplace(columns, k, '_'+k.upper(), 1) # type: ignore
-                columns = valreplace(columns, k.lower(), '_'+k.lower(), 1) # type: ignore
-            columns = ','.join(columns)
-
-        if isinstance(values, (KeysView, list, tuple, ValuesView)):
-            value = []
-            for val in values:
-                if isinstance(val, (KeysView, list, tuple, ValuesView)):
-                    value.append(str(tuple(val)))
-                
-                elif isinstance(val, str):
-                    value = str(tuple(values))
-                    return self.execute(f'INSERT INTO {table} ({columns}) VALUES {value};')
-            value = ','.join(value)
-            k = self.execute(f'INSERT INTO {table} ({columns}) VALUES {value} ;')
-        elif isinstance(values, str):
-            # print(values)
-            k = self.execute(f'INSERT INTO {table} ({columns}) VALUES ({values});')
-        else: raise ValueError('Invalid input format! Please provide a valid set of values.')
-        return k
+        if isinstance(values, str):
+            if createTb==True and self.getTb(table_name=table) == False: self.createTb(tbName=table, columns=columns, primary_key='id')
+            if isinstance(columns, (KeysView, list, tuple, ValuesView)): columns = ','.join(columns)
+            return self.execute(f'INSERT INTO {table} ({columns}) VALUES ({values});')
+        rows = self._valueRows(values)
+        if rows is None: return None
+        if self.bulk_insert(table, columns, rows, batch_size, createTb) is None: return None
+        return self.db_conn
+
+    def _valueRows(self, values):
+        """Turns the `values` of `insert()` (a single row or an iterable of rows) into an iterator of rows, `None` if there are no rows."""
+        if isinstance(values, dict):
+            values = [values]
+        elif not hasattr(values, '__iter__'):
+            raise ValueError('Invalid input format! Please provide a valid set of values.')
+
+        values = iter(values)
+        first = next(values, None)
+        if first is None: return None
+        if isinstance(first, (KeysView, list, tuple, ValuesView, dict)):
+            return chain([first], values)
+        return iter([tuple(chain([first], values))])
     
-    def json_insert(self, table_name:str, data, createTb:bool=False, ifExist:str=''):
+    def json_insert(self, table_name:str, data, createTb:bool=False, ifExist:str='', batch_size:int=1000):
         '''
             JSON_INSERT()
             -------------
@@ -185,35 +651,52 @@ class SqliteHandler():
             This method is used to insert data into the table using json format data.
             Parameters:
                 - `table_name` (str):This parametere of the method tales the name of the table in which the data is to inserted.
-                - `data` (list|dict): This parameter takes the data either in dict format or a list containing dicts if multiple entries are to add.
+                - `data` (list|dict|iterable|str): This parameter takes the data either in dict format, a list (or generator) containing dicts if multiple entries are to add, or the same as a json string.
                 - `createTb` (bool): ..
                 - `ifExist` (list): A list of fields that should exist before inserting the record. If any field does not 
+                - `batch_size` (int): The number of rows per `executemany` batch. Default is 1000.
                 - return None
+
+            Missing keys are filled with `''` (or `0` for numeric columns) like `equalizer_dict` does. For a list the columns are every key of every dict, for a generator they are the keys of the first dict.
         '''
-              
-        table_column = self.getColumnNames(table_name)
-                    
+        col, rows = self._jsonRows(table_name, data, ifExist)
+        return self.insert(table_name, col, rows, createTb, batch_size)
+
+    def _jsonRows(self, table_name:str, data, ifExist:str=''):
+        """Turns the `data` of `json_insert()` into its column list and an iterator of row tuples."""
+        if isinstance(data, str):
+            data = json.loads(data)
+
         if isinstance(data, dict):
+            table_column = self.getColumnNames(table_name)
             col, query = [], []
             for k,i in data.items():
                 if k in table_column and isinstance(i, (str, float, int)):
                     col.append(k)
-                    query.append(i)   
+                    query.append(i)
+            rows = [query]
         elif isinstance(data, list) and len(data) > 0:
-            data = equalizer_dict(data)
-            col = data[0].keys()
-            query = [list(i.values()) for i in data]
+            fill = {}
+            for row in data:
+                for k,v in row.items():
+                    if k not in fill: fill[k] = 0 if isinstance(v, (int, float)) else ''
+            col = list(fill.keys())
+            rows = (tuple(row.get(k, fill[k]) for k in col) for row in data)
+        elif not isinstance(data, (list, tuple, KeysView, ValuesView)) and hasattr(data, '__iter__'):
+            data = iter(data)
+            first = next(data, None)
+            if not isinstance(first, dict): raise ValueError('The data type passed is invald. The data paramerter takes a dict or a list of dict.')
+            fill = {k: 0 if isinstance(v, (int, float)) else '' for k,v in first.items()}
+            col = list(fill.keys())
+            rows = (tuple(row.get(k, fill[k]) for k in col) for row in chain([first], data))
         else:raise ValueError('The data type passed is invald. The data paramerter takes a dict or a list of dict.')
         
-        col = list(col)
         if ifExist!='':
             check_data = self.fetch_unique(table_name, ifExist)
             check_data = {ifExist: check_data} if isinstance(check_data, list) else check_data
             for k,v in check_data.items():
-                col_idx = col.index(k)
-                query = [val for val in query if val[col_idx] not in v]
-        
-        return self.insert(table_name, col, query, createTb)       
+                rows = filter(lambda val, idx=col.index(k), existing=set(v): val[idx] not in existing, rows)
+        return col, rows
 
     def update(self, table:str, updatedata, condition:str=''):
         """
@@ -228,7 +711,8 @@ class SqliteHandler():
                     - `"ColumnName='data1' AND ColumnName2='data2'"  OR  {'ColumnName':'data1', 'ColumnName2':'data2'}
                     `
                 - `condition`: This parameter is set where the data is to be updated.
-                    - `id='5'`
+                    - `id='5'`  OR  `{'id': 5}`
+                    The values of a dict `updatedata`/`condition` are bound with `?` placeholders, so the statement is prepared once per set of columns.
                     Default is ''. If left empty, then the update will happen all over the column which is specified.
             
             Return:
@@ -242,10 +726,14 @@ class SqliteHandler():
                 cl.update('tableName', updatedata, condition)
             ```
         """
-        condition = f'WHERE {condition}' if condition!='' else ''
+        shape, where, params = self._where(condition)
         if isinstance(updatedata, dict):
-            updatedata = ', '.join(["{}='{}'".format(k,v) for k,v in updatedata.items()])
-        t = self.execute(f'UPDATE {table} SET {updatedata} {condition};')
+            sets = tuple(updatedata.keys())
+            query = self._statement(('update', table, sets, shape), lambda: f"UPDATE {table} SET {', '.join(f'{k}=?' for k in sets)}{where};")
+            params = [self._adapt(v) for v in updatedata.values()] + params
+        else:
+            query = f'UPDATE {table} SET {updatedata}{where};'
+        t = self.execute(query, params)
         if t : return True
         return False
 
@@ -258,10 +746,10 @@ class SqliteHandler():
 
             Parameters:
                 - `table` (str): The name of the table to fetch data from.
-                - `query` (str|list|dict|optional): The SQL query/Search parameter that is to be executed.
+                - `query` (str|list|dict|optional): The SQL query/Search parameter that is to be executed. The values of a dict are bound with `?` placeholders (`None` matches NULL), so lookups with different values reuse the same prepared statement.
                 - `columns` (str): The columns that needs to be fetched.
                 - `limit` (int, optioanl): This parameter is to set the number of columns to fetch.
-                - `offset` (int, optional): The parameter if speciied will get the columns from the limit number pf columns to the number specifed in this parameter. eg: from column 5 to 23. This parameter will only be in effect of the limit parameter is use.
+                - `offset` (int, optional): The number of rows skipped before the `limit` rows are returned. This parameter will only be in effect of the limit parameter is use. SQLite still reads the skipped rows, so for deep pages use `fetch_page()`.
                 - `fetchAll` (bool, optional): The columns that needs to be fetched.
                 - `desc` (str, True, optional): The columns that are to be fetched in descending order.
 
@@ -278,32 +766,7 @@ class SqliteHandler():
             ```
         """
         
-        if self.getTb(table) == False: 
-            raise ValueError(f'The table({table}) is not present in the database.')
-    
-        if isinstance(query, str) and query!='':
-            query = f' WHERE {query}'
-        elif isinstance(query, list)and len(query) > 0:
-            query = ' WHERE ' + ' AND '.join(query)
-        elif isinstance(query, dict)and len(query.keys()) > 0:
-            query = ' WHERE ' + ' AND '.join([f"{k}='{v}'" for k,v in query.items() if v!=None or v!='']) 
-            
-        order = ''
-        if desc != '' or assc != '':
-            order = ' ORDER BY '
-            col = self.getColumnNames(table)
-            if desc != '' :
-                order += ' DESC' if desc==True else f'{desc} DESC' if desc in col else ''
-            if assc != '' :
-                order += ' ASC' if desc==True else f'{desc} ASC' if assc in col else ''
-            
-        if limit > 0:
-            Offset = f' OFFSET {Offset}' if 0 < Offset < limit else ''
-            limit = f' LIMIT {str(limit)}' + Offset
-        else:
-            limit = ''
-            
-        ret = self.execute(f'SELECT {columns} FROM {table}{query}{order}{limit};')
+        ret = self.execute(*self._select(table, columns, query, limit, Offset, assc, desc))
         try:
             if ret is not None:
                 
@@ -313,12 +776,186 @@ class SqliteHandler():
                 else:
                     col = [column[0] for column in ret.description] if ret.description else []
                     if fetchAll: return [dict(zip(col, row)) for row in ret.fetchall()]
-                    elif ret.fetchone() is not None:  return dict(zip(col, ret.fetchone()))
+                    row = ret.fetchone()
+                    if row is not None: return dict(zip(col, row))
             else: return []
         except Exception as e:
             print(e)
             return []
 
+    # --- Query builder --- #
+
+    def _where(self, query)->tuple:
+        """
+            Turns the `query` of `fetch()`/`update()` into a WHERE clause and its values: the values of a dict are bound with `?` placeholders (`None` gives `IS NULL`), a str or a list of conditions is used as it is.
+            The conditions of a list are parenthesised when there are several, so an `OR` in one of them stays inside it.
+            Returns `(shape, clause, params)`, the shape is hashable and the same for every query that gives the same SQL text.
+        """
+        if isinstance(query, dict) and len(query.keys()) > 0:
+            shape = tuple((k, v is None) for k,v in query.items())
+            clause = ' WHERE ' + ' AND '.join(f'{k} IS NULL' if null else f'{k}=?' for k, null in shape)
+            return shape, clause, [self._adapt(v) for v in query.values() if v is not None]
+        elif isinstance(query, list) and len(query) > 0:
+            return tuple(query), ' WHERE ' + ' AND '.join(f'({q})' if len(query) > 1 else q for q in query), []
+        elif isinstance(query, str) and query != '':
+            return query, f' WHERE {query}', []
+        return '', '', []
+
+    def _statement(self, key:tuple, build)->str:
+        """Returns the SQL text cached under `key` (LRU of `statement_cache` entries), building it with `build()` on a miss."""
+        with self._sql_lock:
+            sql = self._sql_cache.get(key)
+            if sql is not None:
+                self._sql_cache.move_to_end(key)
+                return sql
+        sql = build()
+        with self._sql_lock:
+            self._sql_cache[key] = sql
+            if len(self._sql_cache) > self.statement_cache:
+                self._sql_cache.popitem(last=False)
+        return sql
+
+    def _select(self, table:str, columns:str='*', query='', limit:int=0, Offset:int=0, assc:str='', desc:str='')->tuple:
+        """Builds the `SELECT` statement of `fetch()`/`fetch_iter()` from their parameters. Returns `(sql, params)`."""
+        if self.getTb(table) == False: 
+            raise ValueError(f'The table({table}) is not present in the database.')
+        shape, where, params = self._where(query)
+        offset = limit > 0 and Offset > 0
+
+        def build():
+            order = []
+            if desc != '' or assc != '':
+                col = self.getColumnNames(table)
+                if desc != '' and (desc==True or desc in col):
+                    order.append('rowid DESC' if desc==True else f'{desc} DESC')
+                if assc != '' and (assc==True or assc in col):
+                    order.append('rowid ASC' if assc==True else f'{assc} ASC')
+            order = ' ORDER BY ' + ', '.join(order) if order else ''
+            page = (' LIMIT ? OFFSET ?' if offset else ' LIMIT ?') if limit > 0 else ''
+            return f'SELECT {columns} FROM {table}{where}{order}{page};'
+
+        sql = self._statement(('select', table, columns, shape, limit > 0, offset, assc, desc), build)
+        if limit > 0:
+            params = params + ([limit, Offset] if offset else [limit])
+        return sql, params
+
+    def fetch_page(self, table:str, columns:str='*', query='', key='rowid', after=None, limit:int=100, desc:bool=False, detailed:bool=True)->tuple:
+        """
+            fetch_page()
+            ------------
+
+            Keyset (seek) pagination: returns the `limit` rows that follow the cursor `after` in `key` order. The page is found with an indexed `WHERE key > ?` seek instead of `OFFSET`, so every page costs the same however deep it is.
+
+            Parameters:
+                - `table`, `columns`, `query`, `detailed`: Same as `fetch()`.
+                - `key` (str|list): The column(s) the rows are ordered and paged by. They must be unique together and should be indexed, e.g. the primary key or `['created', 'rowid']`. Default is 'rowid'.
+                - `after` (any|tuple, optional): The cursor returned with the previous page, the key value (a tuple for several key columns) of its last row. Default is None (the first page).
+                - `limit` (int): The number of rows per page. Default is 100.
+                - `desc` (bool): Page in descending key order. Default is False.
+
+            Returns:
+                tuple: `(rows, cursor)`, `cursor` is passed as `after` to get the next page and is None after the last page.
+
+            Usage Example:
+            ```
+                rows, cursor = cl.fetch_page('my_table', key='id', limit=50)
+                while cursor is not None:
+                    rows, cursor = cl.fetch_page('my_table', key='id', after=cursor, limit=50)
+            ```
+        """
+        if self.getTb(table) == False:
+            raise ValueError(f'The table({table}) is not present in the database.')
+        keys = tuple(k.strip() for k in key.split(',')) if isinstance(key, str) else tuple(key)
+        single = len(keys) == 1
+        shape, where, params = self._where(query)
+
+        def build():
+            clause = where
+            if after is not None:
+                target = keys[0] if single else f"({', '.join(keys)})"
+                marks = '?' if single else f"({', '.join('?' for _ in keys)})"
+                seek = f"{target} {'<' if desc else '>'} {marks}"
+                # the query is parenthesised so an OR in it can't bypass the seek
+                clause = f" WHERE ({where[len(' WHERE '):]}) AND {seek}" if where else f' WHERE {seek}'
+            order = ', '.join(f"{k} {'DESC' if desc else 'ASC'}" for k in keys)
+            return f"SELECT {', '.join(keys)}, {columns} FROM {table}{clause} ORDER BY {order} LIMIT ?;"
+
+        sql = self._statement(('page', table, columns, shape, keys, after is not None, desc), build)
+        if after is not None:
+            params = params + ([after] if single else list(after))
+        with self._reader() as conn:
+            cur = conn.execute(sql, params + [limit])
+            col = [column[0] for column in cur.description][len(keys):]
+            data = cur.fetchall()
+        if not data:
+            return [], None
+        last = data[-1][:len(keys)]
+        rows = [row[len(keys):] for row in data]
+        if detailed:
+            rows = [dict(zip(col, row)) for row in rows]
+        return rows, (None if len(data) < limit else last[0] if single else tuple(last))
+
+    def fetch_pages(self, table:str, columns:str='*', query='', key='rowid', after=None, limit:int=1000, desc:bool=False, detailed:bool=True):
+        """
+            fetch_pages()
+            -------------
+
+            Generator walking the whole table (or the rows matching `query`) page by page with `fetch_page()`, every page is one index seek so the cost per page stays constant. The parameters are the same as `fetch_page()`, `after` resumes the walk from a saved cursor.
+
+            Usage Example:
+            ```
+                for rows in cl.fetch_pages('my_table', key='id', limit=1000):
+                    process(rows)
+            ```
+        """
+        while True:
+            rows, after = self.fetch_page(table, columns, query, key, after, limit, desc, detailed)
+            if rows: yield rows
+            if after is None: break
+
+    def fetch_iter(self, table:str, columns:str='*', query='', limit:int=0, Offset:int=0, assc:str='', desc:str='', row_type:str='dict', arraysize:int=1000):
+        """
+            fetch_iter()
+            ------------
+
+            Same as `fetch()` but yields the rows lazily, `arraysize` rows at a time through `fetchmany()`, instead of loading the whole result into a list. The memory used stays flat whatever the size of the table and the first row is available immediately.
+
+            The rows are read from a dedicated cursor, so other queries can be run on the handler while iterating. In pooled mode the generator keeps one reader connection until it is exhausted or closed: the reads of the same thread share it meanwhile, other threads use the remaining readers.
+
+            Parameters:
+                - `table`, `columns`, `query`, `limit`, `Offset`, `assc`, `desc`: Same as `fetch()`.
+                - `row_type` (str): The type of the yielded rows, 'dict', 'tuple' or 'namedtuple'. Default is 'dict'.
+                - `arraysize` (int): The number of rows fetched from SQLite per round trip. Default is 1000.
+
+            Usage Example:
+            ```
+                for row in cl.fetch_iter('my_table', row_type='namedtuple'):
+                    print(row.column1)
+            ```
+        """
+        if row_type not in ('dict', 'tuple', 'namedtuple'):
+            raise ValueError(f'The row_type ({row_type}) is not supported, use dict, tuple or namedtuple.')
+        query, params = self._select(table, columns, query, limit, Offset, assc, desc)
+        with self._reader() as conn:
+            cur = conn.cursor()
+            try:
+                cur.arraysize = arraysize
+                cur.execute(query, params)
+                col = [column[0] for column in cur.description] if cur.description else []
+                if row_type == 'namedtuple':
+                    make = namedtuple('Row', col, rename=True)._make
+                elif row_type == 'dict':
+                    make = lambda row: dict(zip(col, row))
+                else:
+                    make = None
+                while True:
+                    rows = cur.fetchmany()
+                    if not rows: break
+                    if make is None: yield from rows
+                    else: yield from map(make, rows)
+            finally:
+                cur.close()
+
     def getTbData(self, table_name:str,columns:str='*',query:str='', limit:int=0, offset:int=0, fetchAll:bool=True, desc:str=''):
         """
             Retrieves data from the specified table and returns it in a pandas DataFrame format.
@@ -343,8 +980,12 @@ class SqliteHandler():
                 This method is similar to the fetch function, but it returns the data in a pandas DataFrame format.
             """
         if self.getCount(table_name) > 0:
-            data = self.fetch(table_name,columns, query, limit, offset, fetchAll, desc)
-            return pd.DataFrame(data, index=None)
+            if not fetchAll:
+                return pd.DataFrame([self.fetch(table_name, columns, query, limit, offset, fetchAll, desc=desc)], index=None)
+            query, params = self._select(table_name, columns, query, limit, offset, desc=desc)
+            with self._reader() as conn:
+                cur = conn.execute(query, params)
+                return pd.DataFrame.from_records(cur, columns=[c[0] for c in cur.description])
         else:
             print(f'The table(`{table_name}`) is empty with no data.') 
             return False
@@ -382,6 +1023,7 @@ class SqliteHandler():
             self.dbName = data['db_name']
             self.db_init = sqlite3.connect(self.dbPath+'/'+self.dbName)    
             self.db_conn = self.db_init.cursor()
+            self.clearSchemaCache()
             for table in data['tables']:
                 print(table['table_name'])
                 self.createTb(table['table_name'], table['column_names'])
@@ -392,21 +1034,109 @@ class SqliteHandler():
         else:
             raise ValueError('Check the value given passed as arguments.')
 
-    def export_data(self, catg:str='json', tableName:str=''):
-        if catg=='json':
-            data = {'db_name': self.dbName,'tables':[],'created_on': str(datetime.now().strftime('%d-%m-%Y %H:%M:%S %p'))}
-            for tb in self.getTb():
-                k=self.get_info(tb)
-                if k['rows'] > 0:
-                    k['data'] = self.fetch(tb, detailed=False)
-                data['tables'].append(k)
-            write(f'{self.dbPath}/{self.dbName.replace('.','_')}.json', data, emptyPervious=True)
-        elif catg=='xls':
-            pass
-            # write(f'{self.dbPath}/{self.dbName.replace('.','_')}.csv', data, emptyPervious=True)
-        elif catg == 'csv':
-            pass
-        else: raise ValueError('The type of file given is not accepted.')
+    @contextmanager
+    def _exportConnection(self, dedicated:bool=False):
+        """Gives a connection to export from, a new read-only one for the worker threads of a non pooled handler."""
+        if dedicated and self.pool is None:
+            conn = sqlite3.connect(f'file:{self.dbFullPath}?mode=ro', uri=True)
+            try: yield conn
+            finally: conn.close()
+        else:
+            with self._reader() as conn:
+                yield conn
+
+    def _exportRows(self, conn, query:str, arraysize:int, params:list=[]):
+        cur = conn.cursor()
+        try:
+            cur.arraysize = arraysize
+            cur.execute(query, params)
+            yield [c[0] for c in cur.description]
+            for batch in iter(cur.fetchmany, []):
+                yield batch
+        finally:
+            cur.close()
+
+    def _exportTable(self, query:str, path:str, catg:str, compress:bool=False, arraysize:int=5000, sheet:str='Sheet 1', dedicated:bool=False, params:list=[])->int:
+        """Streams the rows of the query to a csv, jsonl or xlsx file. Returns the number of rows written."""
+        count = 0
+        with self._exportConnection(dedicated) as conn:
+            rows = self._exportRows(conn, query, arraysize, params)
+            cols = next(rows)
+            if catg == 'xlsx':
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet(sheet[:31])
+                ws.append(cols)
+                for batch in rows:
+                    for row in batch: ws.append(row)
+                    count += len(batch)
+                wb.save(path)
+                return count
+            with (gzip.open if compress else open)(path, 'wt', newline='', encoding='utf-8') as f:
+                if catg == 'csv':
+                    writer = csv.writer(f)
+                    writer.writerow(cols)
+                    for batch in rows:
+                        writer.writerows(batch)
+                        count += len(batch)
+                else:
+                    for batch in rows:
+                        f.writelines(json.dumps(dict(zip(cols, row)), default=str) + '\n' for row in batch)
+                        count += len(batch)
+        return count
+
+    def export_data(self, catg:str='json', tableName='', filePath:str='', compress:bool=False, workers:int=1, arraysize:int=5000):
+        """
+            export_data()
+            -------------
+
+            Exports the tables of the database to files. The rows are streamed from the cursor `arraysize` at a time straight to the file, so the memory used does not depend on the size of the tables.
+
+            Parameters:
+                - `catg` (str): The format of the export. Default is 'json'.
+                    - `json`: One `<dbname>.json` file holding every table (columns, indexes and rows), readable by `load_dbJson()`.
+                    - `jsonl`: One `<table>.jsonl` file per table, one json object per row.
+                    - `csv`: One `<table>.csv` file per table with a header row.
+                    - `xls`/`xlsx`: One `<table>.xlsx` file per table, written with openpyxl in write-only mode.
+                - `tableName` (str|list): The table(s) to export. Default is '' (all the tables).
+                - `filePath` (str): The directory the files are written to. Default is '' (the database directory).
+                - `compress` (bool): gzip the json, jsonl and csv files (`.gz` is added to the file name). Default is False.
+                - `workers` (int): The number of tables exported in parallel (csv, jsonl and xlsx). Default is 1.
+                - `arraysize` (int): The number of rows fetched from SQLite at a time. Default is 5000.
+
+            Returns:
+                dict: `{table_name: {'path': str, 'rows': int}}` (`{'path', 'tables'}` for json).
+        """
+        catg = 'xlsx' if catg == 'xls' else catg
+        if catg not in ('json', 'jsonl', 'csv', 'xlsx'): raise ValueError('The type of file given is not accepted.')
+        filePath = filePath if filePath != '' else self.dbPath
+        tables = [t.strip() for t in tableName.split(',')] if isinstance(tableName, str) and tableName != '' else list(tableName) if tableName else self.getTb()
+        tables = [t for t in tables if not t.startswith('sqlite_')]
+        gz = '.gz' if compress and catg != 'xlsx' else ''
+
+        if catg == 'json':
+            path = f"{filePath}/{self.dbName.replace('.','_')}.json{gz}"
+            with (gzip.open if compress else open)(path, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps({'db_name': self.dbName, 'created_on': str(datetime.now().strftime('%d-%m-%Y %H:%M:%S %p'))})[:-1] + ', "tables": [')
+                for i, tb in enumerate(tables):
+                    info = self.get_info(tb)
+                    f.write((', ' if i else '') + json.dumps(info)[:-1] + ', "data": [')
+                    with self._exportConnection() as conn:
+                        rows = self._exportRows(conn, f'SELECT * FROM {tb};', arraysize)
+                        next(rows)
+                        first = True
+                        for batch in rows:
+                            f.write((', ' if not first else '') + ', '.join(json.dumps(list(r), default=str) for r in batch))
+                            first = False
+                    f.write(']}')
+                f.write(']}')
+            return {'path': path, 'tables': tables}
+
+        jobs = {tb: (f'SELECT * FROM {tb};', f'{filePath}/{tb}.{catg}{gz}') for tb in tables}
+        if workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futures = {tb: ex.submit(self._exportTable, q, path, catg, compress, arraysize, tb, True) for tb, (q, path) in jobs.items()}
+                return {tb: {'path': jobs[tb][1], 'rows': fut.result()} for tb, fut in futures.items()}
+        return {tb: {'path': path, 'rows': self._exportTable(q, path, catg, compress, arraysize, tb)} for tb, (q, path) in jobs.items()}
     
     def getCount(self, table_name:str,  columns:str='*', query:str='')->int:
         """
@@ -448,34 +1178,83 @@ class SqliteHandler():
         query =f'ALTER TABLE {tbName} {queryType.upper()} {modify};'
         return self.execute(query)
 
-    def csv_insert(self, table_name:str, csv_file_path:str):
+    def _csvTypes(self, sample:list, width:int)->list:
+        """Infers the SQLite type (INTEGER, REAL or TEXT) of every column from the sample rows."""
+        types = []
+        for i in range(width):
+            ty = 'INTEGER'
+            for row in sample:
+                v = row[i].strip() if i < len(row) else ''
+                if v == '': continue
+                if ty == 'INTEGER':
+                    try: int(v)
+                    except ValueError: ty = 'REAL'
+                if ty == 'REAL':
+                    try: float(v)
+                    except ValueError:
+                        ty = 'TEXT'
+                        break
+            types.append(ty)
+        return types
+
+    def csv_insert(self, table_name:str, csv_file_path:str, batch_size:int=10000, sample_size:int=1000, infer_types:bool=True, defer_indexes:bool=True, progress=False, encoding:str='utf-8', delimiter:str=','):
         """
             Creates a table (if it doesn't exist) and adds data from a CSV file.
 
+            The file is streamed row by row and inserted with `bulk_insert()` (`executemany` in batches inside one transaction), so the size of the file does not matter.
+
             Parameters:
                 table_name (str): The name of the table to be created or used.
                 csv_file_path (str): The path to the CSV file containing data to be inserted into the table.
+                batch_size (int, optional): The number of rows per `executemany` batch. Default is 10000.
+                sample_size (int, optional): The number of rows read to infer the column types. Default is 1000.
+                infer_types (bool, optional): Create the columns as INTEGER/REAL/TEXT from the sample (and convert the values) instead of all TEXT. A value after the sample that does not convert is inserted as it is, like SQLite's type affinity does. Default is True.
+                defer_indexes (bool, optional): Drop the indexes of an existing table before the load and recreate them after it. Default is True.
+                progress (bool|callable, optional): `True` prints the rows and rows/sec after every batch, a callable is called with `(rows, seconds)`. Default is False.
+                encoding (str, optional): The encoding of the file. Default is 'utf-8'.
+                delimiter (str, optional): The delimiter of the file. Default is ','.
 
             Returns:
-                bool: True if the operation is successful, False otherwise.
+                dict|bool: The insert stats (`{'rows', 'batches', 'seconds', 'rows_per_sec'}`) if the operation is successful, False otherwise.
         """
+        indexes = []
         try:
-            if not self.getTb(table_name):
-                with open(csv_file_path, 'r') as csvfile:
-                    csv_reader = csv.reader(csvfile)
-                    headers = next(csv_reader)
-                    column_types = ['TEXT' for _ in headers]
-                    columns = [f"{header} {column_type}" for header, column_type in zip(headers, column_types)]
-                    self.createTb(table_name, columns)
-
-            with open(csv_file_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                csv_data = [row for row in csv_reader]
-            json_data = json.dumps(csv_data, indent=2)
-            return self.json_insert(table_name, json_data)
+            with open(csv_file_path, 'r', newline='', encoding=encoding) as csvfile:
+                csv_reader = csv.reader(csvfile, delimiter=delimiter)
+                headers = next(csv_reader)
+                sample = list(islice(csv_reader, sample_size))
+                types = self._csvTypes(sample, len(headers)) if infer_types else ['TEXT'] * len(headers)
+
+                if not self.getTb(table_name):
+                    self.createTb(table_name, [f"{header} {column_type}" for header, column_type in zip(headers, types)])
+                elif defer_indexes:
+                    with self._reader() as conn:
+                        indexes = conn.execute("SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL;", (table_name,)).fetchall()
+                    for name, _ in indexes:
+                        self.execute(f'DROP INDEX {name};')
+
+                width = len(headers)
+                if infer_types:
+                    convert = [_csvValue(int) if t == 'INTEGER' else _csvValue(float) if t == 'REAL' else None for t in types]
+                    def to_row(row):
+                        row = (row + [''] * (width - len(row)))[:width]
+                        return tuple(v if c is None else c(v) for c, v in zip(convert, row))
+                else:
+                    def to_row(row):
+                        return tuple((row + [''] * (width - len(row)))[:width])
+
+                if progress is True:
+                    progress = lambda rows, sec: print(f'{table_name}: {rows} rows, {rows / sec if sec else rows:.0f} rows/sec')
+                rows = map(to_row, chain(sample, csv_reader))
+                stats = self.bulk_insert(table_name, headers, rows, batch_size, progress=progress or None)
+            return stats if stats is not None else False
         except Exception as e:
             print(f"Error: {e}")
+            if self.db_init.in_transaction and not getattr(self._local, 'transaction', False): self.db_init.rollback()
             return False
+        finally:
+            for _, sql in indexes:
+                self.execute(sql)
 
     def get_excel(self, tbName:str='',  columns:str='*', query:str='', fetchAll:bool=True, desc:str='', fileName:str='', filePath:str='.'):
         """
@@ -487,17 +1266,17 @@ class SqliteHandler():
                 query (str, optional): _description_. Defaults to ''.
                 fetchAll (bool, optional): _description_. Defaults to True.
                 desc (str, optional): _description_. Defaults to ''.
-                fileName (str, optional): _description_. Defaults to ''.
+                fileName (str, optional): The name of the file, a `.xlsx`/`.xls` name writes an excel file and anything else a csv file. The rows are streamed to the file. Defaults to '<tbName>.csv'.
                 filePath (str, optional): _description_. Defaults to './'.
 
             Returns:
                 file: Returns a saved file.
         """
         try:
-            data = self.getTbData(tbName,columns,query,fetchAll, desc)
-            fileName = fileName if fileName!=None else f'{tbName}.csv'
-            fileName = f'{filePath}/{fileName}'
-            data.to_csv(fileName, index=False)
+            fileName = fileName if fileName else f'{tbName}.csv'
+            catg = 'xlsx' if getExtention(fileName) in ('xls', 'xlsx') else 'csv'
+            sql, params = self._select(tbName, columns, query, 0 if fetchAll else 1, desc=desc)
+            self._exportTable(sql, f'{filePath}/{fileName}', catg, sheet=tbName, params=params)
             return 1
 
         except Exception as e:
@@ -505,19 +1284,45 @@ class SqliteHandler():
             return 0
 
     def beginTransaction(self):
-        """Begin a transaction."""
+        """Begin a transaction. In pooled mode the writer is held by the calling thread until the transaction is committed or rolled back."""
+        self._lock.acquire()
+        self._local.transaction = True
         self.db_init.isolation_level = None
         self.execute("BEGIN TRANSACTION;")
 
+    def _endTransaction(self):
+        if getattr(self._local, 'transaction', False):
+            self._local.transaction = False
+            self._lock.release()
+
+    def _commit(self):
+        """Commits the transaction of this thread, a failing COMMIT rolls it back and its error is raised."""
+        try:
+            with self._lock:
+                self.db_conn.execute("COMMIT;")
+        except sqlite3.Error:
+            if self.db_init.in_transaction: self.db_init.rollback()
+            raise
+        finally:
+            self.db_init.isolation_level = ''
+            self._endTransaction()
+
     def commitTransaction(self):
-        """Commit the current transaction."""
-        self.execute("COMMIT;")
-        self.db_init.isolation_level = ''
+        """Commit the current transaction. If the COMMIT fails the transaction is rolled back and False is returned."""
+        try:
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            print("SQLite error:", e)
+            return False
 
     def rollbackTransaction(self):
         """Roll back the current transaction."""
-        self.execute("ROLLBACK;")
-        self.db_init.isolation_level = ''  # Auto-commit mode is turned on
+        try:
+            self.execute("ROLLBACK;")
+            self.db_init.isolation_level = ''  # Auto-commit mode is turned on
+        finally:
+            self._endTransaction()
 
     def getColumnNames(self, table_name):
         """
@@ -529,10 +1334,7 @@ class SqliteHandler():
             Returns:
                 list: A list of column names.
         """
-        query = f"PRAGMA table_info({table_name});"
-        result = self.execute(query)
-        columns = [row[1] for row in result.fetchall()]
-        return columns
+        return [row[1] for row in self._tableInfo(table_name)]
 
     def get_info(self, table_name:str=''):
         """
@@ -554,7 +1356,7 @@ class SqliteHandler():
             if table_name == '':
                 return {i: self.get_info(i) for i in self.getTb()}
             else:
-                columns_info = self.execute(f"PRAGMA table_info({table_name})").fetchall()
+                columns_info = self._tableInfo(table_name)
                 if not columns_info:  return None
                 column_names = [info[1] for info in columns_info]
                 column_types = [info[2] for info in columns_info]
@@ -579,9 +1381,12 @@ class SqliteHandler():
             Return:
                 - If the table_name parameter is given the either it will be returned bool true or else false. If the table_name is not added then a list of tables will be returned.
         '''
-        result = self.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        data = [row[0] for row in result.fetchall()]
-        if table_name == None:return data
+        self._checkSchema()
+        if self.schema_cache['tables'] is None:
+            with self._reader() as conn:
+                self.schema_cache['tables'] = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()]
+        data = self.schema_cache['tables']
+        if table_name == None:return list(data)
         elif table_name != None and table_name in data: return True
         else: return False
 
@@ -609,12 +1414,15 @@ class SqliteHandler():
                 - `tbName`: Takes the name of the table.
         """
         '''This method is to get the list of the indexes related in the table.'''
-        if tbName:
-            query = f"PRAGMA index_list({tbName});"
-        else:
-            query = "PRAGMA index_list;"
-        result = self.execute(query)
-        return [row[1] for row in result.fetchall()]
+        self._checkSchema()
+        if tbName not in self.schema_cache['indexes']:
+            if tbName:
+                query = f"PRAGMA index_list({tbName});"
+            else:
+                query = "PRAGMA index_list;"
+            result = self.execute(query)
+            self.schema_cache['indexes'][tbName] = [row[1] for row in result.fetchall()] if result is not None else []
+        return list(self.schema_cache['indexes'][tbName])
 
     def addIndex(self, table:str, indexName:str, coloumns:str):
         '''This method adds an INDEX in the table presented using the provided coloumns.'''
@@ -695,9 +1503,55 @@ class SqliteHandler():
             self.delIndex(tableName, i)
         return self.execute(f'DROP TABLE IF EXISTS {tableName};')
 
+    # --- Schema migration --- #
+
+    @contextmanager
+    def _migration(self):
+        """Runs the statements of a migration in one transaction on the writer cursor, errors roll the whole migration back and are raised."""
+        self.beginTransaction()
+        try:
+            yield self.db_conn
+        except Exception:
+            self.rollbackTransaction()
+            raise
+        else:
+            self.commitTransaction()
+        finally:
+            self.clearSchemaCache()
+
+    def _columnDefs(self, table_name:str)->tuple:
+        """
+            Returns `(name, type, constraints)` for every column of the table (names quoted as written), the table constraints (PRIMARY KEY, UNIQUE, CHECK, FOREIGN KEY) and the table options, all taken from the `CREATE TABLE` statement in sqlite_master as written.
+            CHECK, COLLATE, REFERENCES and the other constraints are kept, only the definitions a migration changes are rewritten.
+        """
+        with self._reader() as conn:
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?;", (table_name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Table '{table_name}' not found.")
+        return _parseCreateTable(row[0])
+
+    def _rebuildTable(self, cur, table_name:str, columns:list, constraints:list, sources:dict, options:str='')->None:
+        """
+            Rebuilds the table inside SQLite with the given column definitions: the rows are copied with one `INSERT INTO ... SELECT`, the old table is replaced and its indexes and triggers are recreated after the copy.
+            `sources` maps the new column names to the column/expression they are copied from, new columns missing from it get their DEFAULT (or NULL). `options` are the table options (`WITHOUT ROWID`, `STRICT`).
+        """
+        temp_table_name = f"temp_{table_name}"
+        with self._reader() as conn:
+            objects = [row[0] for row in conn.execute("SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name=? AND sql IS NOT NULL;", (table_name,)).fetchall()]
+        definition = [' '.join(part for part in col if part) for col in columns] + constraints
+        targets = [col[0] for col in columns if col[0] in sources]
+        cur.execute(f"DROP TABLE IF EXISTS {temp_table_name};")
+        cur.execute(f"CREATE TABLE {temp_table_name} ({', '.join(definition)}) {options};")
+        cur.execute(f"INSERT INTO {temp_table_name} ({', '.join(targets)}) SELECT {', '.join(sources[col] for col in targets)} FROM {table_name};")
+        cur.execute(f"DROP TABLE {table_name};")
+        cur.execute(f"ALTER TABLE {temp_table_name} RENAME TO {table_name};")
+        for sql in objects:
+            cur.execute(sql)
+
     def addColumn(self, table_name:str, new_column_name, data_type:str, adjacent_column_name:str, column_param:str='', after=True):
         """
             Adds a new column to the specified table before or after a specific column.
+            Columns added after the last column use `ALTER TABLE ADD COLUMN` (no data is copied), otherwise the table is rebuilt inside SQLite in one transaction (see `_rebuildTable`). The new columns get their DEFAULT value (or NULL) in the existing rows.
 
             Parameters:
                 table_name (str): The name of the table to add the column to.
@@ -707,41 +1561,33 @@ class SqliteHandler():
                 after (bool, optional): True to add the new column after the specified column, False to add it before. Default is True.
 
             Returns:
-                sqlite3.Cursor: The result of the executed query.
+                bool: True if the operation is successful, False otherwise.
         """
-        temp_table_name = f"temp_{table_name}"   
         try:
-            info = self.get_info(table_name)
-            columns = info['column_names']
-            col_index = [i for i, x in enumerate(self.getColumnNames(table_name)) if adjacent_column_name == x][0]
-            if after: 
-                col_index+= 1
-            if isinstance(new_column_name, list):
-                for i in new_column_name:
-                    columns.insert(col_index, f"{i} {data_type} {column_param}")     
-                    col_index += 1
-            elif isinstance(new_column_name, str):
-                columns.insert(col_index, f"{new_column_name} {data_type} {column_param}")        
-        
-            self.createTb(temp_table_name, columns)
-            if info['rows'] > 0 :
-                data = self.fetch(table_name)
-                if isinstance(new_column_name, list):
-                    for nm in new_column_name:
-                        data[0][nm]= ''
-                elif isinstance(new_column_name, str):
-                    data[0][new_column_name]= ''
-                self.json_insert(temp_table_name, equalizer_dict(data))
-            self.delTb(table_name)
-            self.renameTb(temp_table_name, table_name)
+            names = new_column_name if isinstance(new_column_name, list) else [new_column_name]
+            column_names = self.getColumnNames(table_name)
+            if adjacent_column_name not in column_names:
+                print(f"Error: Column '{adjacent_column_name}' not found in table '{table_name}'.")
+                return False
+            col_index = column_names.index(adjacent_column_name) + (1 if after else 0)
+            native = col_index == len(column_names) and not re.search(r'PRIMARY|UNIQUE', column_param, re.IGNORECASE)
+            with self._migration() as cur:
+                if native:
+                    for nm in names:
+                        cur.execute(f"ALTER TABLE {table_name} ADD COLUMN {nm} {data_type} {column_param};")
+                else:
+                    columns, constraints, options = self._columnDefs(table_name)
+                    sources = {col[0]: col[0] for col in columns}
+                    columns[col_index:col_index] = [(nm, data_type, column_param) for nm in names]
+                    self._rebuildTable(cur, table_name, columns, constraints, sources, options)
             return True
         except Exception as e:
-            self.delTb(temp_table_name)
+            print(f"Error: {e}")
             return False
 
     def renameColumn(self, table_name:str, old_column_name:str, new_column_name:str):
         """
-        Renames a column in the specified table.
+        Renames a column in the specified table with `ALTER TABLE RENAME COLUMN`, indexes, triggers and views using the column are updated by SQLite.
 
         Parameters:
             table_name (str): The name of the table.
@@ -762,39 +1608,48 @@ class SqliteHandler():
                 print(f"Error: Column '{new_column_name}' already exists in table '{table_name}'.")
                 return False
 
-            
-            index = columns.index(old_column_name)
-            columns[index] = new_column_name
-
-            temp_table_name = f"temp_{table_name}"
-            self.createTb(temp_table_name, columns)
-            data =  valreplace(self.fetch(table_name), old_column_name, new_column_name, True)
-            self.json_insert(temp_table_name,)
-            self.delTb(table_name)
-            self.renameTb(temp_table_name, table_name)
-
+            with self._migration() as cur:
+                cur.execute(f"ALTER TABLE {table_name} RENAME COLUMN {old_column_name} TO {new_column_name};")
             return True
         except Exception as e:
             print(f"Error: {e}")
             return False
 
+    def _alterColumns(self, table_name:str, modifications:dict)->None:
+        """Applies `modifications` (see `modifyColumns`) in one transaction: renames use `ALTER TABLE RENAME COLUMN`, type/parameter changes rebuild the table once for all the columns."""
+        with self._migration() as cur:
+            renamed = {}
+            for column_name, options in modifications.items():
+                new_column_name = options.get('new_column_name', '')
+                if new_column_name and new_column_name != column_name:
+                    cur.execute(f"ALTER TABLE {table_name} RENAME COLUMN {column_name} TO {new_column_name};")
+                    renamed[column_name] = new_column_name
+            changes = {renamed.get(k, k): v for k, v in modifications.items() if v.get('data_type', '') or v.get('column_param', '')}
+            if not changes: return
+            self.clearSchemaCache()
+            columns, constraints, options = self._columnDefs(table_name)
+            changes = {f'"{k}"' if re.search(r'\W', k) else k: v for k, v in changes.items()}
+            columns = [(name, changes[name].get('data_type', '') or ctype, changes[name].get('column_param', '') or param) if name in changes else (name, ctype, param)
+                       for name, ctype, param in columns]
+            self._rebuildTable(cur, table_name, columns, constraints, {col[0]: col[0] for col in columns}, options)
+
     def modifyColumn(self, table_name:str, column_name:str, new_column_name:str='', data_type:str='', column_param:str=''):
         """
         Modifies a column in the specified table.
+        A rename alone uses `ALTER TABLE RENAME COLUMN`, a new type or column parameters rebuild the table inside SQLite in one transaction (see `_rebuildTable`).
 
         Parameters:
             table_name (str): The name of the table.
             column_name (str): The name of the column to be modified.
             new_column_name (str, optional): The new name for the column. Defaults to ''.
-            data_type (str, optional): The new data type for the column. Defaults to ''.
-            column_param (str, optional): Additional column parameters. Defaults to ''.
+            data_type (str, optional): The new data type for the column. Defaults to '' (keeps the current type).
+            column_param (str, optional): Additional column parameters. Defaults to '' (keeps the current parameters).
 
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            columns_info = self.execute(f"PRAGMA table_info({table_name})").fetchall()
-            column_names = [info[1] for info in columns_info]
+            column_names = self.getColumnNames(table_name)
 
             if column_name not in column_names:
                 print(f"Error: Column '{column_name}' not found in table '{table_name}'.")
@@ -804,17 +1659,7 @@ class SqliteHandler():
                 print("Error: No modifications provided.")
                 return False
 
-            temp_table_name = f"temp_{table_name}"
-            original_columns = self.getColumnNames(table_name)
-
-            modified_column = f"{new_column_name} {data_type} {column_param}" if new_column_name else column_name
-            modified_columns = [modified_column if col == column_name else col for col in original_columns]
-
-            self.createTb(temp_table_name, modified_columns)
-            self.json_insert(temp_table_name, self.fetch(table_name))
-            self.delTb(table_name)
-            self.renameTb(temp_table_name, table_name)
-
+            self._alterColumns(table_name, {column_name: {'new_column_name': new_column_name, 'data_type': data_type, 'column_param': column_param}})
             print(f"Column '{column_name}' in table '{table_name}' modified successfully.")
             return True
         except Exception as e:
@@ -823,7 +1668,7 @@ class SqliteHandler():
 
     def modifyColumns(self, table_name:str, modifications:dict):
         """
-        Modifies multiple columns in the specified table.
+        Modifies multiple columns in the specified table, all the modifications are done in one transaction and the table is rebuilt at most once.
 
         Parameters:
             table_name (str): The name of the table.
@@ -843,10 +1688,12 @@ class SqliteHandler():
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            for column_name, options in modifications.items():
-                success = self.modifyColumn(table_name, column_name, **options)
-                if not success:
+            column_names = self.getColumnNames(table_name)
+            for column_name in modifications:
+                if column_name not in column_names:
+                    print(f"Error: Column '{column_name}' not found in table '{table_name}'.")
                     return False
+            self._alterColumns(table_name, modifications)
             return True
         except Exception as e:
             print(f"Error: {e}")
@@ -867,22 +1714,450 @@ class SqliteHandler():
 
     def close_connection(self, mesg=None):
         """This method for to close  all the connections made to the db and aslomend the session."""
-        self.db_init.close()
+        if self.pool is not None: self.pool.close()
+        else: self.db_init.close()
         if mesg!=None:
             print(mesg)
 
+class AsyncSqliteHandler():
+    """
+        AsyncSqliteHandler()
+        ====================
+
+        Async front-end of `SqliteHandler` for `asyncio` code (e.g. collectors built on `AsyncRequester`). The methods mirror the `SqliteHandler` ones but are awaitable and never block the event loop:
+
+        - Writes (`insert`, `json_insert`, `update`, `execute`) are queued to a dedicated writer thread. The writer drains everything queued so far and runs it in a single transaction, consecutive inserts into the same table/columns are coalesced into one `executemany`.
+        - Reads (`fetch`, `getCount`, `fetch_unique`) run on a small thread pool over the reader connections of a pooled `SqliteHandler` (WAL mode), so they overlap with the writes.
+
+        `insert`/`json_insert` resolve to the number of inserted rows (`None` if the insert failed), the other methods resolve to what the `SqliteHandler` method returns. Every write runs in its own SAVEPOINT, so a failing write is rolled back alone and never committed with the others, and the writes resolve only once their transaction is committed (a failing COMMIT is raised by every write of the transaction).
+
+        Parameters:
+            - `dbname` (str): The name of the database.
+            - `dbPath` (str, optional): The path to the database directory. Default is '.'.
+            - `readers` (int, optional): The number of reader connections/threads. Default is 4.
+            - `max_batch` (int, optional): The maximum number of queued writes run in one transaction. Default is 1000.
+            - `**kwargs`: Passed to `SqliteHandler` (e.g. `pragmas`, `schema_check`).
+
+        Usage Example:
+        ```
+            async with AsyncSqliteHandler('data.db') as db:
+                await asyncio.gather(*(db.json_insert('quotes', row) for row in rows))
+                print(await db.getCount('quotes'))
+        ```
+    """
+
+    def __init__(self, dbname, dbPath:str='.', readers:int=4, max_batch:int=1000, **kwargs):
+        self.db = SqliteHandler(dbname, dbPath, pool_readers=readers, **kwargs)
+        self.max_batch = max_batch
+        self.stats = {'transactions': 0, 'writes': 0, 'rows': 0}
+        self._writes = queue.Queue()
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='sqlite-reader')
+        self._writer = threading.Thread(target=self._writeLoop, name='sqlite-writer', daemon=True)
+        self._writer.start()
+
+    # --- writer thread --- #
+
+    def _writeLoop(self):
+        stop = False
+        while not stop:
+            item = self._writes.get()
+            if item is None: break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._runBatch(batch)
+
+    def _runBatch(self, batch:list):
+        groups = []
+        for kind, args, fut in batch:
+            if not fut.set_running_or_notify_cancel(): continue
+            try:
+                if kind == 'insert':
+                    table, columns, values, createTb = args
+                    rows = self.db._valueRows(values) if not isinstance(values, str) else None
+                    if rows is None and isinstance(values, str):
+                        groups.append(('call', (lambda *a: 1 if self.db.insert(*a) is not None else None, (table, columns, values, createTb)), [fut]))
+                        continue
+                    key = (table, columns if isinstance(columns, str) else tuple(columns), createTb)
+                elif kind == 'json':
+                    table, data, createTb, ifExist = args
+                    columns, rows = self.db._jsonRows(table, data, ifExist)
+                    key = (table, tuple(columns), createTb)
+                else:
+                    groups.append(('call', args, [fut]))
+                    continue
+                rows = list(rows) if rows is not None else []
+                if groups and groups[-1][0] == key:
+                    groups[-1][1].append(rows)
+                    groups[-1][2].append(fut)
+                else:
+                    groups.append((key, [rows], [fut]))
+            except Exception as e:
+                fut.set_exception(e)
+
+        # the futures are resolved once the transaction is committed, a write is only reported done when it is on disk
+        outcomes, rows = [], 0
+        self.db.beginTransaction()
+        try:
+            for key, args, futs in groups:
+                if key == 'call':
+                    fn, fargs = args
+                    outcomes.append((futs[0], *self._savepoint(fn, *fargs)))
+                    continue
+                table, columns, createTb = key
+                columns = list(columns) if isinstance(columns, tuple) else columns
+                insert = lambda data: self.db.bulk_insert(table, columns, data, createTb=createTb)
+                if len(futs) > 1:
+                    _, error = self._savepoint(insert, chain.from_iterable(args))
+                    if error is None:
+                        outcomes += [(fut, len(data), None) for data, fut in zip(args, futs)]
+                        rows += sum(len(data) for data in args)
+                        continue
+                # a single insert, or a coalesced group that failed: every insert runs alone so only the failing ones fail
+                for data, fut in zip(args, futs):
+                    _, error = self._savepoint(insert, data) if data else (None, None)
+                    if isinstance(error, sqlite3.Error):
+                        print("SQLite error:", error)
+                        outcomes.append((fut, None, None))
+                    else:
+                        outcomes.append((fut, len(data), error))
+                        rows += len(data) if error is None else 0
+            self.db._commit()
+        except Exception as e:
+            if getattr(self.db._local, 'transaction', False): self.db.rollbackTransaction()
+            for _, _, futs in groups:
+                for fut in futs:
+                    if not fut.done(): fut.set_exception(e)
+            outcomes, rows = [], 0
+        for fut, result, error in outcomes:
+            if error is None: fut.set_result(result)
+            else: fut.set_exception(error)
+        self.stats['rows'] += rows
+        self.stats['transactions'] += 1
+        self.stats['writes'] += len(batch)
+
+    def _savepoint(self, fn, *args)->tuple:
+        """Runs a write of the batch inside a SAVEPOINT, so a failing write is rolled back alone. Returns `(result, error)`."""
+        cur = self.db.db_conn
+        cur.execute('SAVEPOINT async_write;')
+        try:
+            result = fn(*args)
+        except Exception as e:
+            cur.execute('ROLLBACK TO async_write;')
+            cur.execute('RELEASE async_write;')
+            return None, e
+        cur.execute('RELEASE async_write;')
+        return result, None
+
+    def _write(self, kind:str, args):
+        fut = Future()
+        self._writes.put((kind, args, fut))
+        return asyncio.wrap_future(fut)
+
+    def _read(self, fn, *args, **kwargs):
+        return asyncio.get_running_loop().run_in_executor(self._readers, lambda: fn(*args, **kwargs))
+
+    # --- API --- #
+
+    async def insert(self, table:str, columns, values, createTb:bool=False):
+        """Awaitable `SqliteHandler.insert()`. Resolves to the number of inserted rows."""
+        return await self._write('insert', (table, columns, values, createTb))
+
+    async def json_insert(self, table_name:str, data, createTb:bool=False, ifExist:str=''):
+        """Awaitable `SqliteHandler.json_insert()`. Resolves to the number of inserted rows."""
+        return await self._write('json', (table_name, data, createTb, ifExist))
+
+    async def update(self, table:str, updatedata, condition:str=''):
+        """Awaitable `SqliteHandler.update()`."""
+        return await self._write('call', (self.db.update, (table, updatedata, condition)))
+
+    async def execute(self, query, data:list=[], multi:bool=False):
+        """Awaitable `SqliteHandler.execute()` run on the writer thread. The rows of a `SELECT` are returned as a list."""
+        def run():
+            ret = self.db.execute(query, data, multi)
+            return ret.fetchall() if ret is not None and ret.description else ret
+        return await self._write('call', (run, ()))
+
+    async def fetch(self, table:str, columns:str='*', query='', limit:int=0, Offset:int=0, fetchAll:bool=True, assc:str='', desc:str='', detailed:bool=True):
+        """Awaitable `SqliteHandler.fetch()`."""
+        return await self._read(self.db.fetch, table, columns, query, limit, Offset, fetchAll, assc, desc, detailed)
+
+    async def fetch_page(self, table:str, columns:str='*', query='', key='rowid', after=None, limit:int=100, desc:bool=False, detailed:bool=True):
+        """Awaitable `SqliteHandler.fetch_page()`."""
+        return await self._read(self.db.fetch_page, table, columns, query, key, after, limit, desc, detailed)
+
+    async def getCount(self, table_name:str, columns:str='*', query:str=''):
+        """Awaitable `SqliteHandler.getCount()`."""
+        return await self._read(self.db.getCount, table_name, columns, query)
+
+    async def fetch_unique(self, table:str, column:str):
+        """Awaitable `SqliteHandler.fetch_unique()`."""
+        return await self._read(self.db.fetch_unique, table, column)
+
+    async def flush(self):
+        """Waits until every write queued so far is committed."""
+        return await self._write('call', (lambda: None, ()))
+
+    async def close(self):
+        """Commits the queued writes, stops the writer thread and closes the database."""
+        self._writes.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._writer.join)
+        self._readers.shutdown(wait=True)
+        self.db.close_connection()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+class MySqlPool():
+    """
+        MySqlPool()
+        ===========
+
+        Connection pool used by `MySqlHandler(pool_size=N)`: N connections to the server are opened up front and handed out to one thread at a time, so threads share the handler without waiting on one connection and without paying a new connection (TCP + auth handshake) per query.
+
+        Parameters:
+            - `config` (dict): The keyword arguments of `connect`, e.g. `{'host': 'localhost', 'user': 'root', 'password': '', 'database': 'db'}`.
+            - `size` (int): The number of connections. Default is 5.
+            - `connect` (callable): The function opening a connection. Default is `mysql.connector.connect`.
+    """
+
+    def __init__(self, config:dict, size:int=5, connect=None):
+        self.config = config
+        self.connect = connect if connect is not None else myqC.connect
+        self.database = config.get('database', '')
+        self.size = size
+        self._databases = {}
+        self.conns = queue.Queue()
+        for _ in range(size):
+            self.conns.put(self._connect())
+
+    def _connect(self):
+        conn = self.connect(**self.config)
+        self._databases[id(conn)] = self.config.get('database', '')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection for the calling thread, waiting if they are all in use. An error rolls back what was not committed."""
+        conn = self.conns.get()
+        try:
+            if self.database and self._databases.get(id(conn)) != self.database:
+                conn.database = self.database
+                self._databases[id(conn)] = self.database
+            yield conn
+        except Exception:
+            try: conn.rollback()
+            except Exception: pass
+            raise
+        finally:
+            self.conns.put(conn)
+
+    def close(self)->None:
+        """Closes all the connections."""
+        for _ in range(self.size):
+            self.conns.get().close()
+
 class MySqlHandler():
 
-    def __init__(self, host:str, user:str, password:str, dataBase:str=""):
+    def __init__(self, host:str, user:str, password:str, dataBase:str="", pool_size:int=0, port:int=3306, backend=None, **kwargs):
+        """
+            Initializes the MySqlHandler instance.
+
+            Parameters:
+                - `host`, `user`, `password`, `port`: The server to connect to.
+                - `dataBase` (str, optional): The database to use, it is created if it does not exist (see `connect_db()`). Default is ''.
+                - `pool_size` (int, optional): If greater than 0 the data methods (`insert`, `json_insert`, `fetch`, `fetch_iter`) run on a `MySqlPool` of `pool_size` connections so the handler can be shared by threads, the table/database methods keep using their own connection. Default is 0 (a single connection).
+                - `backend` (optional): The driver, any object with `connect(**config)`, `Error` and `errorcode` like `mysql.connector` (the default). `SqliteMySqlBackend()` runs the handler without a server.
+                - `**kwargs`: Passed to `connect()`.
+        """
+        self.config = {'host': host, 'user': user, 'password': password, 'port': port, **kwargs}
+        self.backend = backend if backend is not None else myqC
+        self.pool = None
+        self._lock = threading.RLock()
         try:
-            self.dbConn = myqC.connect(host=host, user=user, passwd=password)
+            self.dbConn = self.backend.connect(**self.config)
             self.cursor = self.dbConn.cursor()
-        except myqC.Error as err:
-            if err.errno == myqC.errorcode.ER_ACCESS_DENIED_ERROR:
+            if dataBase != '':
+                self.connect_db(dataBase)
+            if pool_size > 0:
+                self.pool = MySqlPool({**self.config, 'database': dataBase} if dataBase != '' else self.config, pool_size, self.backend.connect)
+        except self.backend.Error as err:
+            if getattr(err, 'errno', None) == self.backend.errorcode.ER_ACCESS_DENIED_ERROR:
                 return 'Error Password!'
             else: return err.errno
 
-    
+    @contextmanager
+    def _connection(self):
+        """Gives a connection for the data methods: a pooled one or the handler's connection."""
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+        else:
+            with self._lock:
+                yield self.dbConn
+
+    def _adapt(self, value):
+        """Makes a value bindable, lists/dicts are stored as json text."""
+        return json.dumps(value) if isinstance(value, (dict, list, tuple)) else value
+
+    def _executemany(self, query:str, rows, batch_size:int=1000)->int:
+        """
+            Runs the INSERT for every row, `batch_size` rows per `executemany()` call (mysql.connector sends each batch as one multi-row `INSERT ... VALUES (...), (...)` statement) and commits once at the end. Returns the number of rows inserted, 0 if the insert failed and was rolled back.
+        """
+        rows = iter(rows)
+        count = 0
+        with self._connection() as conn:
+            cur = conn.cursor()
+            try:
+                for batch in iter(lambda: list(islice(rows, batch_size)), []):
+                    cur.executemany(query, [tuple(self._adapt(v) for v in row) for row in batch])
+                    count += len(batch)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print("MySQL error:", e)
+                return 0
+            finally:
+                cur.close()
+        return count
+
+    def insert(self, table:str, columns, values, batch_size:int=1000)->int:
+        """
+            insert()
+            --------
+
+            Inserts one row (a tuple) or many rows (a list/generator of tuples) in the table, see `_executemany()`.
+
+            Parameters:
+                - `table` (str): The name of the table.
+                - `columns` (str|list): The columns, `'col1, col2'` or `['col1', 'col2']`.
+                - `values` (tuple|list): The row or rows to insert.
+                - `batch_size` (int): The number of rows sent per statement. Default is 1000.
+
+            Returns:
+                int: The number of rows inserted.
+        """
+        if isinstance(columns, str):
+            columns = [c.strip() for c in columns.split(',')]
+        if isinstance(values, tuple):
+            values = [values]
+        query = f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in columns)}) VALUES ({', '.join(['%s']*len(columns))})"
+        return self._executemany(query, values, batch_size)
+
+    def json_insert(self, table_name:str, data, batch_size:int=1000)->int:
+        """
+            json_insert()
+            -------------
+
+            Inserts a dict or a list/generator of dicts in the table. The columns are every key of every dict for a list and the keys of the first dict for a generator, missing keys are inserted as NULL.
+
+            Returns:
+                int: The number of rows inserted.
+        """
+        if isinstance(data, dict):
+            data = [data]
+        if isinstance(data, list):
+            columns = list(dict.fromkeys(k for d in data for k in d))
+        else:
+            data = iter(data)
+            first = next(data, None)
+            if first is None: return 0
+            columns = list(first)
+            data = chain([first], data)
+        return self.insert(table_name, columns, (tuple(d.get(c) for c in columns) for d in data), batch_size)
+
+    def _select(self, table:str, columns:str='*', query='', limit:int=0, Offset:int=0, assc:str='', desc:str='')->tuple:
+        """Builds the `SELECT` statement of `fetch()`/`fetch_iter()`, the values of a dict `query` are bound with `%s` placeholders. Returns `(sql, params)`."""
+        params = []
+        if isinstance(query, dict) and len(query.keys()) > 0:
+            where = ' WHERE ' + ' AND '.join(f'`{k}` IS NULL' if v is None else f'`{k}`=%s' for k,v in query.items())
+            params = [self._adapt(v) for v in query.values() if v is not None]
+        elif isinstance(query, list) and len(query) > 0:
+            where = ' WHERE ' + ' AND '.join(f'({q})' if len(query) > 1 else q for q in query)
+        elif isinstance(query, str) and query != '':
+            where = f' WHERE {query}'
+        else:
+            where = ''
+        order = [f'`{desc}` DESC'] if desc != '' else []
+        order += [f'`{assc}` ASC'] if assc != '' else []
+        order = ' ORDER BY ' + ', '.join(order) if order else ''
+        page = ''
+        if limit > 0:
+            page = ' LIMIT %s OFFSET %s' if Offset > 0 else ' LIMIT %s'
+            params += [limit, Offset] if Offset > 0 else [limit]
+        return f'SELECT {columns} FROM `{table}`{where}{order}{page}', params
+
+    def fetch(self, table:str, columns:str='*', query='', limit:int=0, Offset:int=0, fetchAll:bool=True, assc:str='', desc:str='', detailed:bool=True):
+        """
+            fetch()
+            -------
+
+            Fetches data from the table, same parameters and return values as `SqliteHandler.fetch()`.
+        """
+        sql, params = self._select(table, columns, query, limit, Offset, assc, desc)
+        try:
+            with self._connection() as conn:
+                cur = conn.cursor(buffered=True)
+                try:
+                    cur.execute(sql, params)
+                    col = [column[0] for column in cur.description] if cur.description else []
+                    rows = cur.fetchall() if fetchAll else cur.fetchmany(1)
+                finally:
+                    cur.close()
+        except Exception as e:
+            print("MySQL error:", e)
+            return []
+        if detailed:
+            rows = [dict(zip(col, row)) for row in rows]
+        if fetchAll: return rows
+        return rows[0] if rows else None
+
+    def fetch_iter(self, table:str, columns:str='*', query='', limit:int=0, Offset:int=0, assc:str='', desc:str='', row_type:str='dict', arraysize:int=1000):
+        """
+            fetch_iter()
+            ------------
+
+            Same as `fetch()` but streams the rows with an unbuffered cursor: the server sends the rows as they are read `arraysize` at a time, so the memory used stays flat whatever the size of the result. A pooled connection (or the handler's connection) is held until the iteration ends.
+
+            Parameters:
+                - `row_type` (str): The type of the yielded rows, 'dict', 'tuple' or 'namedtuple'. Default is 'dict'.
+                - `arraysize` (int): The number of rows read per `fetchmany()`. Default is 1000.
+        """
+        if row_type not in ('dict', 'tuple', 'namedtuple'):
+            raise ValueError(f'The row_type ({row_type}) is not supported, use dict, tuple or namedtuple.')
+        sql, params = self._select(table, columns, query, limit, Offset, assc, desc)
+        with self._connection() as conn:
+            cur = conn.cursor(buffered=False)
+            try:
+                cur.execute(sql, params)
+                col = [column[0] for column in cur.description] if cur.description else []
+                if row_type == 'namedtuple':
+                    make = namedtuple('Row', col, rename=True)._make
+                elif row_type == 'dict':
+                    make = lambda row: dict(zip(col, row))
+                else:
+                    make = None
+                while True:
+                    rows = cur.fetchmany(arraysize)
+                    if not rows: break
+                    if make is None: yield from rows
+                    else: yield from map(make, rows)
+            finally:
+                # an unbuffered result must be read to the end before the connection is used again
+                try: cur.fetchall()
+                except Exception: pass
+                cur.close()
+
     def createTb(self, tableName, columns, Engine:str='InnoDb', tableComment:str=''):
         """
         """
@@ -939,6 +2214,8 @@ class MySqlHandler():
         if self.getDbList(dataBase)==False and create_db:
             self.createDb(dataBase)
         self.dbConn.database = dataBase
+        if self.pool is not None:
+            self.pool.database = dataBase
     
     def createDb(self, dataBase:str):
         """
@@ -959,14 +2236,27 @@ class MySqlHandler():
         if present != '': return present in dbList
         return dbList
 
-    def execute(self, query:str):
+    def execute(self, query:str, data:list=[], multi:bool=False, auto_commit:bool=True):
         """
             This method is to execute the mysql queries.
+
+            Parameters:
+                - `query` (str): The SQL code to execute.
+                - `data` (list): The rows for `executemany` when `multi` is True or else the values bound to the `%s` placeholders of the query. Default is [].
+                - `multi` (bool): True to run the query for every row of `data`. Default is False.
+                - `auto_commit` (bool): Commit after a statement that returns no rows. Default is True.
         """
         try:
-            return self.cursor.execute(query)
-        except: 
-            pass
+            with self._lock:
+                if multi and data != []:
+                    result = self.cursor.executemany(query, data)
+                else:
+                    result = self.cursor.execute(query, data or None)
+                if auto_commit and not self.cursor.with_rows:
+                    self.dbConn.commit()
+                return result
+        except Exception as e:
+            print("MySQL error:", e)
     
     def delDb(self, dataBase:str):
         """
@@ -981,5 +2271,233 @@ class MySqlHandler():
         """
             This method is to close the connection.
         """
+        if self.pool is not None: self.pool.close()
         self.cursor.close()
-        self.dbConn.close()
\ No newline at end of file
+        self.dbConn.close()
+
+class _StandInCursor():
+    """DB-API cursor of `SqliteMySqlBackend`: translates the MySQL statements `MySqlHandler` issues to SQLite."""
+
+    _implicit_commit = re.compile(r'^\s*(CREATE|DROP|ALTER|TRUNCATE|RENAME)\b', re.IGNORECASE)
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._cur = None
+        self._rows = None
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    @property
+    def with_rows(self)->bool:
+        return self.description is not None
+
+    def _translate(self, query:str)->str:
+        q = query.strip().rstrip(';')
+        m = re.match(r'^(CREATE|DROP)\s+(DATABASE|SCHEMA)\s+(IF\s+(NOT\s+)?EXISTS\s+)?`?(\w+)`?$', q, re.IGNORECASE)
+        if m:
+            (self.conn.backend.create_database if m.group(1).upper() == 'CREATE' else self.conn.backend.drop_database)(m.group(5))
+            return ''
+        if re.match(r'^SHOW\s+DATABASES$', q, re.IGNORECASE):
+            self._rows = [(db,) for db in self.conn.backend.databases()]
+            return ''
+        if re.match(r'^SHOW\s+TABLES$', q, re.IGNORECASE):
+            return "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        m = re.match(r'^TRUNCATE\s+(TABLE\s+)?(`?\w+`?)$', q, re.IGNORECASE)
+        if m:
+            return f'DELETE FROM {m.group(2)}'
+        m = re.match(r'^ALTER\s+TABLE\s+(`?\w+`?)\s+ADD\s+(UNIQUE|INDEX|KEY|UNIQUE\s+INDEX|UNIQUE\s+KEY)\s+`?(\w+)`?\s*\((.*)\)$', q, re.IGNORECASE | re.DOTALL)
+        if m:
+            unique = 'UNIQUE ' if m.group(2).upper().startswith('UNIQUE') else ''
+            return f'CREATE {unique}INDEX `{m.group(3)}` ON {m.group(1)} ({m.group(4)})'
+        if re.match(r'^CREATE\s+TABLE', q, re.IGNORECASE):
+            q = re.sub(r'\)\s*(ENGINE|COMMENT|DEFAULT\s+CHARSET|CHARSET|COLLATE)\b.*$', ')', q, flags=re.IGNORECASE | re.DOTALL)
+            q = re.sub(r'\bINT(\(\d+\))?(?=[^,]*AUTO_INCREMENT)', 'INTEGER', q, flags=re.IGNORECASE)
+            q = re.sub(r'\s+AUTO_INCREMENT\b', '', q, flags=re.IGNORECASE)
+        return q.replace('%s', '?')
+
+    def execute(self, query:str, params=None):
+        self._rows = None
+        self.description = None
+        sql = self._translate(query)
+        if sql == '':
+            self.description = (('Database',),) if self._rows is not None else None
+            return None
+        self._cur = self.conn.sqlite.execute(sql, tuple(params or ()))
+        if self._implicit_commit.match(query): self.conn.sqlite.commit()
+        self.description = self._cur.description
+        self.rowcount = self._cur.rowcount
+        self.lastrowid = self._cur.lastrowid
+        return None
+
+    def executemany(self, query:str, seq_params):
+        self._rows = None
+        self._cur = self.conn.sqlite.executemany(self._translate(query), seq_params)
+        self.description = None
+        self.rowcount = self._cur.rowcount
+        return None
+
+    def fetchone(self):
+        if self._rows is not None:
+            return self._rows.pop(0) if self._rows else None
+        return self._cur.fetchone() if self._cur is not None else None
+
+    def fetchmany(self, size:int=1):
+        if self._rows is not None:
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            return rows
+        return self._cur.fetchmany(size) if self._cur is not None else []
+
+    def fetchall(self):
+        if self._rows is not None:
+            rows, self._rows = self._rows, []
+            return rows
+        return self._cur.fetchall() if self._cur is not None else []
+
+    def close(self):
+        if self._cur is not None: self._cur.close()
+
+class _StandInConnection():
+    """Connection of `SqliteMySqlBackend`, one SQLite connection to the file of the selected database."""
+
+    def __init__(self, backend, database:str=''):
+        self.backend = backend
+        self.sqlite = None
+        self.database = database
+
+    @property
+    def database(self)->str:
+        return self._database
+
+    @database.setter
+    def database(self, name:str):
+        if name and name not in self.backend.databases():
+            raise self.backend.Error(f"1049 (42000): Unknown database '{name}'")
+        if self.sqlite is not None: self.sqlite.close()
+        self._database = name
+        self.sqlite = self.backend._open(name)
+
+    def cursor(self, buffered=None, **kwargs):
+        return _StandInCursor(self)
+
+    def commit(self):
+        self.sqlite.commit()
+
+    def rollback(self):
+        self.sqlite.rollback()
+
+    def ping(self, reconnect:bool=False, **kwargs):
+        return None
+
+    def is_connected(self)->bool:
+        return True
+
+    def close(self):
+        self.sqlite.close()
+
+class SqliteMySqlBackend():
+    """
+        SqliteMySqlBackend()
+        ====================
+
+        In-process stand-in for `mysql.connector` to pass as `MySqlHandler(backend=...)` when no MySQL server is available (CI, benchmarks). Every database is a SQLite file in the `path` directory, in WAL mode with a busy timeout so pooled connections read while another one writes and concurrent writers wait for each other like they would on the server.
+
+        Only the subset of SQL `MySqlHandler` issues is emulated: `SHOW TABLES`, `SHOW DATABASES`, `CREATE/DROP DATABASE`, `CREATE TABLE ... ENGINE=...` (with `AUTO_INCREMENT` columns), `DROP TABLE`, `TRUNCATE TABLE`, `ALTER TABLE ADD UNIQUE/INDEX`, `%s` placeholders and plain `INSERT`/`SELECT`/`UPDATE`/`DELETE`. Like on MySQL the DDL statements commit implicitly.
+
+        Parameters:
+            - `path` (str): The directory holding the database files. Default is '' (a new temporary directory).
+    """
+
+    Error = sqlite3.Error
+    errorcode = myqC.errorcode
+
+    def __init__(self, path:str=''):
+        self.path = path if path != '' else tempfile.mkdtemp(prefix='mysql_standin_')
+
+    def connect(self, database:str='', **kwargs):
+        """Same as `mysql.connector.connect()`, the server arguments (host, user, password, port, ...) are ignored."""
+        return _StandInConnection(self, database)
+
+    def _open(self, name:str):
+        if not name: return sqlite3.connect(':memory:', check_same_thread=False)
+        conn = sqlite3.connect(f'{self.path}/{name}.db', check_same_thread=False, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL;')
+        return conn
+
+    def databases(self)->list:
+        return sorted(f[:-3] for f in os.listdir(self.path) if f.endswith('.db'))
+
+    def create_database(self, name:str)->None:
+        if name in self.databases():
+            raise self.Error(f"1007 (HY000): Can't create database '{name}'; database exists")
+        sqlite3.connect(f'{self.path}/{name}.db').close()
+
+    def drop_database(self, name:str)->None:
+        if name not in self.databases():
+            raise self.Error(f"1008 (HY000): Can't drop database '{name}'; database doesn't exist")
+        for ext in ('.db', '.db-wal', '.db-shm'):
+            if os.path.exists(f'{self.path}/{name}{ext}'): os.remove(f'{self.path}/{name}{ext}')
+
+def mysql_benchmark(backend=None, rows:int=100000, batch_sizes=(1, 100, 1000, 5000), threads:int=4, pool_size:int=4, host:str='localhost', user:str='root', password:str='', dataBase:str='benchmark')->dict:
+    """
+        mysql_benchmark()
+        =================
+
+        Throughput benchmark of the bulk and pooled paths of `MySqlHandler`. The default backend is a `SqliteMySqlBackend` in a temporary directory so it runs offline, pass `backend=mysql.connector` and the server arguments to run it against a real server (the `dataBase` is created if needed and its `bench` table is dropped). Run it from the package that holds `functions`, e.g. `from functions.DbHandler import mysql_benchmark`.
+
+        Measures, in rows per second:
+            - `insert` with every batch size of `batch_sizes`,
+            - `json_insert` of dicts,
+            - `fetch` and `fetch_iter` of the whole table,
+            - `threads` threads inserting and looking rows up at the same time on one shared connection and on a pool of `pool_size` connections.
+
+        Returns:
+            dict: `{name: {'rows', 'seconds', 'rows_per_s'}}`.
+    """
+    tmp = tempfile.TemporaryDirectory() if backend is None else None
+    backend = backend if backend is not None else SqliteMySqlBackend(tmp.name)
+    columns = ['id INT AUTO_INCREMENT PRIMARY KEY', 'name VARCHAR(64)', 'qty INT', 'price DOUBLE']
+    data = [(f'name{i}', i, i*0.5) for i in range(rows)]
+    results = {}
+
+    def timed(name:str, count:int, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        results[name] = {'rows': count, 'seconds': round(elapsed, 4), 'rows_per_s': round(count/elapsed) if elapsed else 0}
+
+    def fresh(handler):
+        handler.delTb('bench')
+        handler.createTb('bench', columns)
+        handler.execute('CREATE INDEX bench_qty ON bench (qty)')
+
+    db = MySqlHandler(host, user, password, dataBase, backend=backend)
+    for size in batch_sizes:
+        fresh(db)
+        timed(f'insert (batch_size={size})', rows, db.insert, 'bench', ['name', 'qty', 'price'], data, size)
+    fresh(db)
+    timed('json_insert', rows, db.json_insert, 'bench', ({'name': n, 'qty': q, 'price': p} for n, q, p in data))
+    timed('fetch', rows, db.fetch, 'bench')
+    timed('fetch_iter', rows, lambda: sum(1 for _ in db.fetch_iter('bench', row_type='tuple')))
+    db.close_connection()
+
+    share = rows // threads
+    for name, size in (('single connection', 0), (f'pool of {pool_size}', pool_size)):
+        handler = MySqlHandler(host, user, password, dataBase, pool_size=size, backend=backend)
+        fresh(handler)
+
+        def work(k:int):
+            handler.insert('bench', ['name', 'qty', 'price'], data[k*share:(k+1)*share], 1000)
+            for i in range(k*share, min((k+1)*share, k*share+200)):
+                handler.fetch('bench', 'name', {'qty': i})
+
+        workers = [threading.Thread(target=work, args=(k,)) for k in range(threads)]
+        start = time.perf_counter()
+        for w in workers: w.start()
+        for w in workers: w.join()
+        elapsed = time.perf_counter() - start
+        results[f'{threads} threads, {name}'] = {'rows': share*threads, 'seconds': round(elapsed, 4), 'rows_per_s': round(share*threads/elapsed) if elapsed else 0}
+        handler.delTb('bench')
+        handler.close_connection()
+    if tmp is not None: tmp.cleanup()
+    return results
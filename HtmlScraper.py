@@ -1,21 +1,351 @@
-from Requester import Requester
+from Requester import Requester, ResponseCache
 from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from functools import lru_cache
+import os, random, time, re
 from FileHandler import write, read
 from DataHandlers import get_unique
 
+_SELECTORS = {'find': 'find', 'findall': 'find_all', 'find_all': 'find_all', 'select': 'select', 'select_one': 'select_one'}
+
+class PathwayPlan:
+    """
+        PathwayPlan
+        ===========
+
+        A `jsonParser()` pathway validated and normalised once by `compile_pathway()`: every node already knows the element method it calls, its arguments and what it gets from the found elements, so running the plan does no dict lookups or string comparisons. A plan never changes and can be reused for every page parsed with the same pathway.
+    """
+    __slots__ = ('kind', 'method', 'tag', 'kwargs', 'get', 'inner', 'items')
+
+    def __init__(self, kind:str, method:str='', tag:str='', kwargs:dict={}, get:tuple|None=None, inner=None, items=()):
+        self.kind = kind
+        self.method = method
+        self.tag = tag
+        self.kwargs = kwargs
+        self.get = get
+        self.inner = inner
+        self.items = items
+
+    def run(self, data):
+        """Runs the plan on a parsed page or element, the result is the same as `jsonParser()` with the raw pathway."""
+        try:
+            if self.kind == 'tag':
+                k = getattr(data, self.method)(self.tag, **self.kwargs)
+                if k is None: return {}
+                if self.inner is not None:
+                    ret = {} if self.get is None else {'get': _getValue(k, self.get)}
+                    ret['inner'] = [self.inner.run(n) for n in k] if isinstance(k, list) else self.inner.run(k)
+                    return ret
+                return k if self.get is None else _getValue(k, self.get)
+            elif self.kind == 'fields':
+                return {key: (_getValue(data, item) if isinstance(item, tuple) else item.run(data)) for key, item in self.items}
+            elif self.kind == 'list':
+                return [item.run(data) for item in self.items]
+            return None
+        except:
+            return None
+
+def _getter(value:str)->tuple:
+    """Compiles a `get` value: `<text>`/`<stext>` for the (stripped) text or else the name of an attribute."""
+    if value in ('<text>', '<stext>'):
+        return ('text', value == '<stext>')
+    return ('attr', value)
+
+def _getValue(data, getter:tuple):
+    if isinstance(data, list):
+        return [_getValue(t, getter) for t in data if t is not None]
+    if getter[0] == 'text':
+        return data.getText(strip=getter[1])
+    return data.get(getter[1])
+
+def compile_pathway(pathway)->PathwayPlan:
+    """
+        compile_pathway()
+        -----------------
+        Validates and normalises a `jsonParser()` pathway once into a `PathwayPlan`, to be cached and passed to `jsonParser()` instead of the dict for every page.
+
+        Parameter:
+        - pathway (dict|list|str): The pathway. A CSS selector string, a list of pathways, a tag node `{'tag': ..., 'attr': {...}, 'type': 'find'|'find_all'|'select'|'select_one', 'get': '<text>'|'<stext>'|attribute, 'inner': pathway}` or a dict of named pathways (a string value is a `get` value on the current element).
+
+        Raises:
+        - ValueError: If the pathway is not valid.
+    """
+    if isinstance(pathway, PathwayPlan):
+        return pathway
+    if isinstance(pathway, str):
+        return PathwayPlan('tag', 'select', pathway, {})
+    if isinstance(pathway, list):
+        return PathwayPlan('list', items=tuple(compile_pathway(p) for p in pathway))
+    if not isinstance(pathway, dict):
+        raise ValueError(f'Invalid pathway: {pathway!r}')
+    if len(pathway) == 0:
+        return PathwayPlan('none')
+    if 'tag' in pathway:
+        tag, attr, get, inner = pathway['tag'], pathway.get('attr') or {}, pathway.get('get'), pathway.get('inner')
+        method = _SELECTORS.get(pathway.get('type') or 'find')
+        if method is None:
+            raise ValueError(f"Invalid selector type: {pathway.get('type')!r}, use find, find_all, select or select_one.")
+        if not isinstance(tag, str) or not isinstance(attr, dict):
+            raise ValueError(f'Invalid tag node: {pathway!r}')
+        if get is not None and not isinstance(get, str):
+            raise ValueError(f'Invalid get value: {get!r}')
+        return PathwayPlan('tag', method, tag, {'attrs': attr} if method in ('find', 'find_all') else {},
+                           _getter(get) if get else None, compile_pathway(inner) if inner else None)
+    return PathwayPlan('fields', items=tuple((k, _getter(v) if isinstance(v, str) else compile_pathway(v)) for k,v in pathway.items()))
+
+_LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+def _multiValued(tag:str, key:str)->bool:
+    """True for the attributes bs4 gives as a list of values (`class`, `rel` of a link, ...)."""
+    return key in _LIST_ATTRIBUTES['*'] or key in _LIST_ATTRIBUTES.get(tag, ())
+
+def _attrValue(tag:str, key:str, value):
+    """The value of an attribute like bs4 gives it: a valueless attribute is '' and a multi-valued one the list of its values."""
+    value = value or ''
+    return value.split() if _multiValued(tag, key) else value
+
+_HIDDEN_TEXT = ('script', 'style', 'template')
+
+def _joinTexts(texts, separator:str, strip:bool)->str:
+    """Joins the strings of an element like bs4's `getText()`, with `strip` the whitespace only strings are dropped."""
+    return separator.join(t.strip() for t in texts if t.strip()) if strip else separator.join(texts)
+
+def _lexborTexts(node):
+    """The text nodes under a selectolax node, without the code of `<script>`/`<style>`/`<template>` elements like bs4."""
+    child = node.child
+    while child is not None:
+        if child.is_text_node:
+            yield child.text(deep=False)
+        elif child.is_element_node and child.tag not in _HIDDEN_TEXT:
+            yield from _lexborTexts(child)
+        child = child.next
+
+def _lxmlTexts(node):
+    """Same as `_lexborTexts()` for an lxml element, comments are left out as well."""
+    if node.text: yield node.text
+    for child in node:
+        if isinstance(child.tag, str) and child.tag not in _HIDDEN_TEXT:
+            yield from _lxmlTexts(child)
+        if child.tail: yield child.tail
+
+def _filterValues(k:str, v)->tuple:
+    """The values of an attribute filter of `find()`, a list matches any of its values like in bs4."""
+    values = tuple(v) if isinstance(v, (list, tuple)) else (v,)
+    if not values or any(x is not True and not isinstance(x, str) for x in values):
+        raise ValueError(f'Unsupported attribute filter for this parser backend: {k}={v!r}')
+    return values
+
+def _cssAttrs(name:str, attrs:dict)->str:
+    """Turns the `tag` and `attrs` of a `find()` into a CSS selector, a value of a multi-valued attribute (`class`...) matches one of its values like in bs4."""
+    sels = [name or '*']
+    for k, v in attrs.items():
+        options = []
+        for x in _filterValues(k, v):
+            if x is True:
+                options.append(f'[{k}]')
+            else:
+                x = x.replace('\\', '\\\\').replace('"', '\\"')
+                options.append(f'[{k}~="{x}"]' if _multiValued(name or '*', k) and x.strip() and ' ' not in x else f'[{k}="{x}"]')
+        sels = [sel + option for sel in sels for option in options]
+    return ', '.join(sels)
+
+class LexborNode:
+    """
+        LexborNode
+        ==========
+
+        A selectolax (lexbor) document or element behind the `find`/`find_all`/`select`/`select_one`/`getText`/`get` interface of bs4 used by `HtmlScraper`, `get` gives the multi-valued attributes (`class`, `rel`...) as lists like bs4. The selectolax node is `node`.
+    """
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def _css(self, selector:str)->list:
+        # lexbor gives an element once for every selector of a group it matches
+        return [LexborNode(n) for n in dict.fromkeys(self.node.css(selector)) if n != self.node]
+
+    def find(self, name:str='', attrs:dict={}, **kwargs):
+        return self.select_one(_cssAttrs(name, attrs))
+
+    def find_all(self, name:str='', attrs:dict={}, **kwargs)->list:
+        return self._css(_cssAttrs(name, attrs))
+
+    def select(self, selector:str, **kwargs)->list:
+        return self._css(selector)
+
+    def select_one(self, selector:str, **kwargs):
+        n = self.node.css_first(selector)
+        if n is not None and n == self.node:
+            r = self._css(selector)
+            return r[0] if r else None
+        return None if n is None else LexborNode(n)
+
+    def getText(self, separator:str='', strip:bool=False)->str:
+        node = getattr(self.node, 'root', self.node)
+        if node is None: return ''
+        return _joinTexts([node.text(deep=True)] if node.tag in _HIDDEN_TEXT else _lexborTexts(node), separator, strip)
+
+    def get(self, key:str, default=None):
+        attrs = self.node.attributes
+        return _attrValue(self.node.tag, key, attrs[key]) if key in attrs else default
+
+    def __str__(self)->str:
+        return self.node.html or ''
+
+    __repr__ = __str__
+
+class LxmlNode:
+    """
+        LxmlNode
+        ========
+
+        An lxml document or element behind the `find`/`find_all`/`select`/`select_one`/`getText`/`get` interface of bs4 used by `HtmlScraper`. `find()` runs a compiled XPath and `select()` a compiled `cssselect` selector, both cached, and `get` gives the multi-valued attributes as lists like bs4. The lxml element is `node`.
+    """
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def find(self, name:str='', attrs:dict={}, **kwargs):
+        r = self.find_all(name, attrs)
+        return r[0] if r else None
+
+    def find_all(self, name:str='', attrs:dict={}, **kwargs)->list:
+        xpath, values = _xpath(name or '*', tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in attrs.items()))
+        return [LxmlNode(n) for n in xpath(self.node, **values)]
+
+    def select(self, selector:str, **kwargs)->list:
+        return [LxmlNode(n) for n in _cssSelector(selector)(self.node) if n is not self.node]
+
+    def select_one(self, selector:str, **kwargs):
+        r = self.select(selector)
+        return r[0] if r else None
+
+    def getText(self, separator:str='', strip:bool=False)->str:
+        return _joinTexts(self.node.itertext() if self.node.tag in _HIDDEN_TEXT else _lxmlTexts(self.node), separator, strip)
+
+    def get(self, key:str, default=None):
+        value = self.node.get(key)
+        return default if value is None else _attrValue(self.node.tag, key, value)
+
+    def __str__(self)->str:
+        from lxml import etree
+        return etree.tostring(self.node, encoding='unicode', method='html')
+
+    __repr__ = __str__
+
+@lru_cache(maxsize=256)
+def _xpath(name:str, attrs:tuple)->tuple:
+    """Compiles the XPath of a `find()`, the attribute values are bound as XPath variables."""
+    from lxml import etree
+    tests, values = [], {}
+    for i, (k, v) in enumerate(attrs):
+        options = []
+        for j, x in enumerate(_filterValues(k, v)):
+            if x is True:
+                options.append(f'@{k}')
+            elif _multiValued(name, k) and x.strip() and ' ' not in x:
+                values[f'v{i}_{j}'] = f' {x} '
+                options.append(f"contains(concat(' ', normalize-space(@{k}), ' '), $v{i}_{j})")
+            else:
+                values[f'v{i}_{j}'] = x
+                # bs4 compares a multi-valued attribute by its values joined with single spaces
+                options.append(f'normalize-space(@{k})=$v{i}_{j}' if _multiValued(name, k) else f'@{k}=$v{i}_{j}')
+        tests.append(' or '.join(options))
+    return etree.XPath('.//' + name + ''.join(f'[{t}]' for t in tests)), values
+
+@lru_cache(maxsize=256)
+def _cssSelector(selector:str):
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(selector)
+
+def _lexborBackend():
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser as LexborHTMLParser
+    return lambda data: LexborNode(LexborHTMLParser(data))
+
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+def _lxmlBackend():
+    from lxml import html, etree
+    import cssselect
+
+    def parse(data):
+        # lxml refuses a str with an encoding declaration, it is already decoded
+        if isinstance(data, str): data = _XML_DECLARATION.sub('', data, count=1)
+        try:
+            return LxmlNode(html.document_fromstring(data))
+        except etree.ParserError:
+            # an empty page, bs4 gives an empty document
+            return LxmlNode(html.document_fromstring('<html></html>'))
+    return parse
+
+PARSER_BACKENDS = {'selectolax': (_lexborBackend, 'lxml'), 'lexbor': (_lexborBackend, 'lxml'), 'lxml': (_lxmlBackend, 'bs4:lxml')}
+_resolved:dict = {}
+
+def parser_backend(name:str='html.parser')->tuple:
+    """
+        parser_backend()
+        ----------------
+        Resolves a parser backend once, falling back to bs4 when its library is not installed.
+
+        Parameter:
+        - name (str): `selectolax` (or `lexbor`), `lxml`, or any bs4 tree builder (`html.parser`, `html5lib`, `bs4:lxml`...). Default is `html.parser`, bs4 with the pure-Python parser.
+
+        Returns:
+        - tuple: `(name, parse)`, the name of the backend actually used and a function parsing a html document into a document with the `find`/`find_all`/`select`/`select_one` interface.
+    """
+    if name not in _resolved:
+        if name in PARSER_BACKENDS:
+            load, fallback = PARSER_BACKENDS[name]
+            try:
+                _resolved[name] = (name, load())
+            except ImportError as e:
+                print(f'Parser backend {name} is not available ({e}), falling back to {fallback}.')
+                _resolved[name] = parser_backend(fallback)
+        else:
+            builder = name[4:] if name.startswith('bs4:') else name
+            try:
+                BeautifulSoup('', builder)
+                _resolved[name] = (name, lambda data: BeautifulSoup(data, builder))
+            except Exception as e:
+                if builder == 'html.parser': raise
+                print(f'Parser backend {name} is not available ({e}), falling back to html.parser.')
+                _resolved[name] = parser_backend('html.parser')
+    return _resolved[name]
+
+def parse_html(data, backend:str='html.parser'):
+    """
+        parse_html()
+        ------------
+        Parses a html document with a parser backend, see `parser_backend()`.
+    """
+    return parser_backend(backend)[1](data)
+
+_IMAGES = compile_pathway({'tag': 'img', 'attr': {}, 'type': 'select', 'inner':{'imgLnk': 'src', 'alt':'alt'}})
+_PAGE_META = compile_pathway({'title': {'tag':'title', 'get': '<stext>'}})
+
 class HtmlScraper:
 
-    def __init__(self, url:str, setSessions:bool=False, set_header:bool=True, set_agent:bool=True, set_proxy:bool=False)->None:
+    def __init__(self, url:str, setSessions:bool=False, set_header:bool=True, set_agent:bool=True, set_proxy:bool=False, cache:ResponseCache|str|None=None, parser:str='html.parser')->None:
         """
             HtmlScraper
             ===========
 
             This is a class that is to be used to scrape a website.
+
+            Parameter:
+            - cache (ResponseCache|str, optional): A `ResponseCache` (or the path of its cache file) used for the non-session requests of the page. Default is `None`, no caching.
+            - parser (str, optional): The parser backend of the pages, `selectolax`, `lxml` or a bs4 tree builder, see `parser_backend()`. Default is `html.parser`.
         """
         self.url = url
         self.setSessions, self.sessions = setSessions, None
-        self.req = Requester(set_header=set_header, set_agent=set_agent, set_proxy=set_proxy, agent_file='F:/Code Works/Python_works/storage/others/user-agent.txt') # proxy_file='F:/Code Works/Python_works/storage/others/proxies.txt')
+        self.req = Requester(set_header=set_header, set_agent=set_agent, set_proxy=set_proxy, cache=cache, agent_file='F:/Code Works/Python_works/storage/others/user-agent.txt') # proxy_file='F:/Code Works/Python_works/storage/others/proxies.txt')
         self.souped = None
+        self.parser = parser
 
     def _rectiftyPathway(self, pathway):
 
@@ -33,7 +363,7 @@ class HtmlScraper:
         return pathway
                  
     def _request(self, method:str='get', params:dict={}, ref:str='', response_code:int=200):
-        reqVals = {'url': self.url, 'method': method,'params': params, 'ref': ref, 'response_code': response_code}
+        reqVals = {'url': self.url, 'method': method,'params': params, 'ref': ref}
         req = None
         if self.setSessions:
             req, self.sessions = self.req.requestSessions(sessions=self.sessions, **reqVals)
@@ -41,14 +371,14 @@ class HtmlScraper:
             req = self.req.request(**reqVals)
         return req
 
-    def _souper(self, data, parser:str='html.parser'):
+    def _souper(self, data, parser:str|None=None):
         """
             _souper()
             ---------
 
-            Converts a html document data into BeautifulSoup class value.
+            Converts a html document data into BeautifulSoup class value, or the document of another parser backend (`parser`, default is the one of the scraper) with the same interface.
         """
-        self.souped = BeautifulSoup(data, parser)
+        self.souped = parse_html(data, parser or self.parser)
         return self.souped
         
     def _getAtr(self, data, ty):
@@ -92,9 +422,9 @@ class HtmlScraper:
             elif selectorType == 'select_one':
                 k = data.select_one(tagName, attr=attribute)
             elif selectorType == 'find':
-                k = data.find(tagName, attr=attribute)
+                k = data.find(tagName, attrs=attribute)
             elif selectorType == 'findall' or selectorType =='find_all':
-                k = data.find_all(tagName, attr=attribute)
+                k = data.find_all(tagName, attrs=attribute)
             return k
         except:
             return None   
@@ -131,8 +461,7 @@ class HtmlScraper:
             --------------
             Returns all the images in the page.
         """
-        imgs = {'tag': 'img', 'attr': {}, 'type': 'select', 'inner':{'imgLnk': 'src', 'alt':'alt'}}
-        return self.jsonParser(pathway=imgs, data=data)
+        return self.jsonParser(pathway=_IMAGES, data=data)
 
     def getPageMeta(self, data=None):
         """
@@ -140,43 +469,79 @@ class HtmlScraper:
             -------------
             Fetches the meta data of the page.
         """ 
-        pathway = {'title': {'tag':'title', 'get': '<stext>'}}
-        return self.jsonParser(pathway, data)
+        return self.jsonParser(_PAGE_META, data)
 
-    def jsonParser(self, pathway:dict, data=None)->dict|None|list:
+    def jsonParser(self, pathway:dict|PathwayPlan, data=None)->dict|None|list:
         """
             jsonParser()
             ------------
             This method is responsible for parsing the websitein the given structure.
+
+            Parameter:
+            - pathway (dict|list|str|PathwayPlan): The structure to parse, see `compile_pathway()`. A raw pathway is compiled on every call, compile it once with `compile_pathway()` to parse many pages with it.
+            - data: The parsed page or element to parse. Default is `None`, the page of the scraper.
         """
         if data==None:
             data = self._souper(self._request()) if self.souped==None else self.souped
-
-        pathway = self._rectiftyPathway(pathway)
         try:
-            if isinstance(pathway, str):
-                return self._parser(selectorType='select', tag=pathway, data=data)
-            elif isinstance(pathway, dict):
-                ret:dict = {}
-                if len(pathway) == 0: return None
-                if 'tag' in pathway.keys():  
-                    k = self._parser(selectorType=pathway['type'], tagName=pathway['tag'], attribute=pathway['attr'], data=data)
-                    if k is not None:
-                        if 'get' in pathway.keys() and pathway['get'] != '' and pathway['get'] is not None:
-                            ret['get'] = self._getAtr(ty=pathway['get'], data=k)
-
-                        if 'inner' in pathway.keys() and pathway['inner']!={}:
-                            ret['inner'] = [self.jsonParser(data=n,pathway=pathway['inner']) for n in k] if isinstance(k, list) else self.jsonParser(data=k, pathway=pathway['inner'])
-                        elif 'get' in ret.keys():
-                            return ret['get']
-                        else: return k
-                else:
-                    for k,v in pathway.items():
-                        ret[k] = self._getAtr(ty=v, data=data) if isinstance(v, str) else self.jsonParser(pathway=v,data=data)
-
-                return ret
-            elif isinstance(pathway, list):
-                return [self.jsonParser(pathway=i,data=data) for i in pathway]
-        except:
+            plan = compile_pathway(pathway)
+        except ValueError:
             return None
+        return plan.run(data)
+
+def _benchCorpus(pages:int, rows:int)->list[str]:
+    """A fixed (seeded) corpus of listing pages."""
+    rnd = random.Random(0)
+    corpus = []
+    for p in range(pages):
+        items = ''.join(f'''<li class="item card{' sale' if rnd.random() < 0.3 else ''}" data-id="{p*rows+i}">
+            <a class="title" href="/item/{p*rows+i}">Item {rnd.randint(1, 10**6)}</a><img src="/img/{i}.jpg" alt="item {i}">
+            <span class="price"> {rnd.randint(1, 9999)/100} </span><p class="desc">{' '.join(rnd.choice(('lorem', 'ipsum', 'dolor', 'sit', 'amet')) for _ in range(30))}</p></li>''' for i in range(rows))
+        corpus.append(f'''<!DOCTYPE html><html><head><title> Page {p} </title><meta name="description" content="page {p}"><script>var page = {p};</script></head>
+            <body><nav>{''.join(f'<a href="/c/{c}">Category {c}</a>' for c in range(20))}</nav><main><ul class="items">{items}</ul></main><footer><p>Footer</p><script>track({p});</script><style>footer {{ color: grey }}</style></footer></body></html>''')
+    return corpus
+
+def parser_benchmark(corpus:str|list[str]|None=None, backends=('html.parser', 'bs4:lxml', 'lxml', 'selectolax'), pathway=None, pages:int=50, rows:int=50)->dict:
+    """
+        parser_benchmark()
+        ==================
+
+        Pages per second of the parser backends on a fixed local html corpus, parsing the pages and then parsing them and extracting `pathway` with `jsonParser()`.
+
+        Parameter:
+        - corpus (str|list[str], optional): A directory of `.html` files or a list of documents. Default is `None`, `pages` generated listing pages of `rows` items.
+        - backends (tuple): The parser backends, see `parser_backend()`. A backend that is not installed is measured through its fallback.
+        - pathway (dict|PathwayPlan, optional): The pathway extracted. Default is `None`, the items of the generated pages.
+
+        Returns:
+            dict: `{backend: {'backend', 'pages', 'parse_s', 'parse_pages_per_s', 'extract_s', 'extract_pages_per_s', 'same_result'}}`, `backend` the backend actually used and `same_result` whether its extraction equals the one of the first backend.
+    """
+    if corpus is None:
+        corpus = _benchCorpus(pages, rows)
+    elif isinstance(corpus, str):
+        corpus = [read(os.path.join(corpus, f)) for f in sorted(os.listdir(corpus)) if f.endswith(('.html', '.htm'))]
+    plan = compile_pathway(pathway if pathway is not None else {
+        'title': {'tag': 'title', 'get': '<stext>'},
+        'items': {'tag': 'li', 'type': 'find_all', 'attr': {'class': 'item'}, 'inner': {
+            'id': 'data-id', 'title': {'tag': 'a', 'attr': {'class': 'title'}, 'get': '<stext>'}, 'link': {'tag': 'a', 'get': 'href'},
+            'price': {'tag': 'span.price', 'type': 'select_one', 'get': '<stext>'}, 'image': {'tag': 'img', 'get': 'src'}}},
+        'sale': {'tag': 'li.sale a.title', 'type': 'select', 'get': 'href'},
+        'footer': {'tag': 'footer', 'get': '<text>'}})
+    scraper = HtmlScraper.__new__(HtmlScraper)
+    results, expected = {}, None
+    for name in backends:
+        used, parse = parser_backend(name)
+        start = time.perf_counter()
+        for page in corpus: parse(page)
+        parsed = time.perf_counter() - start
+        start = time.perf_counter()
+        extracted = [scraper.jsonParser(plan, parse(page)) for page in corpus]
+        elapsed = time.perf_counter() - start
+        expected = extracted if expected is None else expected
+        results[name] = {'backend': used, 'pages': len(corpus), 'parse_s': round(parsed, 4), 'parse_pages_per_s': round(len(corpus)/parsed, 1) if parsed else 0,
+                         'extract_s': round(elapsed, 4), 'extract_pages_per_s': round(len(corpus)/elapsed, 1) if elapsed else 0, 'same_result': extracted == expected}
+    return results
 
+if __name__ == '__main__':
+    for name, res in parser_benchmark().items():
+        print(f"{name:<14}({res['backend']:<11}){res['pages']:>6} pages {res['parse_pages_per_s']:>10} parsed/s {res['extract_pages_per_s']:>10} extracted/s  same result: {res['same_result']}")
@@ -1,7 +1,435 @@
-import requests, random, time, websockets, aiohttp, asyncio
+import requests, random, time, websockets, aiohttp, asyncio, threading, sqlite3, hashlib, os, json as jsonlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, parse_qsl, urlencode
 from functions.FileHandler import read
 
+class ConnectionPool:
+    """
+        ConnectionPool()
+        ================
+
+        Per-host keep-alive connection pool used by `Requester`. Every host (scheme + hostname + port) gets its own `requests.Session` with a `HTTPAdapter`, so repeated requests to the same host reuse the already open TCP/TLS connections instead of doing a new handshake every time.
+
+        Parameters:
+            - `pool_size` (int): The maximum number of hosts kept in the pool. The least recently used host is evicted when full. Default is 10.
+            - `max_per_host` (int): The maximum number of open connections kept per host. Default is 10.
+            - `idle_timeout` (int|float): Seconds after which an unused host is evicted and its connections closed. `0` disables idle eviction. Default is 60.
+            - `block` (bool): If `True`, requests wait for a free connection when a host has `max_per_host` connections in use. Default is False.
+    """
+
+    def __init__(self, pool_size:int=10, max_per_host:int=10, idle_timeout:float=60, block:bool=False):
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.block = block
+        self.hosts = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self._lock = threading.Lock()
+
+    def _host_key(self, url:str):
+        ino = urlparse(url)
+        return (ino.scheme.lower(), (ino.hostname or '').lower(), ino.port)
+
+    def _new_adapter(self):
+        return HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host, pool_block=self.block)
+
+    def _new_session(self, adapter:HTTPAdapter):
+        # The pooled session is only a transport, cookies must not leak from one `request()` call to the next.
+        s = requests.Session()
+        s.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        s.mount('http://', adapter)
+        s.mount('https://', adapter)
+        return s
+
+    def _evict(self, key):
+        entry = self.hosts.pop(key)
+        entry['session'].close()
+        self.evictions += 1
+
+    def evict_idle(self)->int:
+        """
+            evict_idle()
+            ------------
+            Closes the connections of every host that has not been used for `idle_timeout` seconds.
+
+            Returns:
+                int: The number of evicted hosts.
+        """
+        if not self.idle_timeout: return 0
+        with self._lock:
+            now = time.monotonic()
+            idle = [k for k,v in self.hosts.items() if now - v['last_used'] > self.idle_timeout]
+            for k in idle:
+                self._evict(k)
+            return len(idle)
+
+    def _entry(self, url:str):
+        self.evict_idle()
+        key = self._host_key(url)
+        with self._lock:
+            if key in self.hosts:
+                self.hits += 1
+                self.hosts.move_to_end(key)
+            else:
+                self.misses += 1
+                while len(self.hosts) >= self.pool_size > 0:
+                    self._evict(next(iter(self.hosts)))
+                adapter = self._new_adapter()
+                self.hosts[key] = {'adapter': adapter, 'session': self._new_session(adapter), 'last_used': 0}
+            entry = self.hosts[key]
+            entry['last_used'] = time.monotonic()
+            return entry
+
+    def session(self, url:str)->requests.Session:
+        """Returns the pooled (cookie-less) session of the host of the url."""
+        return self._entry(url)['session']
+
+    def adapter(self, url:str)->HTTPAdapter:
+        """Returns the pooled adapter of the host of the url."""
+        return self._entry(url)['adapter']
+
+    def mount(self, session:requests.Session, url:str)->requests.Session:
+        """
+            mount()
+            -------
+            Mounts the pooled adapter of the host of the url on an external session, so the session shares the keep-alive connections of the pool.
+        """
+        ino = urlparse(url)
+        session.mount(f'{ino.scheme}://{ino.netloc}/', self.adapter(url))
+        return session
+
+    def stats(self)->dict:
+        """
+            stats()
+            -------
+            Returns the pool counters.
+
+            - `hits`/`misses`: Host lookups that found/had to create a pooled host.
+            - `evictions`: Hosts closed because of the pool size or the idle timeout.
+            - `connections`: TCP(+TLS) connections opened by the pooled adapters.
+            - `requests`: Requests sent through the pooled adapters.
+            - `reused`: Requests that were sent over an already open connection, i.e. saved handshakes.
+        """
+        conns, reqs = 0, 0
+        with self._lock:
+            for entry in self.hosts.values():
+                pools = entry['adapter'].poolmanager.pools
+                for k in pools.keys():
+                    p = pools.get(k)
+                    if p is not None:
+                        conns += getattr(p, 'num_connections', 0)
+                        reqs += getattr(p, 'num_requests', 0)
+            return {'hosts': len(self.hosts), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'connections': conns, 'requests': reqs, 'reused': max(reqs - conns, 0)}
+
+    def close(self)->None:
+        """Closes all the pooled connections."""
+        with self._lock:
+            for k in list(self.hosts.keys()):
+                self.hosts.pop(k)['session'].close()
+
+class RateLimiter:
+    """
+        RateLimiter()
+        =============
+
+        Per-host token bucket rate limiter. Every hostname gets a bucket holding up to `burst` tokens that refills at `rate` tokens per second, and every request takes one token. A request that finds the bucket empty reserves the next token and waits until it is refilled, so the requests of a host are spaced out exactly as much as needed and never more.
+
+        The same instance can be shared by a `Requester` and an `AsyncRequester` (and by several threads), the sync side waits with `time.sleep` and the async side with `asyncio.sleep` on the event loop.
+
+        Parameters:
+            - `rate` (float): Tokens (requests) per second refilled in each bucket. Default is 1.
+            - `burst` (int): The bucket size, i.e. how many requests may go out back to back. Default is 1.
+            - `hosts` (dict): Per hostname overrides as `{'hostname': (rate, burst)}`. Default is {}.
+
+        Usage Example:
+        ```
+            limiter = RateLimiter(rate=5, burst=10, hosts={'www.nseindia.com': (1, 2)})
+            req = Requester(rate_limiter=limiter)
+            areq = AsyncRequester(rate_limiter=limiter)
+        ```
+    """
+
+    def __init__(self, rate:float=1, burst:int=1, hosts:dict={}):
+        self.rate, self.burst = rate, burst
+        self.hosts = dict(hosts)
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_break_pt(cls, break_pt:list):
+        """Builds a limiter with the same average request gap as the old `break_pt=[min, max]` random sleeps."""
+        gap = (break_pt[0] + break_pt[1]) / 2
+        return cls(rate=(1 / gap) if gap > 0 else 0, burst=1)
+
+    def set_host(self, hostname:str, rate:float, burst:int=1)->None:
+        """Sets (or changes) the rate and burst of a single host."""
+        with self._lock:
+            self.hosts[hostname] = (rate, burst)
+            if hostname in self.buckets:
+                self.buckets[hostname]['rate'], self.buckets[hostname]['burst'] = rate, burst
+
+    def _reserve(self, url:str)->float:
+        host = urlparse(url).hostname or url
+        with self._lock:
+            now = time.monotonic()
+            b = self.buckets.get(host)
+            if b is None:
+                rate, burst = self.hosts.get(host, (self.rate, self.burst))
+                b = self.buckets[host] = {'rate': rate, 'burst': burst, 'tokens': burst, 'last': now, 'requests': 0, 'queued': 0.0, 'max_wait': 0.0}
+            if b['rate'] <= 0:
+                b['requests'] += 1
+                return 0.0
+            b['tokens'] = min(b['burst'], b['tokens'] + (now - b['last']) * b['rate'])
+            b['last'] = now
+            b['tokens'] -= 1
+            wait = -b['tokens'] / b['rate'] if b['tokens'] < 0 else 0.0
+            b['requests'] += 1
+            b['queued'] += wait
+            b['max_wait'] = max(b['max_wait'], wait)
+            return wait
+
+    def acquire(self, url:str)->float:
+        """
+            acquire()
+            ---------
+            Takes a token for the host of the url, blocking the thread until one is available.
+
+            Returns:
+                float: The seconds spent waiting.
+        """
+        wait = self._reserve(url)
+        if wait > 0: time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url:str)->float:
+        """Same as `acquire()` but waits on the event loop."""
+        wait = self._reserve(url)
+        if wait > 0: await asyncio.sleep(wait)
+        return wait
+
+    def stats(self, hostname:str='')->dict:
+        """
+            stats()
+            -------
+            Returns the queueing stats of every host (or of `hostname` only): the number of `requests`, the total `queued` seconds, the `avg_wait` and `max_wait` per request and the bucket `rate`/`burst`.
+        """
+        with self._lock:
+            ret = {h: {'requests': b['requests'], 'queued': round(b['queued'], 6), 'avg_wait': round(b['queued'] / b['requests'], 6) if b['requests'] else 0.0, 'max_wait': round(b['max_wait'], 6), 'rate': b['rate'], 'burst': b['burst']} for h,b in self.buckets.items()}
+        return ret.get(hostname, {}) if hostname != '' else ret
+
+class ResponseCache:
+    """
+        ResponseCache()
+        ===============
+
+        Opt-in on-disk HTTP response cache stored in a single SQLite file. Responses are keyed by method + full url (with the params) + the values of the request headers named in the response `Vary` header.
+
+        - Fresh responses (`Cache-Control: max-age`, `Expires` or `default_ttl`) are served straight from the disk.
+        - Stale responses that carry an `ETag`/`Last-Modified` are revalidated with `If-None-Match`/`If-Modified-Since`, a `304` serves the stored body.
+        - `no-store` and `Vary: *` responses are never stored, `no-cache` ones are always revalidated.
+        - The store is capped at `max_size` bytes of body, the least recently used entries are evicted first.
+
+        Only the response side `Cache-Control` is honoured, the `cache-Control: max-age=0` sent by `Requester.headers()` does not bypass the cache.
+
+        Parameters:
+            - `path` (str): The path of the SQLite cache file. Default is 'http_cache.db'.
+            - `max_size` (int): The maximum total size of the stored bodies in bytes. Default is 256 MB.
+            - `default_ttl` (int|float): Freshness in seconds for responses without any caching headers. Default is 0 (always revalidate).
+            - `methods` (tuple): The cacheable request methods. Default is ('get',).
+            - `status_codes` (tuple): The cacheable response status codes. Default is (200, 203, 300, 301, 404, 410).
+    """
+
+    def __init__(self, path:str='http_cache.db', max_size:int=256*1024*1024, default_ttl:float=0, methods:tuple=('get',), status_codes:tuple=(200, 203, 300, 301, 404, 410)):
+        self.path = path
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.methods = tuple(m.lower() for m in methods)
+        self.status_codes = status_codes
+        self.counters = {'hits': 0, 'misses': 0, 'stale': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB, etag TEXT, last_modified TEXT, expires REAL, last_access REAL, size INTEGER);
+            CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access);
+            CREATE TABLE IF NOT EXISTS vary (base TEXT PRIMARY KEY, names TEXT);
+        """)
+        self.db.commit()
+
+    def _base_key(self, method:str, url:str, params=None)->str:
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        return f'{method.upper()} {full_url}'
+
+    def _full_key(self, base:str, names:list, headers:dict)->str:
+        headers = {k.lower(): str(v) for k,v in (headers or {}).items()}
+        vary = '\n'.join(f'{n}:{headers.get(n, "")}' for n in names)
+        return hashlib.sha1(f'{base}\n{vary}'.encode()).hexdigest()
+
+    def _freshness(self, headers)->tuple:
+        """Returns `(storable, expires)` for the response headers."""
+        cc = {}
+        for part in headers.get('cache-control', '').lower().split(','):
+            k, _, v = part.strip().partition('=')
+            if k: cc[k] = v.strip('"')
+        if 'no-store' in cc or headers.get('vary', '').strip() == '*':
+            return False, 0
+        now = time.time()
+        if 'no-cache' in cc:
+            return True, now
+        if 'max-age' in cc:
+            try: return True, now + int(cc['max-age']) - int(headers.get('age', 0) or 0)
+            except ValueError: return True, now
+        if 'expires' in headers:
+            try: return True, parsedate_to_datetime(headers['expires']).timestamp()
+            except (TypeError, ValueError): return True, now
+        return True, now + self.default_ttl
+
+    def lookup(self, method:str, url:str, params=None, headers:dict=None):
+        """
+            lookup()
+            --------
+            Looks up the stored response of a request.
+
+            Returns:
+                dict|None: The stored entry with a `fresh` flag, or None if nothing is stored.
+        """
+        base = self._base_key(method, url, params)
+        with self._lock:
+            row = self.db.execute('SELECT names FROM vary WHERE base=?', (base,)).fetchone()
+            key = self._full_key(base, jsonlib.loads(row[0]) if row else [], headers)
+            row = self.db.execute('SELECT url, status, headers, body, etag, last_modified, expires FROM responses WHERE key=?', (key,)).fetchone()
+            if row is None: return None
+            self.db.execute('UPDATE responses SET last_access=? WHERE key=?', (time.time(), key))
+            self.db.commit()
+        return {'key': key, 'url': row[0], 'status': row[1], 'headers': jsonlib.loads(row[2]), 'body': row[3], 'etag': row[4], 'last_modified': row[5], 'expires': row[6], 'fresh': row[6] > time.time()}
+
+    def store(self, method:str, url:str, params, headers:dict, response:requests.Response)->bool:
+        """
+            store()
+            -------
+            Stores a response if its status and caching headers allow it.
+
+            Returns:
+                bool: True if the response was stored.
+        """
+        if response.status_code not in self.status_codes: return False
+        storable, expires = self._freshness(response.headers)
+        etag, last_modified = response.headers.get('etag'), response.headers.get('last-modified')
+        if not storable or (expires <= time.time() and etag is None and last_modified is None):
+            return False
+        base = self._base_key(method, url, params)
+        names = sorted({n.strip().lower() for n in response.headers.get('vary', '').split(',') if n.strip()})
+        key = self._full_key(base, names, headers)
+        stored_headers = {k:v for k,v in response.headers.items() if k.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')}
+        body = response.content
+        with self._lock:
+            self.db.execute('INSERT OR REPLACE INTO vary (base, names) VALUES (?, ?)', (base, jsonlib.dumps(names)))
+            self.db.execute('INSERT OR REPLACE INTO responses (key, url, status, headers, body, etag, last_modified, expires, last_access, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (key, response.url, response.status_code, jsonlib.dumps(stored_headers), body, etag, last_modified, expires, time.time(), len(body)))
+            self.counters['stores'] += 1
+            self._evict()
+            self.db.commit()
+        return True
+
+    def refresh(self, entry:dict, response:requests.Response)->None:
+        """Updates the freshness of a stored entry after a `304 Not Modified`."""
+        headers = {**entry['headers'], **{k:v for k,v in response.headers.items() if k.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')}}
+        _, expires = self._freshness(requests.structures.CaseInsensitiveDict(headers))
+        with self._lock:
+            self.db.execute('UPDATE responses SET headers=?, expires=?, last_access=? WHERE key=?', (jsonlib.dumps(headers), expires, time.time(), entry['key']))
+            self.db.commit()
+        entry['headers'] = headers
+
+    def _evict(self)->None:
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_size: return
+        for key, size in self.db.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall():
+            self.db.execute('DELETE FROM responses WHERE key=?', (key,))
+            self.counters['evictions'] += 1
+            total -= size
+            if total <= self.max_size: break
+
+    def to_response(self, entry:dict)->requests.Response:
+        """Builds a `requests.Response` from a stored entry. The response has `from_cache` set to True."""
+        res = requests.Response()
+        res.status_code = entry['status']
+        res.headers = requests.structures.CaseInsensitiveDict(entry['headers'])
+        res._content = entry['body']
+        res.url = entry['url']
+        res.encoding = requests.utils.get_encoding_from_headers(res.headers)
+        res.from_cache = True
+        return res
+
+    def request(self, send, method:str, url:str, params=None, headers:dict=None)->requests.Response:
+        """
+            request()
+            ---------
+            Serves a request through the cache.
+
+            Parameters:
+                - `send` (callable): Takes the request headers and does the actual request, returning a `requests.Response`.
+                - `method`, `url`, `params`, `headers`: The request values the cache key is built from.
+        """
+        if method.lower() not in self.methods:
+            return send(headers)
+        entry = self.lookup(method, url, params, headers)
+        if entry is not None and entry['fresh']:
+            self.counters['hits'] += 1
+            return self.to_response(entry)
+        req_headers = dict(headers or {})
+        if entry is not None:
+            self.counters['stale'] += 1
+            if entry['etag'] is not None: req_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified'] is not None: req_headers['If-Modified-Since'] = entry['last_modified']
+        else:
+            self.counters['misses'] += 1
+        res = send(req_headers)
+        if res.status_code == 304 and entry is not None:
+            self.counters['revalidated'] += 1
+            self.refresh(entry, res)
+            return self.to_response(entry)
+        self.store(method, url, params, headers, res)
+        return res
+
+    def stats(self)->dict:
+        """Returns the hit/miss/stale counters along with the number of entries and the stored size."""
+        with self._lock:
+            entries, size = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {**self.counters, 'entries': entries, 'size': size}
+
+    def clear(self)->None:
+        """Deletes every stored response."""
+        with self._lock:
+            self.db.execute('DELETE FROM responses')
+            self.db.execute('DELETE FROM vary')
+            self.db.commit()
+
+    def close(self)->None:
+        """Closes the cache file."""
+        self.db.close()
+
+def _download_state(path:str, resume:bool, algorithm:str):
+    """Returns the partial file path, the bytes already downloaded and a hasher primed with them (or None)."""
+    part = f'{path}.part'
+    offset = os.path.getsize(part) if resume and os.path.exists(part) else 0
+    hasher = hashlib.new(algorithm) if algorithm else None
+    if hasher is not None and offset > 0:
+        with open(part, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024*1024), b''):
+                hasher.update(chunk)
+    return part, offset, hasher
+
+def _download_finish(path:str, part:str, size:int, hasher, checksum:str, resumed:bool)->dict:
+    digest = hasher.hexdigest() if hasher is not None else None
+    if checksum and digest != checksum.lower():
+        os.remove(part)
+        raise ValueError(f'Checksum mismatch for {path}: expected {checksum}, got {digest}.')
+    os.replace(part, path)
+    return {'path': path, 'size': size, 'digest': digest, 'resumed': resumed}
+
 class Requester:
     """
         Requester()
@@ -11,10 +439,13 @@ class Requester:
 
     """
 
-    def __init__(self, agent:list=[], header:dict={}, proxy:list=[], ref:list=[], ref_file:str='', proxy_file:str='', agent_file:str='', set_agent:bool=True, set_header:bool=True, set_ref:bool=False, set_proxy:bool=False, break_pt:list=[]):
+    def __init__(self, agent:list=[], header:dict={}, proxy:list=[], ref:list=[], ref_file:str='', proxy_file:str='', agent_file:str='', set_agent:bool=True, set_header:bool=True, set_ref:bool=False, set_proxy:bool=False, break_pt:list=[], pool_size:int=10, max_per_host:int=10, idle_timeout:float=60, rate_limiter:RateLimiter=None, cache=None):
         self.agent, self.ref, self.proxy, self.header = 0, '', 0, 0
         self.break_pt = break_pt
+        self.limiter = rate_limiter if rate_limiter is not None else (RateLimiter.from_break_pt(break_pt) if break_pt != [] else None)
         self.ws = None
+        self.pool = ConnectionPool(pool_size=pool_size, max_per_host=max_per_host, idle_timeout=idle_timeout)
+        self.cache = ResponseCache(cache) if isinstance(cache, str) else cache
 
         if agent_file != '':
             self.agent = read(agent_file, '\n')
@@ -117,22 +548,88 @@ class Requester:
 
     def request(self, url, method='get', params=None, data=None, json:dict={}, header:dict={}, cookies=None, timeout=5, redirect=True, verify=True, proxy=None, ref:str='', agent:str='', break_pt:list=[], setHeader:bool=False):
 
-        break_pt = self.break_pt if break_pt is [] else break_pt
-        if break_pt != []: time.sleep(random.uniform(break_pt[0], break_pt[1]))
         proxy = self.get_proxy() if proxy is None else proxy
         header = None if header=={} else self.headers(agent, ref, header, setHeader)
 
-        if method.lower() == 'get':
-            ret = requests.get(url, params=params, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy) #type:ignore
-        elif method.lower() == 'post':
-            ret = requests.post(url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy) #type:ignore
-        elif method.lower() == 'put':
-            ret = requests.put(url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy) #type:ignore
-        elif method.lower() == 'patch':
-            ret = requests.patch(url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy) #type:ignore
-        elif method.lower() == 'delete':
-            ret = requests.delete(url,params=params,data=data, json=json, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy) #type:ignore
-        return ret #type:ignore
+        method = method.lower()
+        if method not in ('get', 'post', 'put', 'patch', 'delete'):
+            raise ValueError(f'The request method ({method}) is not supported.')
+        body = {} if method == 'get' else {'data': data, 'json': json}
+
+        def send(headers):
+            if break_pt != []: time.sleep(random.uniform(break_pt[0], break_pt[1]))
+            elif self.limiter is not None: self.limiter.acquire(url)
+            return self.pool.session(url).request(method.upper(), url, params=params, headers=headers, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy, **body) #type:ignore
+
+        if self.cache is not None:
+            return self.cache.request(send, method, url, params, header)
+        return send(header)
+
+    def stream(self, url, method='get', params=None, data=None, json=None, header:dict={}, cookies=None, timeout=5, redirect=True, verify=True, proxy=None, ref:str='', agent:str='', chunk_size:int=64*1024):
+        """
+            stream()
+            --------
+            Makes a request without buffering the body and yields it as byte chunks, so the memory used stays the same whatever the size of the response. The response is closed when the generator is exhausted or closed.
+
+            Parameters:
+                - `chunk_size` (int): The size of the yielded chunks in bytes. Default is 64 KB.
+                - The other parameters are the same as `request()`.
+
+            Usage Example:
+            ```
+                with open('report.pdf', 'wb') as f:
+                    for chunk in req.stream(url):
+                        f.write(chunk)
+            ```
+        """
+        proxy = self.get_proxy() if proxy is None else proxy
+        header = None if header=={} else self.headers(agent, ref, header)
+        if self.limiter is not None: self.limiter.acquire(url)
+        res = self.pool.session(url).request(method.upper(), url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify=verify, proxies=proxy, stream=True)
+        try:
+            res.raise_for_status()
+            yield from res.iter_content(chunk_size)
+        finally:
+            res.close()
+
+    def download(self, url:str, path:str, params=None, header:dict={}, cookies=None, timeout=30, verify=True, proxy=None, ref:str='', agent:str='', chunk_size:int=64*1024, resume:bool=True, checksum:str='', algorithm:str='sha256'):
+        """
+            download()
+            ----------
+            Downloads the url straight to a file chunk by chunk. The data is written to `<path>.part` first and renamed to `path` once complete, so an interrupted download can be resumed with a `Range` request.
+
+            Parameters:
+                - `url` (str): The url of the file.
+                - `path` (str): The path where the file is saved.
+                - `chunk_size` (int): The size of the chunks written to the file. Default is 64 KB.
+                - `resume` (bool): Resume from an existing `<path>.part` file if the server supports ranges. Default is True.
+                - `checksum` (str): The expected hex digest of the file. If it does not match, the partial file is deleted and a `ValueError` is raised. Default is '' (not checked).
+                - `algorithm` (str): The `hashlib` algorithm the digest is computed with while streaming. Default is 'sha256'. '' disables hashing.
+                - The other parameters are the same as `request()`.
+
+            Returns:
+                dict: `{'path', 'size', 'digest', 'resumed'}`.
+        """
+        part, offset, hasher = _download_state(path, resume, algorithm)
+        proxy = self.get_proxy() if proxy is None else proxy
+        header = {} if header=={} else self.headers(agent, ref, header)
+        header = {**header, 'accept-Encoding': 'identity'}
+        if offset > 0: header['range'] = f'bytes={offset}-'
+        if self.limiter is not None: self.limiter.acquire(url)
+        with self.pool.session(url).get(url, params=params, headers=header, cookies=cookies, timeout=timeout, verify=verify, proxies=proxy, stream=True) as res:
+            if res.status_code == 416 and offset > 0:
+                return _download_finish(path, part, offset, hasher, checksum, True)
+            res.raise_for_status()
+            resumed = offset > 0 and res.status_code == 206
+            if not resumed:
+                offset = 0
+                hasher = hashlib.new(algorithm) if algorithm else None
+            with open(part, 'ab' if resumed else 'wb') as f:
+                for chunk in res.iter_content(chunk_size):
+                    f.write(chunk)
+                    if hasher is not None: hasher.update(chunk)
+                    offset += len(chunk)
+        return _download_finish(path, part, offset, hasher, checksum, resumed)
 
     def requestSessions(self, url:str, method:str='get', params=None, data=None, json=None, header=None, cookies=None, timeout:int=5, sessions=None, redirect=True, verify=True, proxy=None, ref:str='', agent:str='', pre_request:bool=False, break_pt:list=[]):
         """
@@ -154,18 +651,19 @@ class Requester:
                 ref (_type_, optional): Takes the reffered url or the url that will display where its requested froms. Defaults to None.
                 agent (_type_, optional): Takes the user-agent detials. Defaults to None.
                 pre_request (bool, optional): This parameter is responsible for adding sessions to the requsted url if given `True`. Defaults to False.
-                break_pt (_type_, optional): _description_. Defaults to None.
+                break_pt (list, optional): A `[min, max]` random delay in seconds for this request only, it replaces the rate limiter wait of the instance. Defaults to [].
 
             Returns:
                 resonse: Returns the response of the requested url.
                 sessions: Returns the sessions created in the requseting process.  
         """
-        break_pt = self.break_pt if break_pt == [] else break_pt
         if break_pt != []: time.sleep(random.uniform(break_pt[0], break_pt[1]))
+        elif self.limiter is not None: self.limiter.acquire(url)
         proxy = self.get_proxy() if proxy is None else proxy
         header = self.headers(agent, ref) if header is None else header 
 
         s = sessions if sessions!=None else requests.sessions.Session()
+        self.pool.mount(s, url)
         if header != None: s.headers.update(header)
         if cookies!=None: s.cookies.update(cookies)
         if proxy != None: s.proxies.update(proxy)
@@ -178,7 +676,9 @@ class Requester:
                info = self.get_urlinfo(url)
                prevon = info['scheme'] + '://'+ info['hostname']
                s.get(prevon)
-           else: s.get(pre_request)
+           else:
+               self.pool.mount(s, pre_request)
+               s.get(pre_request)
 
         if method.lower() == 'get':
             ret = s.get(url, params=params)
@@ -244,6 +744,32 @@ class Requester:
         except requests.RequestException:
             return False
 
+    def pool_stats(self)->dict:
+        """
+            pool_stats()
+            ------------
+            Returns the hit/miss and connection reuse counters of the connection pool. See `ConnectionPool.stats()`.
+        """
+        return self.pool.stats()
+
+    def limiter_stats(self, hostname:str='')->dict:
+        """Returns the per-host queueing stats of the rate limiter. See `RateLimiter.stats()`."""
+        return self.limiter.stats(hostname) if self.limiter is not None else {}
+
+    def cache_stats(self)->dict:
+        """Returns the hit/miss/stale stats of the response cache. See `ResponseCache.stats()`."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def close(self)->None:
+        """Closes all the pooled connections of the requester."""
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 class AsyncRequester:
     """
         AsyncRequester()
@@ -252,9 +778,12 @@ class AsyncRequester:
         AsyncRequester is a class for making HTTP & HTTPS requests easier especially during the time of development. 
     """
 
-    def __init__(self, agent=[], header={}, proxy=[], ref=[], ref_file='', proxy_file='', agent_file='', set_agent=True, set_header=True, set_ref=False, set_proxy=False, break_pt=[]):
+    def __init__(self, agent=[], header={}, proxy=[], ref=[], ref_file='', proxy_file='', agent_file='', set_agent=True, set_header=True, set_ref=False, set_proxy=False, break_pt=[], limit=100, limit_per_host=10, dns_cache_ttl=300, keepalive_timeout=30, rate_limiter=None):
         self.agent, self.ref, self.proxy, self.header = 0, '', 0, 0
         self.break_pt = break_pt
+        self.limiter = rate_limiter if rate_limiter is not None else (RateLimiter.from_break_pt(break_pt) if break_pt != [] else None)
+        self.connector_args = {'limit': limit, 'limit_per_host': limit_per_host, 'ttl_dns_cache': dns_cache_ttl, 'use_dns_cache': dns_cache_ttl != 0, 'keepalive_timeout': keepalive_timeout}
+        self.connector, self._session = None, None
 
         if agent_file != '':
             self.agent = read(agent_file, '\n')
@@ -278,6 +807,44 @@ class AsyncRequester:
         if set_header:
             self.header = header
 
+    async def session(self):
+        """
+            session()
+            ---------
+            Returns the shared `aiohttp.ClientSession` of the requester, creating it (and its `TCPConnector`) on first use. The session does not keep cookies, `request()`, `stream()` and `download()` run on a session of their own over its connector (see `_callSession()`).
+        """
+        if self._session is None or self._session.closed:
+            self.connector = aiohttp.TCPConnector(**self.connector_args)
+            self._session = aiohttp.ClientSession(connector=self.connector, cookie_jar=aiohttp.DummyCookieJar())
+        return self._session
+
+    @asynccontextmanager
+    async def _callSession(self):
+        """A short-lived session for one call over the shared connector (so its pooled connections), with its own cookie jar: the cookies set on a redirect hop are sent on the next hops of the call and never leak to another call."""
+        await self.session()
+        s = aiohttp.ClientSession(connector=self.connector, connector_owner=False)
+        try:
+            yield s
+        finally:
+            await s.close()
+
+    async def close(self):
+        """Closes the shared session and all the connections of its connector."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session, self.connector = None, None
+
+    def limiter_stats(self, hostname=''):
+        """Returns the per-host queueing stats of the rate limiter. See `RateLimiter.stats()`."""
+        return self.limiter.stats(hostname) if self.limiter is not None else {}
+
+    async def __aenter__(self):
+        await self.session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     async def get_proxy(self):
         """
             This method gives a proxy url randomly.     
@@ -341,43 +908,197 @@ class AsyncRequester:
 
     async def request(self, url, method='get', params=None, data=None, json=None, header=None, cookies=None, timeout=5, redirect=True, verify=True, proxy=None, ref='', agent='', break_pt=[]):
         """Make an asynchronous HTTP request."""
-        break_pt = self.break_pt if break_pt == [] else break_pt
         if break_pt != []:
             await asyncio.sleep(random.uniform(break_pt[0], break_pt[1]))
+        elif self.limiter is not None:
+            await self.limiter.acquire_async(url)
         proxy = await self.get_proxy() if proxy is None else proxy
         header = await self.headers(agent, ref) if header is None else header
 
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=timeout, allow_redirects=redirect, verify_ssl=verify, proxy=proxy) as response:
+        async with self._callSession() as session:
+            async with session.request(method, url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=redirect, verify_ssl=verify, proxy=proxy) as response:
                 return await response.text(), response
 
+    async def _fetch_one(self, spec, timeout, retries, backoff, host_limits, per_host):
+        spec = {'url': spec} if isinstance(spec, str) else dict(spec)
+        if timeout is not None: spec.setdefault('timeout', timeout)
+        host = urlparse(spec['url']).hostname
+        if per_host and host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(per_host)
+        attempt = 0
+        while True:
+            try:
+                if per_host:
+                    async with host_limits[host]:
+                        ret = await self.request(**spec)
+                else:
+                    ret = await self.request(**spec)
+                if (ret[1].status == 429 or ret[1].status >= 500) and attempt < retries:
+                    raise aiohttp.ClientResponseError(ret[1].request_info, ret[1].history, status=ret[1].status)
+                return ret
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= retries: return e
+                await asyncio.sleep(backoff * (2 ** attempt) + random.uniform(0, backoff))
+                attempt += 1
+
+    async def fetch_many(self, urls, concurrency:int=10, per_host:int=0, timeout=None, retries:int=0, backoff:float=0.5, ordered:bool=False, return_exceptions:bool=True):
+        """
+            fetch_many()
+            ------------
+            Requests many urls with a bounded number of concurrent workers and yields the results as an async iterator.
+
+            Parameters:
+                - `urls` (iterable): The urls (str) or request specs (dict of `request()` arguments, e.g. `{'url': url, 'method': 'post', 'json': {...}}`). Generators are consumed lazily.
+                - `concurrency` (int): The number of requests running at the same time. Default is 10.
+                - `per_host` (int): The maximum number of concurrent requests per hostname. `0` means no per-host cap. Default is 0.
+                - `timeout` (int|float, optional): The timeout of every single request, a `timeout` in the spec takes precedence. Default is None (the `request()` default).
+                - `retries` (int): How many times a failed request (connection error, timeout, 429 or 5xx) is retried. Default is 0.
+                - `backoff` (float): The base delay in seconds of the exponential backoff between the retries. Default is 0.5.
+                - `ordered` (bool): If `True` the results are yielded in the input order, else as soon as they complete. Default is False.
+                - `return_exceptions` (bool): If `True` a request that still fails after the retries yields its exception as the result, else the exception is raised. Default is True.
+
+            Yields:
+                tuple: `(spec, result)` where result is the `(text, response)` tuple returned by `request()` or the exception.
+
+            Usage Example:
+            ```
+                async with AsyncRequester() as req:
+                    async for spec, (text, res) in req.fetch_many(urls, concurrency=50, per_host=5, retries=2):
+                        print(spec, res.status)
+            ```
+        """
+        source = enumerate(urls)
+        results = asyncio.Queue(maxsize=concurrency * 2)
+        host_limits = {}
+
+        async def worker():
+            for idx, spec in source:
+                await results.put((idx, spec, await self._fetch_one(spec, timeout, retries, backoff, host_limits, per_host)))
+
+        async def run_workers():
+            workers = [asyncio.ensure_future(worker()) for _ in range(max(concurrency, 1))]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                # A worker that fails (or the runner being cancelled) stops the others, they would block on the full queue forever.
+                for w in workers: w.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        async def next_result():
+            # The end is the runner finishing with the queue empty, not a queue item: a runner cancelled by a consumer that stopped must not wait on the full queue.
+            while results.empty() and not runner.done():
+                getter = asyncio.ensure_future(results.get())
+                await asyncio.wait([getter, runner], return_when=asyncio.FIRST_COMPLETED)
+                if getter.done(): return getter.result()
+                getter.cancel()
+                await asyncio.gather(getter, return_exceptions=True)
+            return None if results.empty() else results.get_nowait()
+
+        runner = asyncio.ensure_future(run_workers())
+        pending, next_idx = {}, 0
+        try:
+            while True:
+                item = await next_result()
+                if item is None: break
+                idx, spec, res = item
+                if isinstance(res, BaseException) and not return_exceptions:
+                    raise res
+                if not ordered:
+                    yield spec, res
+                    continue
+                pending[idx] = (spec, res)
+                while next_idx in pending:
+                    yield pending.pop(next_idx)
+                    next_idx += 1
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    async def stream(self, url, method='get', params=None, data=None, json=None, header=None, cookies=None, timeout=5, redirect=True, verify=True, proxy=None, ref='', agent='', chunk_size=64*1024):
+        """
+            stream()
+            --------
+            Makes a request and yields the body as byte chunks (async iterator) instead of reading it whole into memory with `response.text()`.
+
+            Usage Example:
+            ```
+                async for chunk in areq.stream(url):
+                    f.write(chunk)
+            ```
+        """
+        proxy = await self.get_proxy() if proxy is None else proxy
+        header = await self.headers(agent, ref) if header is None else header
+        if self.limiter is not None: await self.limiter.acquire_async(url)
+        async with self._callSession() as session:
+            async with session.request(method, url, params=params, data=data, json=json, headers=header, cookies=cookies, timeout=aiohttp.ClientTimeout(total=None, sock_read=timeout), allow_redirects=redirect, verify_ssl=verify, proxy=proxy) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    yield chunk
+
+    async def download(self, url, path, params=None, header=None, cookies=None, timeout=30, verify=True, proxy=None, ref='', agent='', chunk_size=64*1024, resume=True, checksum='', algorithm='sha256'):
+        """
+            download()
+            ----------
+            Async version of `Requester.download()`. Streams the url to `<path>.part` with resume through `Range` requests and an optional checksum, then renames it to `path`.
+
+            Returns:
+                dict: `{'path', 'size', 'digest', 'resumed'}`.
+        """
+        part, offset, hasher = _download_state(path, resume, algorithm)
+        proxy = await self.get_proxy() if proxy is None else proxy
+        header = await self.headers(agent, ref) if header is None else header
+        header = {**header, 'accept-Encoding': 'identity'}
+        if offset > 0: header['range'] = f'bytes={offset}-'
+        if self.limiter is not None: await self.limiter.acquire_async(url)
+        async with self._callSession() as session:
+            async with session.get(url, params=params, headers=header, cookies=cookies, timeout=aiohttp.ClientTimeout(total=None, sock_read=timeout), verify_ssl=verify, proxy=proxy, auto_decompress=False) as response:
+                if response.status == 416 and offset > 0:
+                    return _download_finish(path, part, offset, hasher, checksum, True)
+                response.raise_for_status()
+                resumed = offset > 0 and response.status == 206
+                if not resumed:
+                    offset = 0
+                    hasher = hashlib.new(algorithm) if algorithm else None
+                with open(part, 'ab' if resumed else 'wb') as f:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        f.write(chunk)
+                        if hasher is not None: hasher.update(chunk)
+                        offset += len(chunk)
+        return _download_finish(path, part, offset, hasher, checksum, resumed)
+
     async def requestSessions(self, url, method='get', params=None, data=None, json=None, header=None, cookies=None, timeout=5, sessions=None, redirect=True, verify=True, proxy=None, ref='', agent='', pre_request=False, break_pt=[]):
         """Make an asynchronous HTTP request with sessions."""
-        break_pt = self.break_pt if break_pt == [] else break_pt
         if break_pt != []:
             await asyncio.sleep(random.uniform(break_pt[0], break_pt[1]))
+        elif self.limiter is not None:
+            await self.limiter.acquire_async(url)
         proxy = await self.get_proxy() if proxy is None else proxy
         header = await self.headers(agent, ref) if header is None else header 
 
-        s = sessions if sessions is not None else aiohttp.ClientSession()
+        if sessions is None: await self.session()
+        s = sessions if sessions is not None else aiohttp.ClientSession(connector=self.connector, connector_owner=False)
         if header is not None:
             s.headers.update(header)
         if cookies is not None:
-            s.cookies.update(cookies)
-        s.connector.verify_ssl = verify
-        s.connector.timeout = aiohttp.ClientTimeout(total=timeout)
-        s.connector.allow_redirects = redirect
-
-        if pre_request and sessions is None:
-            if isinstance(pre_request, bool):
-                info = await self.get_urlinfo(url)
-                prevon = info['scheme'] + '://' + info['hostname']
-                await s.get(prevon)
-            else:
-                await s.get(pre_request)
+            s.cookie_jar.update_cookies(cookies)
+        # ssl, timeout and redirects are per request options, the connector is shared by every request of the requester.
+        options = {'ssl': verify, 'timeout': aiohttp.ClientTimeout(total=timeout), 'allow_redirects': redirect, 'proxy': proxy}
 
-        async with s.request(method, url, params=params, data=data, json=json) as response:
-            return await response.text(), response
+        try:
+            if pre_request and sessions is None:
+                if isinstance(pre_request, bool):
+                    info = await self.get_urlinfo(url)
+                    prevon = info['scheme'] + '://' + info['hostname']
+                    async with s.get(prevon, **options) as pre: await pre.read()
+                else:
+                    async with s.get(pre_request, **options) as pre: await pre.read()
+
+            async with s.request(method, url, params=params, data=data, json=json, **options) as response:
+                return await response.text(), response
+        finally:
+            if sessions is None: await s.close()
 
     async def connect_websocket(self, url, on_message=None, on_error=None, on_close=None):
         """Connect to a WebSocket server at the specified URL."""
@@ -408,10 +1129,10 @@ class AsyncRequester:
         """
         try:
             url = url if url != '' else 'https://www.google.com'
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    return True
+            session = await self.session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return True
         except aiohttp.ClientError:
             return False
 
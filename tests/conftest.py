@@ -0,0 +1,86 @@
+import os, sys, types, time, threading, hashlib
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import pytest
+
+# The modules import each other both as `functions.<module>` and flat (`from Requester import ...`),
+# so the repository root is put on the path and registered as the `functions` package.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+if 'functions' not in sys.modules:
+    functions = types.ModuleType('functions')
+    functions.__path__ = [ROOT]
+    sys.modules['functions'] = functions
+
+FILE_BODY = hashlib.sha256(b'seed').digest() * 8192  # 256 KB
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status:int, body:bytes=b'', headers:dict={}):
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.server.hits[url.path] += 1
+        path = url.path
+        if path == '/hello':
+            self._send(200, b'hello', {'Content-Type': 'text/plain'})
+        elif path == '/echo':
+            self._send(200, repr(sorted(query.items())).encode(), {'Content-Type': 'text/plain'})
+        elif path == '/redirect':
+            self._send(302, b'', {'Location': '/hello'})
+        elif path == '/login':
+            self._send(302, b'', {'Location': '/whoami', 'Set-Cookie': 'sid=abc; Path=/'})
+        elif path == '/whoami':
+            self._send(200, (self.headers.get('Cookie') or '').encode())
+        elif path == '/fresh':
+            self._send(200, f'fresh {self.server.hits[path]}'.encode(), {'Cache-Control': 'max-age=60'})
+        elif path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, b'', {'ETag': '"v1"'})
+            else:
+                self._send(200, b'etag body', {'ETag': '"v1"', 'Cache-Control': 'no-cache'})
+        elif path == '/nostore':
+            self._send(200, b'secret', {'Cache-Control': 'no-store'})
+        elif path.startswith('/status/'):
+            self._send(int(path.rsplit('/', 1)[1]), b'status')
+        elif path == '/slow':
+            time.sleep(float(query.get('s', '0.2')))
+            self._send(200, b'slow')
+        elif path == '/file':
+            rng = self.headers.get('Range')
+            if rng:
+                start = int(rng.split('=')[1].split('-')[0])
+                if start >= len(FILE_BODY):
+                    self._send(416)
+                else:
+                    self._send(206, FILE_BODY[start:], {'Content-Range': f'bytes {start}-{len(FILE_BODY)-1}/{len(FILE_BODY)}'})
+            else:
+                self._send(200, FILE_BODY)
+        else:
+            self._send(404, b'not found')
+
+@pytest.fixture(scope='session')
+def http_server():
+    """A local keep-alive HTTP server, `http_server.url` is its base url and `http_server.hits` counts the requests per path."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.hits = Counter()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,210 @@
+import pytest, asyncio, time
+from functions.AsyncHandler import AsyncHandlerAio, AsyncThreadHandler, Pipeline
+
+def run(coro, timeout:float=10):
+    return asyncio.run(asyncio.wait_for(coro, timeout))
+
+# Bounded-concurrency executor (AsyncHandlerAio)
+
+def test_executor_bounds_concurrency_and_resolves_futures():
+    async def body():
+        handler = AsyncHandlerAio(concurrency=3)
+        running, peak = 0, 0
+        async def work(i):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if i == 5: raise ValueError('five')
+            return i * 2
+        futures = [await handler.submit(work, i) for i in range(10)]
+        await handler.run_task()
+        assert peak == 3
+        assert [f.result() for f in futures if not f.exception()] == [0, 2, 4, 6, 8, 12, 14, 16, 18]
+        assert isinstance(futures[5].exception(), ValueError)
+        status = handler.get_status()
+        assert (status['completed'], status['failed'], status['pending'], status['running']) == (9, 1, 0, 0)
+        await handler.stop_tasks()
+    run(body())
+
+def test_executor_runs_by_priority_and_applies_backpressure():
+    async def body():
+        handler = AsyncHandlerAio(concurrency=1, max_pending=2)
+        order = []
+        gate = asyncio.Event()
+        first = await handler.submit(gate.wait)
+        await asyncio.sleep(0)
+        await handler.submit(order.append, 'low', priority=5)
+        await handler.submit(order.append, 'high', priority=1)
+        with pytest.raises(asyncio.QueueFull):
+            handler.create_task(order.append, 'full')
+        blocked = asyncio.create_task(handler.submit(order.append, 'late', priority=0))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        gate.set()
+        await blocked
+        await handler.run_task()
+        assert first.done() and order == ['high', 'low', 'late']
+        await handler.stop_tasks()
+    run(body())
+
+def test_stop_tasks_cancels_pending_work():
+    async def body():
+        handler = AsyncHandlerAio(concurrency=1)
+        slow = handler.create_task(asyncio.sleep, 10)
+        pending = handler.create_task(asyncio.sleep, 0)
+        await asyncio.sleep(0.01)
+        await handler.stop_tasks()
+        assert slow.cancelled() and pending.cancelled()
+        assert handler.workers == [] and handler.get_status()['running'] == 0
+    run(body())
+
+# Scheduler (AsyncHandlerAio.schedule)
+
+def test_schedule_runs_at_a_fixed_rate_and_once():
+    async def body():
+        handler = AsyncHandlerAio()
+        ticks, once = [], []
+        job = handler.schedule(lambda: ticks.append(time.monotonic()), every=0.02, max_runs=4)
+        one = await handler.schedule_task(once.append, 0.01, 'x')
+        await asyncio.sleep(0.15)
+        assert len(ticks) == 4 and job.finished() and job.stats()['next_run'] is None
+        assert ticks[-1] - ticks[0] == pytest.approx(0.06, abs=0.03)
+        assert once == ['x'] and one.finished() and handler.get_status()['scheduled'] == 0
+        await handler.stop_tasks()
+    run(body())
+
+def test_schedule_overlap_policies():
+    async def body():
+        handler = AsyncHandlerAio()
+        counts = {'skip': 0, 'queue': 0}
+        async def slow(kind):
+            counts[kind] += 1
+            await asyncio.sleep(0.05)
+        skip = handler.schedule(slow, 'skip', every=0.02, overlap='skip')
+        queue = handler.schedule(slow, 'queue', every=0.02, overlap='queue', max_runs=3)
+        await asyncio.sleep(0.12)
+        assert skip.stats()['missed'] >= 2 and counts['skip'] <= 3
+        assert handler.get_status()['missed_runs'] >= 2
+        await asyncio.sleep(0.1)
+        assert counts['queue'] == 3 and queue.stats()['backlog'] == 0
+        skip.cancel()
+        assert skip.finished() and skip not in handler.jobs
+        await handler.stop_tasks()
+    run(body())
+
+def test_schedule_fixed_delay_counts_failures_and_rejects_bad_options():
+    async def body():
+        handler = AsyncHandlerAio()
+        def fail():
+            raise RuntimeError('tick')
+        job = await handler.schedule_task(fail, '1s')
+        assert job.interval == 1.0 and job.mode == 'rate'
+        job.cancel()
+        job = handler.schedule(fail, every=0.02, mode='delay', max_runs=3)
+        await asyncio.sleep(0.12)
+        assert job.stats()['failed'] == 3 and isinstance(job.last_error, RuntimeError)
+        with pytest.raises(ValueError):
+            handler.schedule(fail, every=1, mode='cron')
+        with pytest.raises(ValueError):
+            handler.schedule(fail, every=1, overlap='drop')
+        await handler.stop_tasks()
+    run(body())
+
+# Thread/process pools (AsyncThreadHandler)
+
+def test_thread_handler_runs_io_and_cpu_calls():
+    handler = AsyncThreadHandler(io_workers=2, cpu_workers=1)
+    handler.route(pow, 'cpu')
+    async def body():
+        assert await handler.run(pow, 2, 10) == 1024
+        assert await handler.run(sorted, [3, 1, 2], reverse=True) == [3, 2, 1]
+        assert await asyncio.gather(*handler.create_tasks(divmod, [(7, 2), (9, 4)], kind='cpu')) == [(3, 1), (2, 1)]
+        with pytest.raises(ZeroDivisionError):
+            await handler.run(divmod, 1, 0)
+        with pytest.raises(ValueError):
+            await handler.run(len, [], kind='gpu')
+    run(body())
+    status = handler.get_status()
+    assert status['cpu']['completed'] == 3 and status['io']['completed'] == 1 and status['io']['failed'] == 1
+    assert status['io']['in_flight'] == 0 and 0.0 <= status['io']['utilisation'] <= 1.0
+    handler.shutdown()
+    assert handler.pools == {'io': None, 'cpu': None}
+    with pytest.raises(ValueError):
+        handler.route(len, 'gpu')
+
+def test_thread_handler_bounds_pending_calls():
+    handler = AsyncThreadHandler(io_workers=2, max_pending=2)
+    seen = []
+    async def body():
+        async def watch():
+            while True:
+                seen.append(handler.get_status()['io']['in_flight'])
+                await asyncio.sleep(0.002)
+        watcher = asyncio.create_task(watch())
+        results = await asyncio.gather(*(handler.run(time.sleep, 0.01) for _ in range(8)))
+        watcher.cancel()
+        return results
+    assert run(body()) == [None] * 8
+    assert max(seen) == 2 and handler.get_status()['io']['submitted'] == 8
+    handler.shutdown()
+
+# Pipeline
+
+def test_pipeline_runs_items_through_the_stages():
+    async def double(x):
+        await asyncio.sleep(0)
+        return x * 2
+    def check(x):
+        if x == 6: raise ValueError('six')
+        return None if x % 4 == 0 else x
+    batches = []
+    pipe = (Pipeline(queue_size=2, executor=AsyncThreadHandler(io_workers=2))
+            .stage(double, concurrency=3)
+            .stage(check, concurrency=2)
+            .stage(lambda x: [x, -x], kind='loop', name='pair', flatten=True)
+            .sink(batches.append, batch_size=3, kind='loop'))
+    async def items():
+        for i in range(10):
+            yield i
+    assert run(pipe.run(items())) == []
+    assert sorted(x for b in batches for x in b) == sorted([x for x in (2, 10, 14, 18) for x in (x, -x)])
+    assert max(len(b) for b in batches) == 3
+    status = pipe.get_status()
+    assert status['double']['in'] == 10 and status['check']['failed'] == 1 and isinstance(status['check']['last_error'], ValueError)
+    assert status['check']['kind'] == 'io' and status['pair']['out'] == 8 and status['append']['in'] == 8
+    pipe.executor.shutdown()
+
+def test_pipeline_returns_the_last_stage_outputs_and_bounds_the_queues():
+    produced = 0
+    def source():
+        nonlocal produced
+        for i in range(100):
+            produced += 1
+            yield i
+    async def slow(x):
+        await asyncio.sleep(0.001)
+        assert produced - x <= 10, 'the feeder ran ahead of the slow stage'
+        return x
+    pipe = Pipeline(queue_size=3).stage(slow)
+    assert run(pipe.run(source())) == list(range(100))
+
+def test_pipeline_errors_raise_and_stop_every_stage():
+    async def body():
+        before = asyncio.all_tasks()
+        def fail(x):
+            if x == 3: raise RuntimeError('three')
+            return x
+        pipe = Pipeline(errors='raise').stage(fail, kind='loop', concurrency=2).stage(asyncio.sleep)
+        with pytest.raises(RuntimeError):
+            await pipe.run(range(50))
+        await asyncio.sleep(0.01)
+        assert asyncio.all_tasks() - before == set()
+    run(body())
+    with pytest.raises(ValueError):
+        run(Pipeline().run([1]))
+    with pytest.raises(ValueError):
+        Pipeline(errors='ignore')
+    with pytest.raises(ValueError):
+        Pipeline().stage(len, kind='gpu')
@@ -0,0 +1,469 @@
+import pytest, sqlite3, threading, asyncio, csv, gzip, json
+from openpyxl import load_workbook
+from functions.DbHandler import SqliteHandler, AsyncSqliteHandler, MySqlHandler, MySqlPool, SqliteMySqlBackend, mysql_benchmark
+
+@pytest.fixture
+def db(tmp_path):
+    handler = SqliteHandler('test.db', str(tmp_path))
+    yield handler
+    handler.close_connection()
+
+def rows(db, sql:str)->list:
+    return db.execute(sql).fetchall()
+
+# Bulk insert
+
+def test_bulk_insert_batches_a_generator(db):
+    db.createTb('t', ['name TEXT', 'val INTEGER'])
+    stats = db.bulk_insert('t', ['name', 'val'], ((f'n{i}', i) for i in range(2500)), batch_size=1000)
+    assert stats['rows'] == 2500 and stats['batches'] == 3
+    assert db.getCount('t') == 2500
+
+def test_bulk_insert_dict_rows_and_conflicts(db):
+    db.createTb('t', ['name TEXT UNIQUE', 'tags TEXT'])
+    db.bulk_insert('t', 'name, tags', [{'name': 'a', 'tags': ['x', 'y']}, {'name': 'b'}])
+    assert rows(db, 'SELECT name, tags FROM t ORDER BY name') == [('a', '["x", "y"]'), ('b', None)]
+    assert db.bulk_insert('t', ['name'], [('a',), ('c',)], onConflict='IGNORE')['rows'] == 2
+    assert db.getCount('t') == 3
+
+def test_bulk_insert_rolls_back_on_sqlite_error(db, capsys):
+    db.createTb('t', ['name TEXT UNIQUE'])
+    assert db.bulk_insert('t', ['name'], [('a',), ('b',), ('a',)]) is None
+    assert db.getCount('t') == 0 and not db.db_init.in_transaction
+    assert 'UNIQUE' in capsys.readouterr().out
+
+def test_bulk_insert_rolls_back_and_raises_other_errors(db):
+    db.createTb('t', ['name TEXT'])
+    def progress(count, seconds):
+        raise RuntimeError('progress failed')
+    with pytest.raises(RuntimeError):
+        db.bulk_insert('t', ['name'], [('a',), ('b',)], batch_size=1, progress=progress)
+    with pytest.raises(TypeError):
+        db.bulk_insert('t', ['name'], [('a',), 5])
+    assert db.getCount('t') == 0 and not db.db_init.in_transaction
+
+def test_bulk_insert_raises_inside_a_transaction(db):
+    db.createTb('t', ['name TEXT UNIQUE'])
+    db.beginTransaction()
+    db.bulk_insert('t', ['name'], [('a',)])
+    with pytest.raises(sqlite3.IntegrityError):
+        db.bulk_insert('t', ['name'], [('b',), ('a',)])
+    db.rollbackTransaction()
+    assert db.getCount('t') == 0
+
+# Lazy fetch_iter
+
+@pytest.fixture
+def filled(db):
+    db.createTb('t', ['name TEXT', 'val INTEGER'], primary_key='id')
+    db.bulk_insert('t', ['name', 'val'], ((f'n{i}', i) for i in range(250)))
+    return db
+
+def test_fetch_iter_yields_every_row_lazily(filled):
+    it = filled.fetch_iter('t', 'name, val', query={'val': 3}, row_type='tuple')
+    assert list(it) == [('n3', 3)]
+    it = filled.fetch_iter('t', 'name, val', desc='val', row_type='namedtuple', arraysize=7)
+    first = next(it)
+    assert (first.name, first.val) == ('n249', 249)
+    filled.update('t', {'name': 'changed'}, {'val': 0})
+    assert len(list(it)) == 249
+    assert [r['val'] for r in filled.fetch_iter('t', limit=3, Offset=10)] == [10, 11, 12]
+
+def test_fetch_iter_rejects_bad_arguments(filled):
+    with pytest.raises(ValueError):
+        next(filled.fetch_iter('t', row_type='list'))
+    with pytest.raises(ValueError):
+        next(filled.fetch_iter('missing'))
+
+# Schema cache
+
+def test_schema_is_read_once_and_refreshed_by_ddl(db):
+    db.createTb('t', ['name TEXT'])
+    statements = []
+    db.db_init.set_trace_callback(statements.append)
+    for _ in range(3):
+        assert db.getTb('t') and db.getColumnNames('t') == ['name'] and db.getIndexes('t') == []
+    assert len(statements) == 3
+    db.addIndex('t', 't_name', 'name')
+    db.execute('ALTER TABLE t ADD COLUMN val INTEGER')
+    assert db.getIndexes('t') == ['t_name'] and db.getColumnNames('t') == ['name', 'val']
+
+@pytest.mark.parametrize('schema_check', [False, True])
+def test_schema_check_sees_changes_of_other_connections(tmp_path, schema_check):
+    db = SqliteHandler('test.db', str(tmp_path), schema_check=schema_check)
+    db.createTb('t', ['name TEXT'])
+    assert db.getTb() == ['t']
+    other = sqlite3.connect(str(tmp_path / 'test.db'))
+    other.execute('CREATE TABLE u (v TEXT)')
+    other.commit()
+    other.close()
+    assert db.getTb('u') is schema_check
+    db.close_connection()
+
+# Pooled WAL mode
+
+@pytest.fixture
+def pooled(tmp_path):
+    handler = SqliteHandler('pooled.db', str(tmp_path), pool_readers=1)
+    handler.createTb('t', ['name TEXT', 'val INTEGER'], primary_key='id')
+    handler.bulk_insert('t', ['name', 'val'], ((f'n{i}', i) for i in range(50)))
+    yield handler
+    handler.close_connection()
+
+def run_in_thread(fn, timeout:float=5):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('value', fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'deadlocked'
+    return result['value']
+
+def test_pool_runs_in_wal_mode_with_readers_and_writer(pooled):
+    assert rows(pooled, 'PRAGMA journal_mode')[0][0] == 'wal'
+    def work(k):
+        pooled.bulk_insert('t', ['name', 'val'], [(f'w{k}', 1000 + k)])
+        return pooled.fetch('t', 'name', {'val': 1000 + k})
+    threads = [threading.Thread(target=work, args=(k,)) for k in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert pooled.getCount('t') == 58
+
+def test_nested_reads_while_iterating_do_not_deadlock(pooled):
+    def nested():
+        seen = 0
+        for row in pooled.fetch_iter('t', arraysize=10):
+            assert pooled.fetch('t', 'name', {'id': row['id']}) == [{'name': row['name']}]
+            assert pooled.getColumnNames('t') == ['id', 'name', 'val']
+            seen += sum(1 for _ in pooled.fetch_iter('t', query={'id': row['id']}))
+        return seen
+    assert run_in_thread(nested) == 50
+    assert run_in_thread(lambda: pooled.getCount('t')) == 50
+
+def test_reader_is_released_by_an_abandoned_iterator(pooled):
+    it = pooled.fetch_iter('t')
+    next(it)
+    it.close()
+    assert run_in_thread(lambda: pooled.getCount('t')) == 50
+
+# Async front-end (AsyncSqliteHandler)
+
+def run_async(tmp_path, body, **kwargs):
+    async def main():
+        db = AsyncSqliteHandler('async.db', str(tmp_path), readers=2, **kwargs)
+        try:
+            return await body(db)
+        finally:
+            await db.close()
+    return asyncio.run(main())
+
+def test_async_writes_are_coalesced_into_one_transaction(tmp_path):
+    async def body(db):
+        db.db.createTb('t', ['v TEXT', 'n INTEGER'])
+        counts = await asyncio.gather(*(db.insert('t', ['v', 'n'], [(f'v{i}', i)]) for i in range(100)),
+                                      *(db.json_insert('t', {'v': f'j{i}', 'n': i}) for i in range(10)))
+        assert counts == [1] * 110
+        assert await db.getCount('t') == 110
+        assert await db.fetch('t', 'v', {'n': 5}) == [{'v': 'v5'}, {'v': 'j5'}]
+        return db.stats
+    stats = run_async(tmp_path, body)
+    assert stats['rows'] == 110 and stats['transactions'] < 110
+
+def test_async_failing_insert_is_not_committed_with_the_others(tmp_path):
+    async def body(db):
+        db.db.createTb('t', ['v TEXT UNIQUE'])
+        await db.insert('t', ['v'], [('c',)])
+        results = await asyncio.gather(db.insert('t', ['v'], [('a',), ('b',)]), db.insert('t', ['v'], [('d',), ('c',)]), db.insert('t', ['v'], [('e',)]))
+        assert results == [2, None, 1]
+        return sorted(r['v'] for r in await db.fetch('t'))
+    assert run_async(tmp_path, body) == ['a', 'b', 'c', 'e']
+
+def test_async_writes_fail_when_the_commit_fails(tmp_path):
+    async def body(db):
+        await db.execute('CREATE TABLE parent (id INTEGER PRIMARY KEY)')
+        await db.execute('CREATE TABLE child (pid INTEGER REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED)')
+        results = await asyncio.gather(db.insert('child', ['pid'], [(1,)]), db.execute('INSERT INTO child (pid) VALUES (2)'), return_exceptions=True)
+        assert all(isinstance(r, sqlite3.IntegrityError) for r in results)
+        assert await db.getCount('child') == 0
+        assert await db.insert('parent', ['id'], [(1,)]) == 1
+    run_async(tmp_path, body, pragmas={'foreign_keys': 'ON'})
+
+# CSV import
+
+def write_csv(path, lines:list)->str:
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+def test_csv_insert_infers_types_and_keeps_unconvertible_values(db, tmp_path):
+    lines = ['name,qty,price'] + [f'n{i},{i},{i}.5' for i in range(40)] + ['late,oops,', 'short']
+    stats = db.csv_insert('t', write_csv(tmp_path / 'a.csv', lines), batch_size=7, sample_size=10)
+    assert stats['rows'] == 42 and stats['batches'] == 6
+    assert [c[2] for c in db._tableInfo('t')] == ['TEXT', 'INTEGER', 'REAL']
+    assert rows(db, "SELECT qty, price FROM t WHERE name IN ('n3', 'late', 'short') ORDER BY rowid") == [(3, 3.5), ('oops', None), (None, None)]
+    assert not db.db_init.in_transaction
+
+def test_csv_insert_failure_leaves_nothing_pending(db, tmp_path, capsys):
+    db.createTb('t', ['name TEXT UNIQUE', 'qty INTEGER'])
+    db.addIndex('t', 't_qty', 'qty')
+    path = write_csv(tmp_path / 'b.csv', ['name,qty'] + [f'n{i},{i}' for i in range(40)] + ['n1,1'])
+    assert db.csv_insert('t', path, batch_size=10) is False
+    assert not db.db_init.in_transaction
+    db.execute("CREATE TABLE other (v TEXT)")
+    assert db.getCount('t') == 0
+    assert 't_qty' in db.getIndexes('t')
+    assert db.csv_insert('t', str(tmp_path / 'missing.csv')) is False
+    assert 'UNIQUE' in capsys.readouterr().out
+
+# Export
+
+def test_export_streams_every_format(filled, tmp_path):
+    filled.createTb('u', ['v TEXT'])
+    filled.bulk_insert('u', ['v'], [('x',), ('y',)])
+    out = str(tmp_path)
+    ret = filled.export_data('csv', 't,u', out, compress=True, workers=2, arraysize=7)
+    assert {tb: r['rows'] for tb, r in ret.items()} == {'t': 250, 'u': 2}
+    with gzip.open(ret['t']['path'], 'rt', newline='') as f:
+        data = list(csv.reader(f))
+    assert data[0] == ['id', 'name', 'val'] and data[1] == ['1', 'n0', '0'] and len(data) == 251
+
+    ret = filled.export_data('jsonl', 'u', out)
+    assert [json.loads(line) for line in open(ret['u']['path'])] == [{'v': 'x'}, {'v': 'y'}]
+
+    ret = filled.export_data('xls', ['t'], out)
+    sheet = load_workbook(ret['t']['path'], read_only=True)['t']
+    assert [r for r in sheet.iter_rows(values_only=True)][:2] == [('id', 'name', 'val'), (1, 'n0', 0)]
+
+    ret = filled.export_data('json', '', out)
+    dump = json.load(open(ret['path']))
+    tables = {tb['table_name']: tb for tb in dump['tables']}
+    assert tables['u']['data'] == [['x'], ['y']] and len(tables['t']['data']) == 250
+
+def test_export_rejects_unknown_formats(filled, tmp_path):
+    with pytest.raises(ValueError):
+        filled.export_data('parquet', filePath=str(tmp_path))
+
+# Column migrations
+
+CONSTRAINED = '''CREATE TABLE t (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL COLLATE NOCASE,
+    qty INTEGER CHECK (qty >= 0), pid INTEGER REFERENCES p(id), a TEXT, b TEXT, UNIQUE(a, b), CHECK (length(name) < 10))'''
+
+@pytest.fixture
+def constrained(db):
+    db.execute('CREATE TABLE p (id INTEGER PRIMARY KEY)')
+    db.execute(CONSTRAINED)
+    db.execute('CREATE INDEX t_qty ON t(qty)')
+    db.execute("INSERT INTO p VALUES (1)")
+    db.execute("INSERT INTO t (name, qty, pid, a, b) VALUES ('x', 1, 1, 'a', 'b')")
+    return db
+
+def table_sql(db, name:str='t')->str:
+    return rows(db, f"SELECT sql FROM sqlite_master WHERE name='{name}'")[0][0]
+
+def assert_constraints_kept(db):
+    sql = table_sql(db)
+    for part in ('AUTOINCREMENT', 'COLLATE NOCASE', 'CHECK (qty >= 0)', 'REFERENCES p(id)', 'UNIQUE(a, b)', 'CHECK (length(name) < 10)'):
+        assert part in sql
+    assert rows(db, "SELECT count(*) FROM t WHERE name = 'X'") == [(1,)]
+    for bad in ("(name, qty) VALUES ('y', -1)", "(name) VALUES ('0123456789')", "(name, a, b) VALUES ('z', 'a', 'b')"):
+        with pytest.raises(sqlite3.IntegrityError):
+            db.db_conn.execute(f"INSERT INTO t {bad}")
+    assert 't_qty' in db.getIndexes('t')
+
+def test_add_column_rebuild_keeps_constraints(constrained):
+    assert constrained.addColumn('t', 'note', 'TEXT', 'name', "DEFAULT 'n'") is True
+    assert constrained.getColumnNames('t') == ['id', 'name', 'note', 'qty', 'pid', 'a', 'b']
+    assert rows(constrained, 'SELECT id, name, note FROM t') == [(1, 'x', 'n')]
+    assert_constraints_kept(constrained)
+    assert constrained.addColumn('t', ['c1', 'c2'], 'INTEGER', 'b') is True
+    assert constrained.getColumnNames('t')[-2:] == ['c1', 'c2']
+
+def test_modify_and_rename_columns_keep_constraints(constrained, capsys):
+    assert constrained.renameColumn('t', 'pid', 'parent') is True
+    assert constrained.modifyColumns('t', {'a': {'data_type': 'VARCHAR(5)'}, 'parent': {'new_column_name': 'pid'},
+                                           'qty': {'data_type': 'REAL'}}) is True
+    info = {row[1]: row[2] for row in constrained._tableInfo('t')}
+    assert info['a'] == 'VARCHAR(5)' and info['qty'] == 'REAL' and 'parent' not in info
+    assert_constraints_kept(constrained)
+    assert constrained.modifyColumn('t', 'b', column_param='NOT NULL') is True
+    assert 'b TEXT NOT NULL' in table_sql(constrained)
+    assert constrained.modifyColumn('t', 'missing', data_type='TEXT') is False
+    assert 'not found' in capsys.readouterr().out
+
+def test_rebuild_keeps_table_options_and_reports_failures(db, capsys):
+    db.execute('CREATE TABLE w (k TEXT PRIMARY KEY, v INTEGER) WITHOUT ROWID')
+    db.execute("INSERT INTO w VALUES ('a', 1)")
+    assert db.modifyColumn('w', 'v', data_type='TEXT') is True
+    assert table_sql(db, 'w').endswith('WITHOUT ROWID')
+    assert db.modifyColumn('w', 'v', column_param='CHECK (v > 5)') is False
+    assert 'CHECK constraint failed' in capsys.readouterr().out
+    assert rows(db, 'SELECT * FROM w') == [('a', '1')] and not db.db_init.in_transaction
+
+# Bound queries and the SQL text cache
+
+def test_fetch_binds_dict_values_and_reuses_the_sql(filled):
+    assert filled._select('t', query={'name': "n1' OR '1'='1"}) == ('SELECT * FROM t WHERE name=?;', ["n1' OR '1'='1"])
+    assert filled.fetch('t', query={'name': "n1' OR '1'='1"}) == []
+    assert filled.fetch('t', 'val', {'name': 'n7'}) == [{'val': 7}]
+    filled.execute("INSERT INTO t (name, val) VALUES (NULL, -1)")
+    assert filled.fetch('t', 'val', {'name': None}, detailed=False) == [(-1,)]
+    sql, params = filled._select('t', query={'val': 3}, limit=5, Offset=10)
+    assert sql == 'SELECT * FROM t WHERE val=? LIMIT ? OFFSET ?;' and params == [3, 5, 10]
+    assert filled.fetch('t', 'name', 'val >= 248', desc='val', limit=1, detailed=False) == [('n249',)]
+
+def test_statement_cache_is_an_lru_cleared_with_the_schema(tmp_path):
+    db = SqliteHandler('lru.db', str(tmp_path), statement_cache=2)
+    db.createTb('t', ['a INTEGER', 'b INTEGER'])
+    for query in ({'a': 1}, {'a': 2}, {'b': 1}, {'a': 3}):
+        db.fetch('t', query=query)
+    assert len(db._sql_cache) == 2
+    assert [key[3] for key in db._sql_cache] == [(('b', False),), (('a', False),)]
+    db.execute('CREATE TABLE u (v TEXT)')
+    assert len(db._sql_cache) == 0
+    db.close_connection()
+
+def test_update_binds_dict_values(filled):
+    assert filled.update('t', {'name': "it's", 'val': None}, {'id': 3}) is True
+    assert filled.fetch('t', 'name, val', {'id': 3}, detailed=False) == [("it's", None)]
+    assert filled.update('t', "val = val + 1000", {'name': 'n4'}) is True
+    assert filled.fetch('t', 'val', {'name': 'n4'}) == [{'val': 1004}]
+    assert filled.update('t', {'missing': 1}, {'id': 1}) is False
+
+# Keyset pagination
+
+def test_fetch_pages_walks_every_row_by_key(filled):
+    pages = list(filled.fetch_pages('t', 'name', key='id', limit=100))
+    assert [len(p) for p in pages] == [100, 100, 50] and pages[2][-1] == {'name': 'n249'}
+    rows_, cursor = filled.fetch_page('t', 'val', key=['val', 'id'], after=(247, 248), limit=5, detailed=False)
+    assert rows_ == [(248,), (249,)] and cursor is None
+    rows_, cursor = filled.fetch_page('t', 'val', key='id', after=3, desc=True, detailed=False)
+    assert rows_ == [(1,), (0,)] and cursor is None
+
+def test_fetch_pages_seek_is_not_bypassed_by_an_or_query(filled):
+    def walk(query):
+        got = []
+        for page in filled.fetch_pages('t', 'val', query=query, key='id', limit=1, detailed=False):
+            got += [r[0] for r in page]
+            assert len(got) < 10, 'the seek did not advance'
+        return got
+    assert walk('val = 1 OR val = 5') == [1, 5]
+    assert walk(['val < 3 OR val > 247', 'val != 0']) == [1, 2, 248, 249]
+    sql = filled._statement(('page', 't', 'val', 'val = 1 OR val = 5', ('id',), True, False), lambda: None)
+    assert 'WHERE (val = 1 OR val = 5) AND id > ?' in sql
+
+# Query profiling and index advice
+
+def test_auto_index_keeps_the_rows_of_the_triggering_query(db):
+    db.createTb('t', ['a INTEGER', 'b TEXT'])
+    db.bulk_insert('t', ['a', 'b'], [(i % 5, str(i)) for i in range(100)])
+    db.startProfiling(auto_index=True, min_count=3)
+    counts = [len(db.execute('SELECT * FROM t WHERE a = ?', (1,)).fetchall()) for _ in range(4)]
+    assert counts == [20, 20, 20, 20]
+    assert db.auto_indexes == ['CREATE INDEX IF NOT EXISTS idx_t_a ON t (a);']
+    assert 'idx_t_a' in db.getIndexes('t')
+    db.execute('SELECT * FROM t WHERE a = ?', (2,))
+    assert 'USING INDEX idx_t_a' in db.indexReport()['statements'][0]['plan'][0]
+
+def test_index_report_and_apply_advice(tmp_path):
+    db = SqliteHandler('profile.db', str(tmp_path), pool_readers=2)
+    db.createTb('t', ['a INTEGER', 'b TEXT', 'c REAL'])
+    db.bulk_insert('t', ['a', 'b', 'c'], [(i % 7, str(i), i / 2) for i in range(200)])
+    db.startProfiling()
+    for i in range(3):
+        assert len(db.fetch('t', 'b', {'a': i})) > 0
+        db.execute('SELECT * FROM t WHERE c > ?', (i,))
+    db.stopProfiling()
+    report = db.indexReport()
+    assert len(report['full_scans']) == 2 and report['statements'][0]['count'] == 3
+    suggestions = {tuple(sug['columns']): sug for sug in report['suggestions']}
+    assert suggestions[('a', 'b')]['covering'] and suggestions[('c',)]['count'] == 3
+    created = db.applyIndexAdvice(top=1)
+    assert len(created) == 1 and len(db.getIndexes('t')) == 1
+    db.applyIndexAdvice()
+    assert len(db.getIndexes('t')) == 2
+    db.close_connection()
+
+# MySqlHandler on the SQLite stand-in backend
+
+@pytest.fixture
+def mysql(tmp_path):
+    backend = SqliteMySqlBackend(str(tmp_path))
+    handler = MySqlHandler('localhost', 'root', '', 'shop', pool_size=2, backend=backend)
+    handler.createTb('items', ['id INT AUTO_INCREMENT PRIMARY KEY', 'name VARCHAR(64)', 'tags TEXT', 'qty INT'], tableComment='items')
+    yield handler
+    handler.close_connection()
+
+def test_mysql_insert_and_fetch_with_bound_values(mysql):
+    assert 'shop' in mysql.getDbList() and mysql.getTables('items')
+    assert mysql.insert('items', 'name, qty', ((f'n{i}', i) for i in range(2500)), batch_size=1000) == 2500
+    assert mysql.json_insert('items', [{'name': "it's", 'tags': ['a']}, {'name': 'x', 'qty': 7}]) == 2
+    assert mysql.fetch('items', 'qty', {'name': "it's"}) == [{'qty': None}]
+    assert mysql.fetch('items', 'tags', {'name': "it's"}, detailed=False) == [('["a"]',)]
+    assert mysql.fetch('items', 'name', {'qty': 7}, assc='id', fetchAll=False) == {'name': 'n7'}
+    assert mysql.fetch('items', 'name', ['qty < 2 OR qty > 2498', 'id > 1'], detailed=False) == [('n1',), ('n2499',)]
+    assert mysql.fetch('items', 'id', limit=2, Offset=10, detailed=False) == [(11,), (12,)]
+    assert mysql.insert('items', ['missing'], [(1,)]) == 0
+    assert mysql.fetch('missing_table') == []
+
+def test_mysql_fetch_iter_streams_and_releases_the_connection(mysql):
+    mysql.insert('items', ['name', 'qty'], [(f'n{i}', i) for i in range(30)])
+    it = mysql.fetch_iter('items', 'name, qty', row_type='namedtuple', arraysize=7)
+    assert next(it).name == 'n0'
+    it.close()
+    assert sum(1 for _ in mysql.fetch_iter('items', row_type='tuple')) == 30
+    assert mysql.pool.conns.qsize() == 2
+    with pytest.raises(ValueError):
+        next(mysql.fetch_iter('items', row_type='list'))
+
+def test_mysql_pool_is_shared_by_threads(mysql):
+    def work(k):
+        mysql.insert('items', ['name', 'qty'], [(f't{k}', i) for i in range(100)])
+        assert len(mysql.fetch('items', query={'name': f't{k}'})) == 100
+    workers = [threading.Thread(target=work, args=(k,)) for k in range(4)]
+    for w in workers: w.start()
+    for w in workers: w.join()
+    assert len(mysql.fetch('items')) == 400 and mysql.pool.conns.qsize() == 2
+
+def test_mysql_pool_rolls_back_a_failed_connection(tmp_path):
+    backend = SqliteMySqlBackend(str(tmp_path))
+    backend.create_database('db')
+    pool = MySqlPool({'database': 'db'}, size=1, connect=backend.connect)
+    with pool.connection() as conn:
+        conn.cursor().execute('CREATE TABLE t (v TEXT)')
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.cursor().execute("INSERT INTO t VALUES ('x')")
+            raise RuntimeError('failed')
+    with pool.connection() as conn:
+        cur = conn.cursor()
+        cur.execute('SELECT count(*) FROM t')
+        assert cur.fetchall() == [(0,)]
+    pool.close()
+
+def test_standin_backend_emulates_the_mysql_statements(tmp_path):
+    backend = SqliteMySqlBackend(str(tmp_path))
+    db = MySqlHandler('localhost', 'root', '', 'a', backend=backend)
+    db.createDb('b')
+    assert db.getDbList() == ['a', 'b'] and db.getDbList('b')
+    db.createTb('t', ['id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY', 'name VARCHAR(10)'], Engine='MyISAM')
+    with pytest.raises(ValueError):
+        db.createTb('t', ['v INT'])
+    db.addIndex('t', 't_name', ['name'])
+    db.insert('t', ['name'], [('x',), ('y',)])
+    assert db.fetch('t', detailed=False) == [(1, 'x'), (2, 'y')]
+    assert db.insert('t', ['name'], [('x',)]) == 0
+    db.cleanTb('t')
+    assert db.fetch('t') == []
+    db.connect_db('b', create_db=False)
+    assert db.getTables() == []
+    db.delDb('a')
+    assert db.getDbList() == ['b']
+    with pytest.raises(ValueError):
+        db.delDb('a')
+    with pytest.raises(sqlite3.Error):
+        backend.connect(database='a')
+    db.close_connection()
+
+def test_mysql_benchmark_runs_offline():
+    results = mysql_benchmark(rows=400, batch_sizes=(1, 100), threads=2, pool_size=2)
+    assert list(results) == ['insert (batch_size=1)', 'insert (batch_size=100)', 'json_insert', 'fetch', 'fetch_iter',
+                             '2 threads, single connection', '2 threads, pool of 2']
+    assert all(res['rows'] == 400 and res['rows_per_s'] > 0 for res in results.values())
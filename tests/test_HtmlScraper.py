@@ -0,0 +1,128 @@
+import pytest
+from functions.HtmlScraper import HtmlScraper, PathwayPlan, compile_pathway, parse_html, parser_backend, parser_benchmark
+
+PAGE = '''<html><head><title> Shop </title></head><body>
+<div id="list" class="items wide">
+  <div class="item"><a href="/a">A</a><span class="price">1</span><img src="a.png" alt="a"></div>
+  <div class="item sale"><a href="/b">B</a><span class="price">2</span><img src="b.png"></div>
+</div></body></html>'''
+
+def scraper(parser:str='html.parser')->HtmlScraper:
+    # the constructor reads the user agents from the author's machine, the parsing methods only need the parser
+    s = HtmlScraper.__new__(HtmlScraper)
+    s.souped, s.parser = None, parser
+    return s
+
+# Compiled pathways (compile_pathway / jsonParser)
+
+PATHWAY = {
+    'title': {'tag': 'title', 'get': '<stext>'},
+    'items': {'tag': 'div', 'attr': {'class': 'item'}, 'type': 'find_all', 'inner': {
+        'link': {'tag': 'a', 'get': 'href'},
+        'price': {'tag': 'span', 'attr': {'class': 'price'}, 'get': '<text>'},
+    }},
+    'sale': {'tag': 'div.sale a', 'type': 'select_one', 'get': '<text>'},
+    'missing': {'tag': 'table', 'get': '<text>'},
+}
+
+def test_compiled_plan_gives_the_same_result_as_the_raw_pathway():
+    s = scraper()
+    page = s._souper(PAGE)
+    plan = compile_pathway(PATHWAY)
+    assert isinstance(plan, PathwayPlan) and compile_pathway(plan) is plan
+    expected = {'title': 'Shop', 'items': {'inner': [{'link': '/a', 'price': '1'}, {'link': '/b', 'price': '2'}]}, 'sale': 'B', 'missing': {}}
+    assert s.jsonParser(PATHWAY) == expected
+    assert s.jsonParser(plan, page) == expected
+    assert [plan.run(parse_html(PAGE)) for _ in range(2)] == [expected, expected]
+    assert s.jsonParser(['span.price', {'tag': 'a', 'type': 'findall', 'get': 'href'}], page)[1] == ['/a', '/b']
+    assert s.getAllImages(page) == {'inner': [{'imgLnk': 'a.png', 'alt': 'a'}, {'imgLnk': 'b.png', 'alt': None}]}
+    assert s.getPageMeta(page) == {'title': 'Shop'}
+
+@pytest.mark.parametrize('pathway', [
+    {'tag': 'a', 'type': 'xpath'},
+    {'tag': 'a', 'attr': 'href'},
+    {'tag': 1},
+    {'tag': 'a', 'get': 5},
+    {'x': {'tag': 'a', 'inner': 3}},
+    42,
+])
+def test_invalid_pathways_are_rejected_once(pathway):
+    with pytest.raises(ValueError):
+        compile_pathway(pathway)
+    assert scraper().jsonParser(pathway, parse_html(PAGE)) is None
+
+# Parser backends against bs4
+
+BACKENDS = ['selectolax', 'lxml']
+
+ATTRS = '''<html><body>
+<div id="d" class="box main" data-x="a b" hidden><a href="/1" rel="nofollow noopener" class="">one</a></div>
+<div class="box"><a href="/2" rel="next">two</a><td headers="h1 h2">c</td></div>
+<p class="main">three</p></body></html>'''
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    name, parse = parser_backend(request.param)
+    if name != request.param:
+        pytest.skip(f'{request.param} is not installed')
+    return parse
+
+def same(node):
+    """The result of a lookup, comparable between bs4 and the other backends."""
+    if isinstance(node, list):
+        return [same(n) for n in node]
+    return None if node is None else node.getText()
+
+def test_backend_attributes_match_bs4(backend):
+    soup, doc = parse_html(ATTRS), backend(ATTRS)
+    for key in ('id', 'class', 'data-x', 'hidden', 'missing'):
+        assert doc.find('div').get(key) == soup.find('div').get(key), key
+    assert doc.find('div').get('class') == ['box', 'main'] and doc.find('div').get('hidden') == ''
+    assert doc.find('a').get('rel') == soup.find('a').get('rel') == ['nofollow', 'noopener']
+    assert doc.find('a').get('class') == soup.find('a').get('class') == []
+    assert doc.find('div').get('missing', 'x') == 'x'
+
+@pytest.mark.parametrize('name, attrs', [
+    ('div', {'class': 'main'}),
+    ('div', {'class': 'box main'}),
+    (None, {'class': ['main', 'other']}),
+    ('a', {'rel': 'next'}),
+    ('a', {'rel': ['noopener', 'next']}),
+    ('div', {'class': 'box', 'id': ['d', 'e']}),
+    ('div', {'hidden': True}),
+    (None, {'data-x': 'a'}),
+    (None, {'data-x': 'a b'}),
+])
+def test_backend_find_all_matches_bs4(backend, name, attrs):
+    soup, doc = parse_html(ATTRS), backend(ATTRS)
+    assert same(doc.find_all(name, attrs)) == same(soup.find_all(name, attrs))
+    assert same(doc.find(name, attrs)) == same(soup.find(name, attrs))
+
+def test_backend_rejects_filters_it_cannot_run(backend):
+    with pytest.raises(ValueError):
+        backend(ATTRS).find_all('div', {'class': []})
+    with pytest.raises(ValueError):
+        backend(ATTRS).find_all('div', {'class': 3})
+
+@pytest.mark.parametrize('page', ['', '   ', '<?xml version="1.0" encoding="iso-8859-1"?><html><body><p class="a">café</p><script>var x = 1;</script></body></html>',
+                                  b'<?xml version="1.0" encoding="utf-8"?><html><body><p class="a">caf\xc3\xa9</p><script>var x = 1;</script></body></html>'])
+def test_backend_parses_empty_and_declared_encoding_pages(backend, page):
+    soup, doc = parse_html(page), backend(page)
+    assert same(doc.find('p')) == same(soup.find('p'))
+    assert doc.getText('|', strip=True) == soup.getText('|', strip=True)
+    assert same(doc.select('p.a')) == same(soup.select('p.a'))
+    assert scraper().jsonParser({'p': {'tag': 'p', 'get': 'class'}}, doc) == scraper().jsonParser({'p': {'tag': 'p', 'get': 'class'}}, soup)
+
+def test_backend_text_leaves_out_scripts_and_styles(backend):
+    page = '<html><body><div>1<b>2</b>3<!-- c --><script>var x = 1;</script>\n x &amp; y <style>p {}</style><p> a </p>b</div></body></html>'
+    soup, doc = parse_html(page), backend(page)
+    for sep, strip in (('', False), ('|', True), (' ', False)):
+        assert doc.find('div').getText(sep, strip) == soup.find('div').getText(sep, strip)
+    assert doc.find('div').getText() == '123\n x & y  a b'
+    assert doc.find('script').getText() == soup.find('script').getText() == 'var x = 1;'
+
+def test_parser_benchmark_backends_extract_the_same_result():
+    pathway = {'items': {'tag': 'li', 'type': 'find_all', 'attr': {'class': ['item', 'sale']}, 'inner': {'class': 'class', 'link': {'tag': 'a', 'get': 'href'}}}}
+    for plan in (None, pathway):
+        results = parser_benchmark(backends=('html.parser', 'bs4:lxml', 'lxml', 'selectolax'), pathway=plan, pages=3, rows=5)
+        assert all(res['same_result'] and res['pages'] == 3 for res in results.values()), results
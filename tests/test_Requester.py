@@ -0,0 +1,269 @@
+import pytest, asyncio, aiohttp, time, hashlib, requests
+from conftest import FILE_BODY
+from functions.Requester import Requester, AsyncRequester, ConnectionPool, RateLimiter, ResponseCache
+
+# Connection pool (Requester)
+
+def test_request_reuses_pooled_connection(http_server):
+    req = Requester()
+    for _ in range(3):
+        assert req.request(http_server.url + '/hello').text == 'hello'
+    stats = req.pool_stats()
+    assert (stats['hosts'], stats['misses'], stats['hits']) == (1, 1, 2)
+    assert stats['connections'] == 1 and stats['reused'] == 2
+    req.close()
+
+def test_pool_evicts_least_recently_used_host(http_server):
+    port = http_server.server_address[1]
+    req = Requester(pool_size=1)
+    req.request(f'http://127.0.0.1:{port}/hello')
+    req.request(f'http://localhost:{port}/hello')
+    assert req.pool_stats()['hosts'] == 1 and req.pool_stats()['evictions'] == 1
+    req.close()
+
+def test_pool_evicts_idle_hosts(http_server):
+    pool = ConnectionPool(idle_timeout=0.01)
+    pool.session(http_server.url)
+    pool.hosts[next(iter(pool.hosts))]['last_used'] -= 1
+    assert pool.evict_idle() == 1 and pool.stats()['hosts'] == 0
+
+def test_request_rejects_unknown_method(http_server):
+    with pytest.raises(ValueError):
+        Requester().request(http_server.url + '/hello', method='trace')
+
+# Shared aiohttp session (AsyncRequester)
+
+def test_async_requests_share_one_session(http_server):
+    async def run():
+        async with AsyncRequester() as req:
+            first = await req.session()
+            texts = await asyncio.gather(*(req.request(http_server.url + '/hello') for _ in range(5)))
+            assert [t for t, _ in texts] == ['hello'] * 5
+            assert await req.session() is first
+        assert req.connector is None and first.closed
+    asyncio.run(run())
+
+def test_async_request_keeps_redirect_cookies_within_one_call(http_server):
+    # aiohttp's cookie jar ignores cookies of ip addresses, hence localhost
+    url = f'http://localhost:{http_server.server_address[1]}'
+
+    async def run():
+        async with AsyncRequester() as req:
+            text, res = await req.request(url + '/login', header={})
+            assert text == 'sid=abc' and res.status == 200 and len(res.history) == 1
+            assert (await req.request(url + '/whoami', header={}))[0] == ''
+            body = b''.join([c async for c in req.stream(url + '/login', header={})])
+            assert body == b'sid=abc'
+            assert (await req.request(url + '/whoami', header={}, cookies={'k': 'v'}))[0] == 'k=v'
+            assert len(req.connector._conns) == 1
+    asyncio.run(run())
+
+def test_request_sessions_options_do_not_leak_to_the_connector(http_server):
+    async def run():
+        async with AsyncRequester() as req:
+            ssl_before = req.connector._ssl
+            (_, no_redirect), (text, followed) = await asyncio.gather(
+                req.requestSessions(http_server.url + '/redirect', header={}, redirect=False, verify=False, timeout=2),
+                req.request(http_server.url + '/redirect', header={}))
+            assert no_redirect.status == 302
+            assert followed.status == 200 and text == 'hello'
+            assert req.connector._ssl == ssl_before
+            assert not {'verify_ssl', 'allow_redirects', 'timeout'} & set(vars(req.connector))
+            _, res = await req.request(http_server.url + '/redirect', header={})
+            assert res.status == 200
+    asyncio.run(run())
+
+def test_request_sessions_timeout_is_per_request(http_server):
+    async def run():
+        async with AsyncRequester() as req:
+            with pytest.raises(asyncio.TimeoutError):
+                await req.requestSessions(http_server.url + '/slow?s=0.5', header={}, timeout=0.1)
+            text, _ = await req.request(http_server.url + '/slow?s=0.3', header={}, timeout=2)
+            assert text == 'slow'
+    asyncio.run(run())
+
+# Batch fetch (AsyncRequester.fetch_many)
+
+def test_fetch_many_yields_every_url_in_order(http_server):
+    async def run():
+        async with AsyncRequester() as req:
+            urls = [f'{http_server.url}/echo?i={i}' for i in range(20)]
+            got = [(spec, text) async for spec, (text, _) in req.fetch_many(urls, concurrency=4, per_host=2, ordered=True)]
+            assert [spec for spec, _ in got] == urls
+            assert got[7][1] == "[('i', '7')]"
+    asyncio.run(run())
+
+def test_fetch_many_retries_and_returns_errors(http_server):
+    async def run():
+        async with AsyncRequester() as req:
+            hits = http_server.hits['/status/503']
+            got = [res async for _, res in req.fetch_many([http_server.url + '/status/503'], retries=2, backoff=0.01)]
+            assert http_server.hits['/status/503'] - hits == 3
+            assert got[0][1].status == 503
+            dead = ['http://127.0.0.1:1/hello']
+            got = [res async for _, res in req.fetch_many(dead, retries=1, backoff=0.01)]
+            assert isinstance(got[0], aiohttp.ClientConnectionError)
+            with pytest.raises(aiohttp.ClientConnectionError):
+                [res async for _, res in req.fetch_many(dead, return_exceptions=False)]
+    asyncio.run(run())
+
+def test_fetch_many_stops_every_worker_when_one_fails(http_server):
+    def specs():
+        yield {'url': http_server.url + '/hello', 'unknown_argument': 1}
+        for i in range(50):
+            yield f'{http_server.url}/slow?s=0.01&i={i}'
+
+    async def run():
+        before = asyncio.all_tasks()
+        async with AsyncRequester() as req:
+            with pytest.raises(TypeError):
+                [res async for _, res in req.fetch_many(specs(), concurrency=3)]
+            await asyncio.sleep(0.1)
+            assert asyncio.all_tasks() - before == set()
+    asyncio.run(asyncio.wait_for(run(), 10))
+
+def test_fetch_many_stops_when_the_consumer_stops_early(http_server):
+    urls = [f'{http_server.url}/echo?i={i}' for i in range(20)]
+
+    async def run():
+        before = asyncio.all_tasks()
+        async with AsyncRequester() as req:
+            results = req.fetch_many(urls, concurrency=1)
+            await results.__anext__()
+            await asyncio.sleep(0.1)  # the worker fills the queue and blocks on it
+            await results.aclose()
+            async for spec, _ in req.fetch_many(urls, concurrency=1, ordered=True):
+                if spec == urls[1]: break
+            await asyncio.sleep(0.1)
+            assert asyncio.all_tasks() - before == set()
+    asyncio.run(asyncio.wait_for(run(), 10))
+
+def test_fetch_many_raises_with_a_full_queue(http_server):
+    echo = [f'{http_server.url}/echo?i={i}' for i in range(16)]
+    urls = echo[:6] + ['http://127.0.0.1:1/hello'] + echo[6:]
+
+    async def run():
+        before = asyncio.all_tasks()
+        async with AsyncRequester() as req:
+            got = []
+            with pytest.raises(aiohttp.ClientConnectionError):
+                # a slow consumer, the workers keep the queue full and wait to put more
+                async for spec, res in req.fetch_many(urls, concurrency=2, ordered=True, return_exceptions=False):
+                    got.append(spec)
+                    await asyncio.sleep(0.05)
+            assert got == urls[:len(got)] and len(got) <= 6
+            await asyncio.sleep(0.1)
+            assert asyncio.all_tasks() - before == set()
+    asyncio.run(asyncio.wait_for(run(), 10))
+
+# Rate limiter
+
+def test_rate_limiter_allows_burst_then_spaces_requests():
+    limiter = RateLimiter(rate=20, burst=2)
+    waits = [limiter._reserve('http://a.test/') for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.05, abs=0.01) and waits[3] == pytest.approx(0.1, abs=0.01)
+    assert limiter._reserve('http://b.test/') == 0.0
+    stats = limiter.stats('a.test')
+    assert stats['requests'] == 4 and stats['max_wait'] == pytest.approx(0.1, abs=0.01)
+
+def test_rate_limiter_host_overrides_and_unlimited_rate():
+    limiter = RateLimiter(rate=0, hosts={'slow.test': (10, 1)})
+    assert [limiter._reserve('http://fast.test/') for _ in range(3)] == [0.0, 0.0, 0.0]
+    limiter._reserve('http://slow.test/')
+    assert limiter._reserve('http://slow.test/') == pytest.approx(0.1, abs=0.01)
+    limiter.set_host('slow.test', 0)
+    assert limiter._reserve('http://slow.test/') == 0.0
+    assert RateLimiter.from_break_pt([1, 3]).rate == 0.5
+
+def test_rate_limiter_waits_in_both_requesters(http_server):
+    limiter = RateLimiter(rate=20, burst=1)
+    req = Requester(rate_limiter=limiter)
+    start = time.monotonic()
+    for _ in range(3):
+        req.request(http_server.url + '/hello')
+    assert time.monotonic() - start >= 0.09
+
+    async def run():
+        async with AsyncRequester(rate_limiter=limiter) as areq:
+            start = time.monotonic()
+            await asyncio.gather(*(areq.request(http_server.url + '/hello', header={}) for _ in range(3)))
+            return time.monotonic() - start
+    assert asyncio.run(run()) >= 0.09
+    assert req.limiter_stats('127.0.0.1')['requests'] == 6
+    req.close()
+
+# Response cache
+
+def test_cache_serves_fresh_responses_from_disk(http_server, tmp_path):
+    req = Requester(cache=str(tmp_path / 'cache.db'))
+    hits = http_server.hits['/fresh']
+    first, second = req.request(http_server.url + '/fresh'), req.request(http_server.url + '/fresh')
+    assert second.text == first.text and getattr(second, 'from_cache', False)
+    assert http_server.hits['/fresh'] - hits == 1
+    assert req.cache_stats()['hits'] == 1 and req.cache_stats()['entries'] == 1
+    req.close()
+
+def test_cache_revalidates_with_etag(http_server, tmp_path):
+    req = Requester(cache=ResponseCache(str(tmp_path / 'cache.db')))
+    hits = http_server.hits['/etag']
+    req.request(http_server.url + '/etag')
+    res = req.request(http_server.url + '/etag')
+    assert res.status_code == 200 and res.text == 'etag body' and res.from_cache
+    assert http_server.hits['/etag'] - hits == 2
+    assert req.cache_stats()['revalidated'] == 1
+
+def test_cache_skips_no_store_and_error_responses(http_server, tmp_path):
+    req = Requester(cache=str(tmp_path / 'cache.db'))
+    for path in ('/nostore', '/status/500', '/nostore', '/status/500'):
+        assert not getattr(req.request(http_server.url + path), 'from_cache', False)
+    assert req.cache_stats()['entries'] == 0 and req.cache_stats()['stores'] == 0
+
+def test_cache_evicts_least_recently_used_entries(http_server, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), max_size=12, default_ttl=60)
+    req = Requester(cache=cache)
+    req.request(http_server.url + '/hello')
+    req.request(http_server.url + '/slow?s=0')
+    req.request(http_server.url + '/echo?a=1')
+    assert cache.stats()['evictions'] >= 1 and cache.stats()['size'] <= 12
+    assert cache.lookup('get', http_server.url + '/echo?a=1') is not None
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    cache.close()
+
+# Streaming and download
+
+def test_stream_yields_the_body_in_chunks(http_server):
+    req = Requester()
+    chunks = list(req.stream(http_server.url + '/file', chunk_size=10000))
+    assert b''.join(chunks) == FILE_BODY and max(len(c) for c in chunks) <= 10000
+    with pytest.raises(requests.HTTPError):
+        list(req.stream(http_server.url + '/missing'))
+    req.close()
+
+def test_download_resumes_and_checks_the_digest(http_server, tmp_path):
+    req, path = Requester(), str(tmp_path / 'file.bin')
+    digest = hashlib.sha256(FILE_BODY).hexdigest()
+    with open(path + '.part', 'wb') as f:
+        f.write(FILE_BODY[:1000])
+    ret = req.download(http_server.url + '/file', path, checksum=digest)
+    assert ret == {'path': path, 'size': len(FILE_BODY), 'digest': digest, 'resumed': True}
+    assert open(path, 'rb').read() == FILE_BODY
+
+    with pytest.raises(ValueError):
+        req.download(http_server.url + '/file', path, checksum='0' * 64)
+    assert not (tmp_path / 'file.bin.part').exists()
+    req.close()
+
+def test_async_stream_and_download(http_server, tmp_path):
+    path = str(tmp_path / 'file.bin')
+
+    async def run():
+        async with AsyncRequester() as req:
+            body = b''.join([c async for c in req.stream(http_server.url + '/file', header={})])
+            ret = await req.download(http_server.url + '/file', path, header={}, resume=False)
+            return body, ret
+    body, ret = asyncio.run(run())
+    assert body == FILE_BODY
+    assert ret['digest'] == hashlib.sha256(FILE_BODY).hexdigest() and not ret['resumed']
+    assert open(path, 'rb').read() == FILE_BODY